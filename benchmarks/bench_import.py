@@ -0,0 +1,68 @@
+"""Measure the cold start cost of importing bitpapa_pay.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import --runs 20
+
+Every statement runs in a fresh interpreter `--runs` times and the median
+time is reported, together with the heavy dependencies it loaded.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List, Optional, Tuple
+
+STATEMENTS = [
+    "import bitpapa_pay",
+    "from bitpapa_pay import BitpapaPay",
+    "from bitpapa_pay.methods import CreateCryptoInvoiceMethod",
+    "from bitpapa_pay.methods import CreateCryptoInvoiceMethod\n"
+    "CreateCryptoInvoiceMethod(amount=1, currency_code='USDT')",
+]
+
+DEPENDENCIES = ["aiohttp", "pydantic", "loguru"]
+
+SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - started
+print(json.dumps([elapsed, [m for m in {dependencies!r} if m in sys.modules]]))
+"""
+
+
+def measure(statement: str) -> Tuple[float, List[str]]:
+    output = subprocess.check_output(  # noqa: S603
+        [
+            sys.executable,
+            "-c",
+            SCRIPT.format(statement=statement, dependencies=DEPENDENCIES),
+        ],
+        text=True,
+    )
+    elapsed, loaded = json.loads(output)
+    return elapsed, loaded
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    for statement in STATEMENTS:
+        timings = []
+        for _ in range(args.runs):
+            elapsed, loaded = measure(statement)
+            timings.append(elapsed)
+        print(
+            f"{statistics.median(timings) * 1000:>9.1f} ms  "
+            f"{statement.replace(chr(10), '; ')}  "
+            f"[{', '.join(loaded) or 'no dependencies'}]",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare json codecs and pydantic parsing per endpoint.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_json_codec
+"""
+
+import json
+import timeit
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter
+
+from bitpapa_pay.codec import JsonCodec, OrjsonCodec
+from bitpapa_pay.schemas import (
+    GetAddressesResponse,
+    GetExchangeRatesResponse,
+    GetInvoicesResponse,
+    GetTransactionsResponse,
+    GetWithdrawalFeesResponse,
+)
+from bitpapa_pay.testing import payloads
+
+ENDPOINTS: List[Tuple[str, Any, Type[BaseModel], Optional[str]]] = [
+    ("get_transactions(limit=100)", payloads.transactions(100),
+     GetTransactionsResponse, "transactions"),
+    ("get_invoices", payloads.invoices_page(per_page=100),
+     GetInvoicesResponse, None),
+    ("get_addresses", payloads.addresses(100),
+     GetAddressesResponse, "addresses"),
+    ("get_exchange_rates_all", payloads.exchange_rates(),
+     GetExchangeRatesResponse, None),
+    ("get_withdrawal_fees", payloads.withdrawal_fees(),
+     GetWithdrawalFeesResponse, None),
+]
+
+
+def available_codecs() -> List[JsonCodec]:
+    codecs = [JsonCodec()]
+    try:
+        codecs.append(OrjsonCodec())
+    except ImportError:
+        pass
+    return codecs
+
+
+def build_from_dict(
+    codec: JsonCodec,
+    model: Type[BaseModel],
+    field: Optional[str],
+) -> Callable[[bytes], BaseModel]:
+    def build(body: bytes) -> BaseModel:
+        data = codec.loads(body)
+        if field is not None:
+            return model(**{field: data})
+        return model(**data)
+
+    return build
+
+
+def build_from_json(
+    model: Type[BaseModel],
+    field: Optional[str],
+) -> Callable[[bytes], BaseModel]:
+    if field is None:
+        return model.model_validate_json
+    adapter = TypeAdapter(model.model_fields[field].annotation)
+    return lambda body: model(**{field: adapter.validate_json(body)})
+
+
+def measure(func: Callable[[], Any], number: int) -> float:
+    """Best time of one call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main(number: int = 200) -> None:
+    codecs = available_codecs()
+    print(f"{'endpoint':<30}{'parser':<34}{'decode':>10}{'decode+model':>14}")
+    for name, payload, model, field in ENDPOINTS:
+        body = json.dumps(payload).encode()
+        for codec in codecs:
+            build = build_from_dict(codec, model, field)
+            decode = measure(lambda c=codec: c.loads(body), number)
+            total = measure(lambda b=build: b(body), number)
+            label = f"{codec.name}.loads + model(**dict)"
+            print(f"{name:<30}{label:<34}{decode:>10.1f}{total:>14.1f}")
+        build = build_from_json(model, field)
+        total = measure(lambda b=build: b(body), number)
+        label = "model_validate_json(bytes)"
+        print(f"{name:<30}{label:<34}{'-':>10}{total:>14.1f}")
+        print(f"{'':<30}body: {len(body)} bytes")
+
+    invoice = {"invoice": payloads.invoice(1)}
+    print()
+    print(f"{'encode create invoice body':<30}{'codec':<34}{'dumps':>10}")
+    for codec in codecs:
+        dumps = measure(lambda c=codec: c.dumps(invoice), number * 10)
+        print(f"{'':<30}{codec.name:<34}{dumps:>10.2f}")
+    print("\ntimes in microseconds per call, best of 5 runs")
+
+
+if __name__ == "__main__":
+    main()
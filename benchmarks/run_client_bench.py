@@ -0,0 +1,302 @@
+"""Benchmark client methods against the local fake Bitpapa server.
+
+Run from the repository root:
+
+    python -m benchmarks.run_client_bench --concurrency 1 8 32
+    python -m benchmarks.run_client_bench --compare benchmarks/results/a.json
+
+The fake server runs in a separate process, so only the client is
+measured. Every method is called `--requests` times at each concurrency
+level and the throughput, latency percentiles and errors are reported. A
+second, shorter pass under tracemalloc reports the bytes each call leaves
+allocated, which grows with caches and leaks. Results are saved as json
+so runs of different releases can be compared.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from bitpapa_pay import BitpapaPay
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+Call = Callable[[BitpapaPay, int], Awaitable[Any]]
+
+SCENARIOS: Dict[str, Call] = {
+    "get_exchange_rates_all": lambda c, i: c.get_exchange_rates_all(),
+    "get_withdrawal_fees": lambda c, i: c.get_withdrawal_fees(),
+    "get_invoices": lambda c, i: c.get_invoices(page=i % 10 + 1),
+    "create_crypto_invoice": lambda c, i: c.create_crypto_invoice(
+        amount=10,
+        currency_code="USDT",
+        merchant_invoice_id=f"bench-{i}",
+    ),
+    "get_addresses": lambda c, i: c.get_addresses(),
+    "get_transactions": lambda c, i: c.get_transactions(page=i % 10 + 1),
+    "get_address_transactions": lambda c, i: c.get_address_transactions(
+        uuid="00000000-0000-0000-0000-000000000001",
+    ),
+    "create_transaction": lambda c, i: c.create_transaction(
+        currency="USDT",
+        amount=1,
+        from_address="from",
+        to_address="to",
+        network="TRC20",
+    ),
+}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_level(
+    client: BitpapaPay,
+    call: Call,
+    requests: int,
+    concurrency: int,
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                await call(client, index)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+async def measure_allocations(
+    client: BitpapaPay,
+    call: Call,
+    calls: int,
+) -> float:
+    """Bytes left allocated by a call, averaged over sequential calls.
+
+    Tracing runs for the whole pass and the snapshots taken before and
+    after the calls are compared. The peak traced during a call is not
+    used: every call peaks at the 256 KiB socket buffer of the event
+    loop, whatever the method.
+    """
+    tracemalloc.start()
+    try:
+        # the first call warms up the session and is not counted
+        with contextlib.suppress(Exception):
+            await call(client, 0)
+        before = tracemalloc.take_snapshot()
+        for index in range(1, calls + 1):
+            with contextlib.suppress(Exception):
+                await call(client, index)
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    ignore = [
+        tracemalloc.Filter(
+            inclusive=False,
+            filename_pattern=tracemalloc.__file__,
+        ),
+    ]
+    retained = sum(
+        stat.size_diff
+        for stat in after.filter_traces(ignore).compare_to(
+            before.filter_traces(ignore),
+            "lineno",
+        )
+    )
+    return round(retained / calls, 1) if calls else 0.0
+
+
+@contextlib.contextmanager
+def fake_server(args: argparse.Namespace) -> Iterator[str]:
+    process = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "bitpapa_pay.testing",
+            "--latency",
+            str(args.latency),
+            "--jitter",
+            str(args.jitter),
+            "--error-rate",
+            str(args.error_rate),
+            "--page-size",
+            str(args.page_size),
+            "--seed",
+            "0",
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        yield process.stdout.readline().strip()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def run(args: argparse.Namespace, url: str) -> Dict[str, Any]:
+    results = []
+    async with BitpapaPay(
+        api_token="benchmark",
+        base_url=url,
+        limit=max(args.concurrency),
+    ) as client:
+        for name in args.methods:
+            call = SCENARIOS[name]
+            retained = await measure_allocations(client, call, 20)
+            for concurrency in args.concurrency:
+                await run_level(client, call, concurrency, concurrency)
+                result = await run_level(
+                    client,
+                    call,
+                    args.requests,
+                    concurrency,
+                )
+                result.update(
+                    method=name,
+                    concurrency=concurrency,
+                    retained_bytes_per_call=retained,
+                )
+                results.append(result)
+                print_result(result)
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "options": {
+                key: value for key, value in vars(args).items()
+                if key not in {"output", "compare"}
+            },
+        },
+        "results": results,
+    }
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['method']:<26}c={result['concurrency']:<4}"
+        f"{result['throughput_rps']:>10.1f} rps"
+        f"{result['p50_ms']:>9.2f} p50"
+        f"{result['p95_ms']:>9.2f} p95"
+        f"{result['p99_ms']:>9.2f} p99 ms"
+        f"{result['retained_bytes_per_call']:>9.0f} B/call"
+        f"{result['errors']:>6} err",
+    )
+
+
+def compare(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+) -> bool:
+    """Print changes against a baseline run, True if nothing regressed."""
+    previous = {
+        (r["method"], r["concurrency"]): r for r in baseline["results"]
+    }
+    ok = True
+    print(f"\ncompared with {baseline['meta']['created_at']}:")
+    for result in current["results"]:
+        old = previous.get((result["method"], result["concurrency"]))
+        if old is None:
+            continue
+        throughput = _change(result["throughput_rps"], old["throughput_rps"])
+        p99 = _change(result["p99_ms"], old["p99_ms"])
+        regressed = throughput < -threshold or p99 > threshold
+        ok = ok and not regressed
+        print(
+            f"{result['method']:<26}c={result['concurrency']:<4}"
+            f"{throughput:>+9.1%} rps{p99:>+9.1%} p99"
+            f"{'  REGRESSION' if regressed else ''}",
+        )
+    return ok
+
+
+def _change(new: float, old: float) -> float:
+    return (new - old) / old if old else 0.0
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=list(SCENARIOS),
+    )
+    parser.add_argument(
+        "--concurrency",
+        nargs="+",
+        type=int,
+        default=[1, 8, 32],
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change reported as a regression",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    with fake_server(args) as url:
+        report = asyncio.run(run(args, url))
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        output = RESULTS_DIR / f"{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nresults saved to {output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        if not compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,26 @@
-from bitpapa_pay.client import BitpapaPay
-from bitpapa_pay.exceptions import BadRequestError
+from typing import TYPE_CHECKING
 
-__all__ = ["BadRequestError", "BitpapaPay"]
+from bitpapa_pay._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from bitpapa_pay.client import BitpapaPay
+    from bitpapa_pay.exceptions import BadRequestError
+    from bitpapa_pay.pool import BitpapaPayPool
+    from bitpapa_pay.sync_client import BitpapaPaySync
+
+__all__ = [
+    "BadRequestError",
+    "BitpapaPay",
+    "BitpapaPayPool",
+    "BitpapaPaySync",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    globals(),
+    {
+        "BadRequestError": "bitpapa_pay.exceptions",
+        "BitpapaPay": "bitpapa_pay.client",
+        "BitpapaPayPool": "bitpapa_pay.pool",
+        "BitpapaPaySync": "bitpapa_pay.sync_client",
+    },
+)
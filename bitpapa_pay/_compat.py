@@ -0,0 +1,52 @@
+import logging
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def get_numpy() -> Optional[ModuleType]:
+    try:
+        import numpy as np  # noqa: PLC0415
+    except ImportError:
+        return None
+    return np
+
+
+class _BraceMessage:
+    """Formats `str.format` style messages for stdlib logging lazily."""
+
+    __slots__ = ("args", "message")
+
+    def __init__(self, message: str, args: Tuple[Any, ...]) -> None:
+        self.message = message
+        self.args = args
+
+    def __str__(self) -> str:
+        if not self.args:
+            return self.message
+        return self.message.format(*self.args)
+
+
+class _StdlibLogger:
+    def __init__(self, logger: logging.Logger) -> None:
+        self._logger = logger
+
+    def debug(self, message: str, *args: Any) -> None:
+        self._logger.debug(_BraceMessage(message, args))
+
+    def warning(self, message: str, *args: Any) -> None:
+        self._logger.warning(_BraceMessage(message, args))
+
+
+@lru_cache(maxsize=None)
+def get_logger() -> Any:
+    """loguru logger when it is installed, `bitpapa_pay` logger otherwise.
+
+    Both take `str.format` style messages.
+    """
+    try:
+        from loguru import logger  # noqa: PLC0415
+    except ImportError:
+        return _StdlibLogger(logging.getLogger("bitpapa_pay"))
+    return logger
@@ -0,0 +1,29 @@
+from importlib import import_module
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    namespace: Dict[str, Any],
+    exports: Dict[str, str],
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Module `__getattr__` and `__dir__` importing `exports` on access.
+
+    `exports` maps each exported name to the module defining it, relative
+    names are resolved from the package. A loaded name is stored in
+    `namespace`, so it is only looked up once.
+    """
+    package = namespace["__name__"]
+
+    def module_getattr(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            msg = f"module {package!r} has no attribute {name!r}"
+            raise AttributeError(msg)
+        value = getattr(import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def module_dir() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return module_getattr, module_dir
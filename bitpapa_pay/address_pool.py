@@ -0,0 +1,245 @@
+import asyncio
+import json
+import os
+import uuid
+from collections import deque
+from functools import partial
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from bitpapa_pay._compat import get_logger
+from bitpapa_pay.cache import SingleFlight
+from bitpapa_pay.concurrency import SerialExecutor, iter_bounded
+from bitpapa_pay.enums import ResponseMode
+from bitpapa_pay.schemas.addresses import Address
+
+if TYPE_CHECKING:
+    from bitpapa_pay.client import AdressesApiClient
+
+Pair = Tuple[str, str]
+
+
+class AddressPool:
+    """Deposit addresses created ahead of time and handed out from memory.
+
+    Every `(currency, network)` pair keeps up to `size` unassigned
+    addresses. When fewer than `low_water` are left they are created in
+    the background, at most `concurrency` at a time. Pool addresses are
+    labelled `<label_prefix>-<random hex>`; assignments of labels to
+    owners are saved to the json file `state_path`. On start the pool
+    reloads the assignments and takes every prefixed address not
+    assigned to anyone as unassigned, so restarts neither lose nor hand
+    out addresses twice.
+
+        pool = AddressPool(client, [("USDT", "TRC20")], state_path="pool.json")
+        async with pool:
+            address = await pool.acquire("USDT", "TRC20", owner="order-42")
+    """
+
+    def __init__(
+        self,
+        client: "AdressesApiClient",
+        pairs: Iterable[Pair],
+        *,
+        size: int = 10,
+        low_water: int = 3,
+        concurrency: int = 4,
+        state_path: Union[str, Path, None] = None,
+        label_prefix: str = "pool",
+    ) -> None:
+        if not 0 <= low_water <= size:
+            raise ValueError("low_water must be between 0 and size")
+        self._client = client
+        self.size = size
+        self.low_water = low_water
+        self.concurrency = concurrency
+        self.state_path = None if state_path is None else Path(state_path)
+        self.label_prefix = label_prefix
+        self._free: Dict[Pair, Deque[Address]] = {
+            pair: deque() for pair in pairs
+        }
+        # owner -> json of the address assigned to it
+        self._assignments: Dict[str, Dict[str, Any]] = {}
+        self._refills: Dict[Pair, asyncio.Task] = {}
+        # concurrent acquires of one owner share the first one
+        self._acquires = SingleFlight()
+        # created on first use, in the loop the pool runs in
+        self._save_lock: Optional[asyncio.Lock] = None
+        self._executor = SerialExecutor("bitpapa-address-pool")
+        self._started = False
+
+    async def __aenter__(self) -> "AddressPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def available(self, currency: str, network: str) -> int:
+        return len(self._free[currency, network])
+
+    def assigned(self, owner: str) -> Optional[Address]:
+        data = self._assignments.get(owner)
+        return None if data is None else Address.model_validate(data)
+
+    async def start(self, wait: bool = True) -> None:
+        """Restore assignments and fill the pool.
+
+        With `wait` it returns once every pair has `size` addresses,
+        otherwise filling continues in the background.
+        """
+        if self._started:
+            return
+        self._started = True
+        self._assignments = await self._executor.run(self._load)
+        assigned = {data["label"] for data in self._assignments.values()}
+        # the pool keeps and saves models whatever the client's default
+        # response mode
+        response = await self._client.get_addresses(
+            response_mode=ResponseMode.VALIDATED,
+        )
+        for address in response.addresses:
+            pair = (address.currency, address.network)
+            if (
+                pair in self._free
+                and self._is_pool_label(address.label)
+                and address.label not in assigned
+            ):
+                self._free[pair].append(address)
+        for pair in self._free:
+            self._refill(pair, force=True)
+        if wait:
+            await asyncio.gather(*self._refills.values())
+
+    async def close(self) -> None:
+        for task in self._refills.values():
+            task.cancel()
+        await asyncio.gather(*self._refills.values(), return_exceptions=True)
+        self._refills.clear()
+        self._executor.shutdown()
+
+    async def acquire(
+        self,
+        currency: str,
+        network: str,
+        owner: str,
+    ) -> Address:
+        """Assign an unassigned address to `owner`.
+
+        The owner keeps its address: acquiring again, also after a
+        restart, returns the same one. An empty pool creates the address
+        on the spot.
+        """
+        return await self._acquires.do(
+            owner,
+            partial(self._acquire, currency, network, owner),
+        )
+
+    async def _acquire(
+        self,
+        currency: str,
+        network: str,
+        owner: str,
+    ) -> Address:
+        address = self.assigned(owner)
+        if address is not None:
+            return address
+        free = self._free[currency, network]
+        if free:
+            address = free.popleft()
+        else:
+            response = await self._client.create_address(
+                currency=currency,
+                network=network,
+                label=self._new_label(),
+                response_mode=ResponseMode.VALIDATED,
+            )
+            address = response.address
+        self._assignments[owner] = address.model_dump(mode="json")
+        self._refill((currency, network))
+        await self._save()
+        return address
+
+    def _refill(self, pair: Pair, force: bool = False) -> None:
+        task = self._refills.get(pair)
+        if task is not None and not task.done():
+            return
+        if force or len(self._free[pair]) < self.low_water:
+            self._refills[pair] = asyncio.ensure_future(self._fill(pair))
+
+    async def _fill(self, pair: Pair) -> None:
+        # addresses acquired while a round runs are not made up by it, so
+        # the level is checked again after every round
+        while await self._fill_round(pair):
+            if len(self._free[pair]) >= self.low_water:
+                return
+
+    async def _fill_round(self, pair: Pair) -> int:
+        """Create the addresses missing up to `size`, return how many
+        were created."""
+        currency, network = pair
+        missing = self.size - len(self._free[pair])
+        created = 0
+        factories = (
+            partial(
+                self._client.create_address,
+                currency=currency,
+                network=network,
+                label=self._new_label(),
+                response_mode=ResponseMode.VALIDATED,
+            )
+            for _ in range(missing)
+        )
+        async for _, future in iter_bounded(
+            factories,
+            concurrency=self.concurrency,
+            ordered=False,
+        ):
+            if future.exception() is not None:
+                get_logger().warning(
+                    "creating a pool address failed: {!r}",
+                    future.exception(),
+                )
+                continue
+            self._free[pair].append(future.result().address)
+            created += 1
+        return created
+
+    def _new_label(self) -> str:
+        return f"{self.label_prefix}-{uuid.uuid4().hex}"
+
+    def _is_pool_label(self, label: str) -> bool:
+        return label.startswith(f"{self.label_prefix}-")
+
+    async def _save(self) -> None:
+        if self.state_path is None:
+            return
+        if self._save_lock is None:
+            self._save_lock = asyncio.Lock()
+        async with self._save_lock:
+            data = json.dumps({"assignments": self._assignments})
+            await self._executor.run(partial(self._write, data))
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.state_path is None or not self.state_path.exists():
+            return {}
+        with self.state_path.open() as file:
+            return json.load(file)["assignments"]
+
+    def _write(self, data: str) -> None:
+        # a crash while writing must not lose the previous assignments
+        path = self.state_path.with_name(f"{self.state_path.name}.tmp")
+        with path.open("w") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        path.replace(self.state_path)
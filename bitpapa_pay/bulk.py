@@ -0,0 +1,92 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from pydantic import ValidationError
+
+from bitpapa_pay.enums import InvoiceType
+from bitpapa_pay.exceptions import (
+    InvalidInvoiceSpecError,
+    InvalidSpecError,
+)
+from bitpapa_pay.methods.invoices import (
+    CreateCryptoInvoiceMethod,
+    CreateFiatInvoiceMethod,
+    CreateInvoiceMethod,
+)
+from bitpapa_pay.schemas import CreateInvoiceResponse
+
+S = TypeVar("S")
+M = TypeVar("M")
+
+InvoiceSpec = Union[CreateInvoiceMethod, Mapping[str, Any]]
+
+
+class BulkInvoiceResult(NamedTuple):
+    index: int
+    response: Optional[CreateInvoiceResponse] = None
+    # BadRequestError, asyncio.TimeoutError or a pydantic ValidationError
+    # of a malformed response
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def build_invoice_method(spec: InvoiceSpec) -> CreateInvoiceMethod:
+    """Validated invoice method from a method or its keyword arguments.
+
+    A mapping is a fiat invoice when its `invoice_type` says so or, without
+    `invoice_type`, when it has a `fiat_amount`.
+    """
+    if isinstance(spec, CreateInvoiceMethod):
+        return spec
+    invoice_type = spec.get("invoice_type")
+    if invoice_type is None:
+        is_fiat = "fiat_amount" in spec
+    else:
+        is_fiat = invoice_type == InvoiceType.FIAT.value
+    if is_fiat:
+        return CreateFiatInvoiceMethod(**spec)
+    return CreateCryptoInvoiceMethod(**spec)
+
+
+def build_invoice_methods(
+    specs: Iterable[InvoiceSpec],
+) -> List[CreateInvoiceMethod]:
+    """Validate every spec, reporting all invalid ones at once.
+
+    Raises:
+        InvalidInvoiceSpecError: some specs did not pass validation
+    """
+    return build_methods(build_invoice_method, specs, InvalidInvoiceSpecError)
+
+
+def build_methods(
+    build: Callable[[S], M],
+    specs: Iterable[S],
+    error: Type[InvalidSpecError],
+) -> List[M]:
+    """Build a method from every spec, raising `error` with all the specs
+    that did not pass validation."""
+    methods = []
+    errors: Dict[int, Exception] = {}
+    for index, spec in enumerate(specs):
+        try:
+            methods.append(build(spec))
+        except ValidationError as e:  # noqa: PERF203
+            errors[index] = e
+    if errors:
+        raise error(errors)
+    return methods
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Optional,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+_MISSING: Any = object()
+
+
+class _Call:
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers of the same key.
+
+    The shared call runs in its own task, so a cancelled caller does not
+    cancel it for the others. It is cancelled only when every caller
+    waiting on it has gone away.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[T]],
+    ) -> T:
+        call = self._calls.get(key)
+        if call is None:
+            self.misses += 1
+            call = _Call(asyncio.ensure_future(factory()))
+            self._calls[key] = call
+            call.future.add_done_callback(
+                lambda _: self._forget(key, call),
+            )
+        else:
+            self.hits += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.future)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.future.done():
+                self._forget(key, call)
+                call.future.cancel()
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+class AsyncTTLCache(Generic[T]):
+    """Cache a single value produced by an async loader.
+
+    Concurrent misses share one load. Once the value is older than `ttl`
+    it keeps being served while a single background refresh runs, so
+    callers only wait on the loader before the first value is known.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[T]],
+        ttl: float,
+    ) -> None:
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        self._loader = loader
+        self._ttl = ttl
+        self._value: T = _MISSING
+        self._expires_at = 0.0
+        self._flight = SingleFlight()
+        self._refresh_task: Optional[asyncio.Future] = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return (
+            self._value is not _MISSING
+            and time.monotonic() < self._expires_at
+        )
+
+    async def get(self) -> T:
+        if self._value is _MISSING:
+            return await self._flight.do(None, self._load)
+        if time.monotonic() >= self._expires_at:
+            self._refresh_in_background()
+        return self._value
+
+    async def refresh(self) -> T:
+        return await self._flight.do(None, self._load)
+
+    def invalidate(self) -> None:
+        self._value = _MISSING
+        self._expires_at = 0.0
+
+    async def close(self) -> None:
+        task = self._refresh_task
+        self._refresh_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _load(self) -> T:
+        value = await self._loader()
+        self._value = value
+        self._expires_at = time.monotonic() + self._ttl
+        return value
+
+    def _refresh_in_background(self) -> None:
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.ensure_future(self.refresh())
+        # a failed refresh keeps the stale value, the next read retries
+        self._refresh_task.add_done_callback(
+            lambda task: task.cancelled() or task.exception(),
+        )
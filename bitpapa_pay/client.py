@@ -1,10 +1,48 @@
-from typing import List, Optional
+import asyncio
+import time
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from aiohttp import ClientError, ClientSession
-from loguru import logger
+from aiohttp import (
+    BaseConnector,
+    ClientError,
+    ClientResponse,
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+)
+from pydantic import BaseModel, TypeAdapter
 
-from bitpapa_pay.enums import RequestType
-from bitpapa_pay.exceptions import BadRequestError
+from bitpapa_pay._compat import get_logger
+from bitpapa_pay.bulk import (
+    BulkInvoiceResult,
+    InvoiceSpec,
+    build_invoice_methods,
+)
+from bitpapa_pay.cache import AsyncTTLCache, SingleFlight
+from bitpapa_pay.codec import JsonCodec, default_codec
+from bitpapa_pay.concurrency import iter_bounded
+from bitpapa_pay.deadline import Budget, Deadline, current_budget, within
+from bitpapa_pay.enums import RequestType, ResponseMode
+from bitpapa_pay.exceptions import BadRequestError, RequestTimeoutError
+from bitpapa_pay.fees import WithdrawalFeeIndex
+from bitpapa_pay.hedging import HedgePolicy
+from bitpapa_pay.instrumentation import Instrumentation, RequestRecord
 from bitpapa_pay.methods import (
     BaseMethod,
     CreateAddressMethod,
@@ -20,6 +58,19 @@ from bitpapa_pay.methods import (
     MasterRefillTransactionMethod,
     MasterWithdrawalTransactionMethod,
 )
+from bitpapa_pay.methods.invoices import (
+    CreateInvoiceMethod,
+    InvoiceTemplate,
+)
+from bitpapa_pay.payouts import (
+    PayoutMethod,
+    PayoutResult,
+    PayoutScheduler,
+    PayoutSpec,
+)
+from bitpapa_pay.rates import RateMatrix
+from bitpapa_pay.retry import RetryPolicy, RetryStats
+from bitpapa_pay.scheduler import RequestScheduler
 from bitpapa_pay.schemas import (
     CreateAddressResponse,
     CreateInvoiceResponse,
@@ -29,21 +80,139 @@ from bitpapa_pay.schemas import (
     GetInvoicesResponse,
     GetTransactionsResponse,
     GetWithdrawalFeesResponse,
+    Invoice,
     TransactionResponse,
 )
+from bitpapa_pay.schemas.construct import construct_model
+from bitpapa_pay.schemas.transactions import Transaction
+from bitpapa_pay.streaming import JsonArraySplitter
+from bitpapa_pay.waiter import FINAL_INVOICE_STATUSES, InvoiceWaiter
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model: Type[BaseModel], field: str) -> TypeAdapter:
+    return TypeAdapter(model.model_fields[field].annotation)
+
+
+def _params_key(params: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    # values are compared as they are sent in the query string
+    return tuple(sorted((key, str(value)) for key, value in params.items()))
+
+
+def _client_timeout(
+    session: ClientSession,
+    budget: Optional[Budget],
+) -> ClientTimeout:
+    if budget is None:
+        return session.timeout
+    return budget.client_timeout(session.timeout)
+
+
+def _invoices_page(page: Any) -> Tuple[List[Any], int]:
+    if isinstance(page, dict):
+        return page["invoices"], page["pages"]
+    return page.invoices, page.pages
 
 
 class HttpClient:
     BASE_URL = "https://bitpapa.com"
 
-    def __init__(self, api_token: str, debug: bool = False) -> None:
+    def __init__(
+        self,
+        api_token: str,
+        debug: bool = False,
+        *,
+        base_url: Optional[str] = None,
+        session: Optional[ClientSession] = None,
+        connector: Optional[BaseConnector] = None,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: Optional[int] = 10,
+        timeout: Optional[ClientTimeout] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        json_codec: Optional[JsonCodec] = None,
+        response_mode: ResponseMode = ResponseMode.VALIDATED,
+        instrumentation: Optional[Instrumentation] = None,
+        coalesce_requests: bool = False,
+        deadline: Optional[Deadline] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+    ) -> None:
+        """
+        Args:
+            api_token: Bitpapa api token, sent with every request
+            debug: log requests and responses
+            base_url: api address, `BASE_URL` by default
+            session: externally owned session, it is never closed here
+            connector: externally owned connector shared with other
+                clients, it is never closed here
+            limit: total connections of the connector built by the client
+            limit_per_host: connections per host of that connector
+            keepalive_timeout: seconds an idle connection is kept alive
+            ttl_dns_cache: seconds resolved hosts are cached
+            timeout: timeouts of the session built by the client
+            retry_policy: retries failed idempotent requests, by default
+                nothing is retried
+            scheduler: rate limits and prioritizes requests, it may be
+                shared by clients
+            json_codec: encodes request bodies and decodes responses,
+                orjson when it is installed and stdlib json otherwise
+            response_mode: how responses are returned unless a call says
+                otherwise: validated models, trusted models built without
+                validation, or the raw decoded json
+            instrumentation: collects timings, status codes and latency
+                histograms of every call, it may be shared by clients
+            coalesce_requests: concurrent identical GET requests share
+                one in-flight request, its hits and misses are counted by
+                `coalescer`
+            deadline: limits every call to a total time and each request
+                to connect and first byte times; a `deadline` block
+                around calls can only tighten them
+            hedge_policy: sends a second copy of GET requests slower than
+                their usual latency and takes the first answer
+        """
         self._debug = debug
         self._api_token = api_token
-        self._session: Optional[ClientSession] = None
+        self._base_url = base_url or self.BASE_URL
+        self._headers = self.get_headers()
+        self._session = session
+        self._owns_session = session is None
+        self._connector = connector
+        self._connector_options = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+        }
+        self._timeout = timeout
+        self._retry_policy = retry_policy
+        self.retry_stats = RetryStats()
+        self._scheduler = scheduler
+        self._codec = json_codec or default_codec()
+        self._response_mode = ResponseMode(response_mode)
+        self._instrumentation = instrumentation
+        self.coalescer: Optional[SingleFlight] = None
+        if coalesce_requests:
+            self.coalescer = SingleFlight()
+        self._deadline = deadline
+        self.hedge_policy = hedge_policy
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def instrumentation(self) -> Optional[Instrumentation]:
+        return self._instrumentation
 
     def debug_message(self, message: str):
         if self._debug:
-            logger.debug(message)
+            get_logger().debug(message)
 
     def get_headers(self):
         return {
@@ -53,87 +222,493 @@ class HttpClient:
         }
 
     def get_session(self) -> ClientSession:
-        headers = self.get_headers()
-        self.debug_message(f"request headers: {headers}")
+        session = self._session
+        if session is not None and not session.closed:
+            return session
+        if not self._owns_session:
+            raise RuntimeError("The injected session is closed.")
 
-        if isinstance(self._session, ClientSession):
-            return self._session
-        self._session = ClientSession(base_url=self.BASE_URL, headers=headers)
+        connector = self._connector
+        if connector is None:
+            connector = TCPConnector(**self._connector_options)
+        options = {}
+        if self._timeout is not None:
+            options["timeout"] = self._timeout
+        if self._instrumentation is not None:
+            options["trace_configs"] = [self._instrumentation.trace_config()]
+        self._session = ClientSession(
+            connector=connector,
+            connector_owner=self._connector is None,
+            **options,
+        )
+        self._log("session created")
         return self._session
 
     async def close(self):
-        if isinstance(self._session, ClientSession):
+        if self._owns_session and self._session is not None:
             await self._session.close()
 
+    def _url(self, endpoint: str) -> str:
+        return f"{self._base_url}{endpoint}"
+
     async def _get_request(
         self,
         session: ClientSession,
         endpoint: str,
         params: Optional[dict] = None,
-    ):
-        async with session.get(url=endpoint, params=params) as resp:
-            self.debug_message(f"status: {resp.status}")
-            resp.raise_for_status()
-            return await resp.json()
+        record: Optional[RequestRecord] = None,
+        timeout: Optional[ClientTimeout] = None,
+    ) -> bytes:
+        async with session.get(
+            url=self._url(endpoint),
+            params=params,
+            headers=self._headers,
+            timeout=timeout or session.timeout,
+            trace_request_ctx=record,
+        ) as resp:
+            return await self._read_response(resp, record)
 
     async def _post_request(
         self,
         session: ClientSession,
         endpoint: str,
-        json_data: Optional[dict] = None,
-    ):
-        async with session.post(url=endpoint, json=json_data) as resp:
-            self.debug_message(f"status: {resp.status}")
+        data: bytes,
+        record: Optional[RequestRecord] = None,
+        timeout: Optional[ClientTimeout] = None,
+    ) -> bytes:
+        async with session.post(
+            url=self._url(endpoint),
+            data=data,
+            headers=self._headers,
+            timeout=timeout or session.timeout,
+            trace_request_ctx=record,
+        ) as resp:
+            return await self._read_response(resp, record)
+
+    async def _open_stream(
+        self,
+        session: ClientSession,
+        endpoint: str,
+        params: dict,
+        record: Optional[RequestRecord] = None,
+        timeout: Optional[ClientTimeout] = None,
+    ) -> ClientResponse:
+        resp = await session.get(
+            url=self._url(endpoint),
+            params=params,
+            headers=self._headers,
+            timeout=timeout or session.timeout,
+            trace_request_ctx=record,
+        )
+        self._log("status: {}", resp.status)
+        if record is not None:
+            record.status = resp.status
+        try:
             resp.raise_for_status()
-            return await resp.json()
+        except ClientError:
+            resp.release()
+            raise
+        return resp
 
-    async def _make_request(self, method: BaseMethod):
+    async def _stream_items(
+        self,
+        method: BaseMethod,
+        model: Type[ModelT],
+        response_mode: Optional[ResponseMode] = None,
+    ) -> AsyncIterator[Any]:
+        """Send a GET method and build `model` from each item of the json
+        array in the response body while it is downloaded.
+
+        Retries, the scheduler and the total deadline cover the request
+        until the response headers arrive, not the download.
+        """
+        if response_mode is None:
+            response_mode = self._response_mode
+        else:
+            response_mode = ResponseMode(response_mode)
+        record = self._start_record(method)
+        params = method.to_params()
+        self._log("stream url: {}{}", self._base_url, method.endpoint)
+        self._log("params: {}", params)
         session = self.get_session()
-        self.debug_message(
-            f"request url: {self.BASE_URL}{method.endpoint}",
+        budget = current_budget(self._deadline)
+        try:
+            resp = await within(
+                budget,
+                partial(
+                    self._send_with_retries,
+                    method,
+                    partial(
+                        self._open_stream,
+                        session,
+                        method.endpoint,
+                        params,
+                        record,
+                        _client_timeout(session, budget),
+                    ),
+                    record,
+                ),
+            )
+            try:
+                splitter = JsonArraySplitter()
+                async for chunk in resp.content.iter_any():
+                    for item in splitter.feed(chunk):
+                        yield self._build_response(
+                            item,
+                            model,
+                            None,
+                            response_mode,
+                            record,
+                        )
+                    if splitter.finished:
+                        break
+                if not splitter.finished:
+                    raise BadRequestError(
+                        "response body ended inside the json array",
+                        status=resp.status,
+                    )
+            finally:
+                resp.release()
+        except BaseException as e:
+            if record is not None:
+                record.error = e
+            raise
+        finally:
+            if record is not None:
+                self._instrumentation.finish(record)
+
+    async def _read_response(
+        self,
+        resp: ClientResponse,
+        record: Optional[RequestRecord],
+    ) -> bytes:
+        self._log("status: {}", resp.status)
+        if record is None:
+            resp.raise_for_status()
+            return await resp.read()
+        record.status = resp.status
+        resp.raise_for_status()
+        started = time.perf_counter()
+        body = await resp.read()
+        record.add("download", time.perf_counter() - started)
+        return body
+
+    def _log(self, message: str, *args: Any) -> None:
+        # arguments are only formatted when the message is logged
+        if self._debug:
+            get_logger().debug(message, *args)
+
+    def _start_record(self, method: BaseMethod) -> Optional[RequestRecord]:
+        if self._instrumentation is None:
+            return None
+        record = self._instrumentation.start(
+            type(method).__name__,
+            method.endpoint,
+            method.route,
         )
+        record.add("validation", method.validation_time)
+        return record
+
+    async def _request_model(
+        self,
+        method: BaseMethod,
+        model: Type[ModelT],
+        field: Optional[str] = None,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> Any:
+        """Send the method and build `model` from the response body.
+
+        Validated responses are parsed by pydantic from the raw body, no
+        intermediate dict is built. Trusted responses are constructed from
+        the decoded body without validation and raw responses are the
+        decoded body itself. A response that is a bare list becomes the
+        `field` of `model`.
+        """
+        if response_mode is None:
+            response_mode = self._response_mode
+        else:
+            response_mode = ResponseMode(response_mode)
+        record = self._start_record(method)
         try:
-            if method.request_type == RequestType.GET:
-                params = method.to_params()
-                self.debug_message(f"params: {params}")
-                result = await self._get_request(
-                    session=session,
-                    endpoint=method.endpoint,
-                    params=params,
-                )
-            elif method.request_type == RequestType.POST:
-                payload_data = method.to_payload()
-                self.debug_message(f"request data: {payload_data}")
-                result = await self._post_request(
-                    session=session,
-                    endpoint=method.endpoint,
-                    json_data=payload_data,
-                )
-        except ClientError as e:
-            raise BadRequestError(e)
-        self.debug_message(f"request result: {result}")
+            body = await self._fetch(method, record)
+            return self._build_response(
+                body,
+                model,
+                field,
+                response_mode,
+                record,
+            )
+        except BaseException as e:
+            if record is not None:
+                record.error = e
+            raise
+        finally:
+            if record is not None:
+                self._instrumentation.finish(record)
+
+    def _build_response(
+        self,
+        body: bytes,
+        model: Type[ModelT],
+        field: Optional[str],
+        response_mode: ResponseMode,
+        record: Optional[RequestRecord],
+    ) -> Any:
+        started = time.perf_counter()
+        if response_mode == ResponseMode.VALIDATED:
+            if field is None:
+                result = model.model_validate_json(body)
+            else:
+                adapter = _field_adapter(model, field)
+                result = model(**{field: adapter.validate_json(body)})
+            if record is not None:
+                record.add("model_build", time.perf_counter() - started)
+            return result
+
+        data = self._codec.loads(body)
+        if record is not None:
+            decoded = time.perf_counter()
+            record.add("decode", decoded - started)
+            started = decoded
+        if response_mode == ResponseMode.RAW:
+            return data
+        result = construct_model(
+            model,
+            data if field is None else {field: data},
+        )
+        if record is not None:
+            record.add("model_build", time.perf_counter() - started)
         return result
 
+    async def _fetch(
+        self,
+        method: BaseMethod,
+        record: Optional[RequestRecord] = None,
+    ) -> bytes:
+        session = self.get_session()
+        budget = current_budget(self._deadline)
+        timeout = _client_timeout(session, budget)
+        self._log("request url: {}{}", self._base_url, method.endpoint)
+        started = time.perf_counter()
+        is_get = method.request_type == RequestType.GET
+        if is_get:
+            params = method.to_params()
+            self._log("params: {}", params)
+            send = partial(
+                self._get_request,
+                session=session,
+                endpoint=method.endpoint,
+                params=params,
+                timeout=timeout,
+            )
+        elif method.request_type == RequestType.POST:
+            payload_data = method.to_payload()
+            self._log("request data: {}", payload_data)
+            send = partial(
+                self._post_request,
+                session=session,
+                endpoint=method.endpoint,
+                data=self._codec.dumps(payload_data),
+                timeout=timeout,
+            )
+        if record is not None:
+            record.add("serialization", time.perf_counter() - started)
+        fetch = partial(
+            self._send_with_retries,
+            method,
+            partial(send, record=record),
+            record,
+        )
+        if is_get and self.hedge_policy is not None:
+            # the copy is not traced, its timings would mix into the record
+            fetch = partial(
+                self.hedge_policy.run,
+                method.route,
+                fetch,
+                partial(
+                    self._send_with_retries,
+                    method,
+                    partial(send, record=None),
+                ),
+            )
+        if is_get and self.coalescer is not None:
+            key = (method.endpoint, _params_key(params))
+            if record is not None:
+                record.coalesced = key in self.coalescer
+            fetch = partial(self.coalescer.do, key, fetch)
+        body = await within(budget, fetch)
+        self._log("request result: {!r}", body)
+        return body
+
+    async def _send_with_retries(
+        self,
+        method: BaseMethod,
+        send: Callable[[], Awaitable[Any]],
+        record: Optional[RequestRecord] = None,
+    ):
+        policy = self._retry_policy
+        self.retry_stats.calls += 1
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if record is not None:
+                record.attempts = attempt
+            try:
+                if policy is None or policy.total_timeout is None:
+                    return await self._send_once(method, send)
+                # the attempt may only use what is left of the call's time
+                return await asyncio.wait_for(
+                    self._send_once(method, send),
+                    policy.total_timeout - (time.monotonic() - started),
+                )
+            except (ClientError, asyncio.TimeoutError) as e:
+                delay = None
+                if policy is not None:
+                    delay = policy.get_delay(
+                        method,
+                        e,
+                        attempt,
+                        time.monotonic() - started,
+                    )
+                if delay is None:
+                    self.retry_stats.failures += 1
+                    # socket timeouts of aiohttp are client errors as well
+                    if isinstance(e, asyncio.TimeoutError):
+                        raise RequestTimeoutError(
+                            f"{method.endpoint} timed out",
+                            attempts=attempt,
+                        ) from e
+                    raise BadRequestError(
+                        e,
+                        status=getattr(e, "status", None),
+                        attempts=attempt,
+                    ) from e
+            self.retry_stats.retries += 1
+            self._log(
+                "retry {} of {} in {:.3f}s",
+                attempt,
+                method.endpoint,
+                delay,
+            )
+            await asyncio.sleep(delay)
+
+    async def _send_once(
+        self,
+        method: BaseMethod,
+        send: Callable[[], Awaitable[Any]],
+    ):
+        if self._scheduler is None:
+            return await send()
+        async with self._scheduler.slot(
+            self._api_token,
+            method.endpoint,
+            method.priority,
+        ):
+            return await send()
+
 
 class DefaultApiClient(HttpClient):
-    async def get_exchange_rates_all(self) -> GetExchangeRatesResponse:
+    def __init__(
+        self,
+        *args,
+        exchange_rates_ttl: Optional[float] = None,
+        withdrawal_fees_ttl: float = 300.0,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._withdrawal_fee_index_cache = AsyncTTLCache(
+            self._build_withdrawal_fee_index,
+            ttl=withdrawal_fees_ttl,
+        )
+        self._exchange_rates_cache: Optional[
+            AsyncTTLCache[GetExchangeRatesResponse]
+        ] = None
+        if exchange_rates_ttl is not None:
+            self._exchange_rates_cache = AsyncTTLCache(
+                self._fetch_exchange_rates_all,
+                ttl=exchange_rates_ttl,
+            )
+        self._rate_matrix: Optional[Tuple[Any, RateMatrix]] = None
+
+    async def close(self):
+        if self._exchange_rates_cache is not None:
+            await self._exchange_rates_cache.close()
+        await self._withdrawal_fee_index_cache.close()
+        await super().close()
+
+    async def get_exchange_rates_all(
+        self,
+        *,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> GetExchangeRatesResponse:
         """Get all exchange rates, https://apidocs.bitpapa.com/docs/backend-apis-english/97573257c4827-get-a-v-1-exchange-rate-all
 
+        With `exchange_rates_ttl` set the rates are cached: concurrent
+        misses share one request and expired rates are served while a
+        single background refresh runs. The cache only serves calls in the
+        client's response mode.
+
         Returns:
             GetExchangeRatesOut: An object where the keys are abbreviations of
             a pair of exchange rates separated by "_"
         """
-        method = GetExchangeRateMetod()
-        result = await self._make_request(method)
-        return GetExchangeRatesResponse(**result)
+        if self._exchange_rates_cache is not None and response_mode is None:
+            return await self._exchange_rates_cache.get()
+        return await self._fetch_exchange_rates_all(response_mode)
+
+    async def _fetch_exchange_rates_all(
+        self,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> GetExchangeRatesResponse:
+        method = GetExchangeRateMetod.cached()
+        return await self._request_model(
+            method,
+            GetExchangeRatesResponse,
+            response_mode=response_mode,
+        )
 
-    async def get_withdrawal_fees(self) -> GetWithdrawalFeesResponse:
+    async def get_withdrawal_fees(
+        self,
+        *,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> GetWithdrawalFeesResponse:
         """
         Список слоев комиссий за вывод BTC и XMR в зависимости от суммы вывода в USD.
         """
-        method = GetWithdrawalFeesMethod()
-        result = await self._make_request(method)
-        return GetWithdrawalFeesResponse(**result)
+        method = GetWithdrawalFeesMethod.cached()
+        return await self._request_model(
+            method,
+            GetWithdrawalFeesResponse,
+            response_mode=response_mode,
+        )
+
+    async def get_withdrawal_fee_index(self) -> WithdrawalFeeIndex:
+        """Withdrawal fees compiled for binary-search lookups.
+
+        The index is rebuilt from `get_withdrawal_fees` once it is older
+        than `withdrawal_fees_ttl`; until the rebuild lands the previous
+        index keeps being served.
+        """
+        return await self._withdrawal_fee_index_cache.get()
+
+    async def _build_withdrawal_fee_index(self) -> WithdrawalFeeIndex:
+        fees = await self.get_withdrawal_fees(
+            response_mode=ResponseMode.VALIDATED,
+        )
+        return WithdrawalFeeIndex.from_response(fees)
+
+    async def get_rate_matrix(self) -> RateMatrix:
+        """Exchange rates compiled into a `RateMatrix` for conversions.
+
+        The matrix is built from `get_exchange_rates_all` and rebuilt only
+        when those rates change, so with `exchange_rates_ttl` set it is
+        reused until the cached rates are refreshed.
+        """
+        rates = await self.get_exchange_rates_all()
+        if self._rate_matrix is None or self._rate_matrix[0] is not rates:
+            self._rate_matrix = (rates, RateMatrix.from_response(rates))
+        return self._rate_matrix[1]
 
 
 class AdressesApiClient(HttpClient):
@@ -141,47 +716,113 @@ class AdressesApiClient(HttpClient):
         self,
         currency: Optional[str] = None,
         label: Optional[str] = None,
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> GetAddressesResponse:
-        method = GetAddressesMethod(currency=currency, label=label)
-        result = await self._make_request(method)
-        return GetAddressesResponse(addresses=result)
+        method = GetAddressesMethod.cached(
+            currency=currency,
+            label=label,
+        )
+        return await self._request_model(
+            method,
+            GetAddressesResponse,
+            "addresses",
+            response_mode,
+        )
 
     async def create_address(
         self,
         currency: str,
         network: str,
         label: str = "",
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> CreateAddressResponse:
         method = CreateAddressMethod(
             currency=currency,
             network=network,
             label=label,
         )
-        result = await self._make_request(method)
-        return CreateAddressResponse(**result)
+        return await self._request_model(
+            method,
+            CreateAddressResponse,
+            response_mode=response_mode,
+        )
 
     async def get_transactions(
         self,
         page: int = 1,
         limit: int = 100,
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> GetTransactionsResponse:
-        method = GetTransactionsMethod(page=page, limit=limit)
-        result = await self._make_request(method)
-        return GetTransactionsResponse(transactions=result)
+        method = GetTransactionsMethod.cached(page=page, limit=limit)
+        return await self._request_model(
+            method,
+            GetTransactionsResponse,
+            "transactions",
+            response_mode,
+        )
 
     async def get_address_transactions(
         self,
         uuid: str,
         page: int = 1,
         limit: int = 100,
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> GetAddressTransactionsResponse:
-        method = GetAddressTransactionMethod(
+        method = GetAddressTransactionMethod.cached(
             uuid=uuid,
             page=page,
             limit=limit,
         )
-        result = await self._make_request(method)
-        return GetAddressTransactionsResponse(**result)
+        return await self._request_model(
+            method,
+            GetAddressTransactionsResponse,
+            response_mode=response_mode,
+        )
+
+    async def stream_transactions(
+        self,
+        page: int = 1,
+        limit: int = 100,
+        *,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> AsyncIterator[Transaction]:
+        """Like `get_transactions`, but yield the transactions one by one
+        while the page is downloaded instead of loading it at once.
+        """
+        method = GetTransactionsMethod.cached(page=page, limit=limit)
+        async for transaction in self._stream_items(
+            method,
+            Transaction,
+            response_mode,
+        ):
+            yield transaction
+
+    async def stream_address_transactions(
+        self,
+        uuid: str,
+        page: int = 1,
+        limit: int = 100,
+        *,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> AsyncIterator[Transaction]:
+        """Like `get_address_transactions`, but yield the transactions one
+        by one while the page is downloaded.
+        """
+        method = GetAddressTransactionMethod.cached(
+            uuid=uuid,
+            page=page,
+            limit=limit,
+        )
+        async for transaction in self._stream_items(
+            method,
+            Transaction,
+            response_mode,
+        ):
+            yield transaction
 
     async def create_transaction(
         self,
@@ -191,6 +832,8 @@ class AdressesApiClient(HttpClient):
         to_address: str,
         network: str,
         label: str = "",
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> TransactionResponse:
         method = CreateTransactionMethod(
             currency=currency,
@@ -200,8 +843,10 @@ class AdressesApiClient(HttpClient):
             network=network,
             label=label,
         )
-        result = await self._make_request(method)
-        return TransactionResponse(**result)
+        return await self.send_transaction(
+            method,
+            response_mode=response_mode,
+        )
 
     async def master_withdrawal_transaction(
         self,
@@ -210,6 +855,8 @@ class AdressesApiClient(HttpClient):
         to_address: str,
         network: str,
         label: str = "",
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> TransactionResponse:
         method = MasterWithdrawalTransactionMethod(
             currency=currency,
@@ -218,8 +865,10 @@ class AdressesApiClient(HttpClient):
             network=network,
             label=label,
         )
-        result = await self._make_request(method)
-        return TransactionResponse(**result)
+        return await self.send_transaction(
+            method,
+            response_mode=response_mode,
+        )
 
     async def master_refill_transaction(
         self,
@@ -228,6 +877,8 @@ class AdressesApiClient(HttpClient):
         from_address: str,
         network: str,
         label: str = "",
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> TransactionResponse:
         method = MasterRefillTransactionMethod(
             currency=currency,
@@ -236,20 +887,135 @@ class AdressesApiClient(HttpClient):
             network=network,
             label=label,
         )
-        result = await self._make_request(method)
-        return TransactionResponse(**result)
+        return await self.send_transaction(
+            method,
+            response_mode=response_mode,
+        )
+
+    async def send_transaction(
+        self,
+        method: PayoutMethod,
+        *,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> TransactionResponse:
+        """Send a transfer, master withdrawal or master refill method."""
+        return await self._request_model(
+            method,
+            TransactionResponse,
+            response_mode=response_mode,
+        )
+
+    async def send_payouts(
+        self,
+        specs: Iterable[PayoutSpec],
+        concurrency: int = 10,
+        journal_path: Union[str, Path, None] = None,
+        keys: Optional[Sequence[str]] = None,
+    ) -> List[PayoutResult]:
+        """Send a batch of payouts through a `PayoutScheduler`.
+
+        Payouts from one source address are sent in order, different
+        sources in parallel. With `journal_path` a rerun of the same batch
+        after a crash does not send a payout twice.
+
+        Raises:
+            InvalidPayoutSpecError: some specs did not pass validation
+
+        Returns:
+            List[PayoutResult]: results in the order of `specs`
+        """
+        async with PayoutScheduler(
+            self,
+            concurrency=concurrency,
+            journal_path=journal_path,
+        ) as scheduler:
+            return await scheduler.run(specs, keys)
 
 
 class BitpapaPayClient(HttpClient):
-    async def get_invoices(self, page: int = 1) -> GetInvoicesResponse:
+    def __init__(
+        self,
+        *args,
+        final_invoice_statuses: Iterable[str] = FINAL_INVOICE_STATUSES,
+        invoice_poll_interval: float = 1.0,
+        invoice_poll_max_interval: float = 10.0,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.invoice_waiter = InvoiceWaiter(
+            self,
+            final_statuses=final_invoice_statuses,
+            interval=invoice_poll_interval,
+            max_interval=invoice_poll_max_interval,
+        )
+
+    async def close(self):
+        await self.invoice_waiter.close()
+        await super().close()
+
+    async def get_invoices(
+        self,
+        page: int = 1,
+        *,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> GetInvoicesResponse:
         """Get the list of invoices, https://apidocs.bitpapa.com/docs/backend-apis-english/qph49kfhdjx0x-get-the-list-of-invoices
 
         Returns:
             TelegramInvoices: list of telegram invoices
         """
-        method = GetInvoicesMethod(page=page)
-        result = await self._make_request(method)
-        return GetInvoicesResponse(**result)
+        method = GetInvoicesMethod.cached(page=page)
+        return await self._request_model(
+            method,
+            GetInvoicesResponse,
+            response_mode=response_mode,
+        )
+
+    async def iter_invoices(
+        self,
+        concurrency: int = 4,
+        start_page: int = 1,
+        max_pages: Optional[int] = None,
+        *,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> AsyncIterator[Invoice]:
+        """Iterate over invoices of all pages starting from `start_page`.
+
+        The first page tells how many pages there are, the rest are fetched
+        concurrently, at most `concurrency` at a time. Invoices are yielded
+        in page order as soon as their page has arrived; in the raw
+        response mode they are the decoded invoice dicts.
+
+        Returns:
+            AsyncIterator[Invoice]: invoices of every fetched page
+        """
+        if max_pages is not None and max_pages < 1:
+            raise ValueError("max_pages must be greater than 0")
+        first_page = await self.get_invoices(
+            page=start_page,
+            response_mode=response_mode,
+        )
+        invoices, last_page = _invoices_page(first_page)
+        for invoice in invoices:
+            yield invoice
+
+        if max_pages is not None:
+            last_page = min(last_page, start_page + max_pages - 1)
+        pages = range(start_page + 1, last_page + 1)
+        async for _, future in iter_bounded(
+            (
+                partial(
+                    self.get_invoices,
+                    page=page,
+                    response_mode=response_mode,
+                )
+                for page in pages
+            ),
+            concurrency=concurrency,
+        ):
+            invoices, _ = _invoices_page(future.result())
+            for invoice in invoices:
+                yield invoice
 
     async def create_crypto_invoice(
         self,
@@ -261,6 +1027,8 @@ class BitpapaPayClient(HttpClient):
         paid_button_url: Optional[str] = None,
         private_message: Optional[str] = None,
         crypto_address: Optional[str] = None,
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> CreateInvoiceResponse:
         method = CreateCryptoInvoiceMethod(
             amount=amount,
@@ -272,8 +1040,7 @@ class BitpapaPayClient(HttpClient):
             paid_button_url=paid_button_url,
             private_message=private_message,
         )
-        raw_response = await self._make_request(method)
-        return CreateInvoiceResponse(**raw_response)
+        return await self._create_invoice(method, response_mode)
 
     async def create_fiat_invoice(
         self,
@@ -286,6 +1053,8 @@ class BitpapaPayClient(HttpClient):
         paid_button_url: Optional[str] = None,
         private_message: Optional[str] = None,
         crypto_address: Optional[str] = None,
+        *,
+        response_mode: Optional[ResponseMode] = None,
     ) -> CreateInvoiceResponse:
         method = CreateFiatInvoiceMethod(
             accepted_crypto=accepted_crypto,
@@ -298,8 +1067,96 @@ class BitpapaPayClient(HttpClient):
             paid_button_url=paid_button_url,
             private_message=private_message,
         )
-        raw_response = await self._make_request(method)
-        return CreateInvoiceResponse(**raw_response)
+        return await self._create_invoice(method, response_mode)
+
+    async def create_invoices_bulk(
+        self,
+        specs: Iterable[InvoiceSpec],
+        concurrency: int = 10,
+        ordered: bool = True,
+    ) -> AsyncIterator[BulkInvoiceResult]:
+        """Create many crypto and fiat invoices concurrently.
+
+        Every spec is validated before anything is sent, so an invalid
+        batch is rejected as a whole. A spec is an invoice method or the
+        keyword arguments of `create_crypto_invoice`/`create_fiat_invoice`.
+        A failed request, timed out or answered with a response that did
+        not validate, does not stop the batch, its result carries the
+        error instead.
+
+        Raises:
+            InvalidInvoiceSpecError: some specs did not pass validation
+
+        Returns:
+            AsyncIterator[BulkInvoiceResult]: results in input order, or as
+            they complete when `ordered` is False
+        """
+        methods = build_invoice_methods(specs)
+        async for index, future in iter_bounded(
+            (partial(self._create_invoice, method) for method in methods),
+            concurrency=concurrency,
+            ordered=ordered,
+        ):
+            error = future.exception()
+            if error is None:
+                yield BulkInvoiceResult(index, response=future.result())
+            else:
+                yield BulkInvoiceResult(index, error=error)
+
+    async def create_invoice_from_template(
+        self,
+        template: InvoiceTemplate,
+        amount: float,
+        merchant_invoice_id: Optional[str] = None,
+        *,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> CreateInvoiceResponse:
+        """Create an invoice from an `InvoiceTemplate`, validating and
+        serializing only the amount and the merchant invoice id."""
+        return await self._create_invoice(
+            template.build(amount, merchant_invoice_id),
+            response_mode,
+        )
+
+    async def _create_invoice(
+        self,
+        method: CreateInvoiceMethod,
+        response_mode: Optional[ResponseMode] = None,
+    ) -> CreateInvoiceResponse:
+        return await self._request_model(
+            method,
+            CreateInvoiceResponse,
+            response_mode=response_mode,
+        )
+
+    async def wait_for_invoice(
+        self,
+        invoice_id: str,
+        timeout: Optional[float] = None,
+    ) -> Invoice:
+        """Wait until the invoice is in a final status, paid or expired by
+        default.
+
+        All waiting calls of the client share one background poller, see
+        `InvoiceWaiter`.
+
+        Raises:
+            asyncio.TimeoutError: the invoice is still open after
+                `timeout` seconds
+        """
+        return await self.invoice_waiter.wait(invoice_id, timeout)
+
+    async def wait_for_invoices(
+        self,
+        invoice_ids: Iterable[str],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Invoice]:
+        """Wait until every invoice is in a final status.
+
+        Returns:
+            Dict[str, Invoice]: final invoices by id
+        """
+        return await self.invoice_waiter.wait_many(invoice_ids, timeout)
 
 
 class BitpapaPay(BitpapaPayClient, AdressesApiClient, DefaultApiClient):
@@ -0,0 +1,61 @@
+import json
+from typing import Any, Optional
+
+
+class JsonCodec:
+    """Encodes request bodies and decodes response bodies with stdlib json.
+
+    Subclass it to plug in another json library.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson  # noqa: PLC0415
+
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson  # noqa: PLC0415
+
+        self._ujson = ujson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False).encode()
+
+    def loads(self, data: bytes) -> Any:
+        return self._ujson.loads(data)
+
+
+_default_codec: Optional[JsonCodec] = None
+
+
+def default_codec() -> JsonCodec:
+    """orjson when it is installed, stdlib json otherwise."""
+    global _default_codec  # noqa: PLW0603
+    if _default_codec is None:
+        try:
+            _default_codec = OrjsonCodec()
+        except ImportError:
+            _default_codec = JsonCodec()
+    return _default_codec
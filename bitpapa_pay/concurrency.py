@@ -0,0 +1,135 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+
+Factories = Iterator[Tuple[int, Callable[[], Awaitable[T]]]]
+
+
+async def iter_bounded(
+    factories: Iterable[Callable[[], Awaitable[T]]],
+    *,
+    concurrency: int,
+    ordered: bool = True,
+) -> AsyncIterator[Tuple[int, "asyncio.Future[T]"]]:
+    """Run awaitables with at most `concurrency` of them in flight.
+
+    Yields `(index, future)` pairs for finished awaitables, either in input
+    order or as they complete. The future is always done, so the caller
+    decides whether `future.result()` should raise. Pending work is
+    cancelled when the consumer stops iterating early.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be greater than 0")
+    source = enumerate(factories)
+    if ordered:
+        iterator = _iter_ordered(source, concurrency)
+    else:
+        iterator = _iter_unordered(source, concurrency)
+    try:
+        async for item in iterator:
+            yield item
+    finally:
+        await iterator.aclose()
+
+
+class SerialExecutor:
+    """Runs blocking calls one at a time on a thread of its own.
+
+    The thread is started by the first call and stopped by `shutdown`;
+    a call after that starts a new one.
+    """
+
+    def __init__(self, thread_name_prefix: str) -> None:
+        self.thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def run(self, func: Callable[[], T]) -> T:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=self.thread_name_prefix,
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+async def _cancel_all(futures: Iterable[asyncio.Future]) -> None:
+    futures = list(futures)
+    for future in futures:
+        future.cancel()
+    if futures:
+        await asyncio.gather(*futures, return_exceptions=True)
+
+
+async def _iter_ordered(
+    source: Factories,
+    concurrency: int,
+) -> AsyncIterator[Tuple[int, asyncio.Future]]:
+    window: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    def fill() -> None:
+        if len(window) >= concurrency:
+            return
+        for index, factory in source:
+            window.append((index, asyncio.ensure_future(factory())))
+            if len(window) >= concurrency:
+                return
+
+    try:
+        fill()
+        while window:
+            index, future = window[0]
+            await asyncio.wait([future])
+            window.popleft()
+            fill()
+            yield index, future
+    finally:
+        await _cancel_all(future for _, future in window)
+
+
+async def _iter_unordered(
+    source: Factories,
+    concurrency: int,
+) -> AsyncIterator[Tuple[int, asyncio.Future]]:
+    running: Dict[asyncio.Future, int] = {}
+
+    def fill() -> None:
+        if len(running) >= concurrency:
+            return
+        for index, factory in source:
+            running[asyncio.ensure_future(factory())] = index
+            if len(running) >= concurrency:
+                return
+
+    try:
+        fill()
+        while running:
+            done, _ = await asyncio.wait(
+                running,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            indexes = [(running.pop(future), future) for future in done]
+            fill()
+            for item in indexes:
+                yield item
+    finally:
+        await _cancel_all(running)
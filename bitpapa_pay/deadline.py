@@ -0,0 +1,136 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Iterator, NamedTuple, Optional, TypeVar
+
+from aiohttp import ClientTimeout
+
+from bitpapa_pay.exceptions import DeadlineExceededError
+
+T = TypeVar("T")
+
+
+class Deadline(NamedTuple):
+    """Seconds a call may take in total, to connect, and to receive the
+    first byte of the response. `first_byte` also limits stalls between
+    later chunks of the body. None leaves a limit to the session timeout.
+    """
+
+    total: Optional[float] = None
+    connect: Optional[float] = None
+    first_byte: Optional[float] = None
+
+
+class Budget(NamedTuple):
+    """A deadline fixed in time: `expires_at` is a `time.monotonic` value."""
+
+    expires_at: Optional[float] = None
+    connect: Optional[float] = None
+    first_byte: Optional[float] = None
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def tighten(self, deadline: Optional[Deadline], now: float) -> "Budget":
+        """Budget within both this one and `deadline` starting at `now`."""
+        if deadline is None:
+            return self
+        expires_at = None
+        if deadline.total is not None:
+            expires_at = now + deadline.total
+        return Budget(
+            _min(self.expires_at, expires_at),
+            _min(self.connect, deadline.connect),
+            _min(self.first_byte, deadline.first_byte),
+        )
+
+    def client_timeout(self, base: ClientTimeout) -> ClientTimeout:
+        """`base` with the connect and first byte limits applied."""
+        if self.connect is None and self.first_byte is None:
+            return base
+        return ClientTimeout(
+            total=base.total,
+            connect=base.connect,
+            sock_read=_min(base.sock_read, self.first_byte),
+            sock_connect=_min(base.sock_connect, self.connect),
+        )
+
+
+_budget: ContextVar[Optional[Budget]] = ContextVar(
+    "bitpapa_pay_budget",
+    default=None,
+)
+
+
+@contextmanager
+def deadline(
+    total: Optional[float] = None,
+    *,
+    connect: Optional[float] = None,
+    first_byte: Optional[float] = None,
+) -> Iterator[Budget]:
+    """Limit every call made in the block, including calls of tasks it
+    starts.
+
+    The `total` budget starts when the block is entered and is shared by
+    all its calls, so it bounds the block as a whole; `connect` and
+    `first_byte` apply to each request. Nested blocks and the `deadline`
+    of a client only make the limits tighter.
+
+        with deadline(2.0, connect=0.5):
+            invoice = await client.create_crypto_invoice(...)
+    """
+    outer = _budget.get() or Budget()
+    budget = outer.tighten(
+        Deadline(total, connect, first_byte),
+        time.monotonic(),
+    )
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def current_budget(default: Optional[Deadline] = None) -> Optional[Budget]:
+    """Budget of a call starting now: the one of the enclosing `deadline`
+    block tightened by `default`."""
+    budget = _budget.get()
+    if default is None:
+        return budget
+    return (budget or Budget()).tighten(default, time.monotonic())
+
+
+async def within(
+    budget: Optional[Budget],
+    factory: Callable[[], Awaitable[T]],
+) -> T:
+    """Await `factory()`, cancelling it when the budget runs out.
+
+    Raises:
+        DeadlineExceededError: the budget ran out first
+    """
+    remaining = None if budget is None else budget.remaining()
+    if remaining is None:
+        return await factory()
+    if remaining <= 0:
+        raise DeadlineExceededError("deadline exceeded before the call")
+    try:
+        return await asyncio.wait_for(factory(), remaining)
+    except asyncio.TimeoutError as e:
+        if isinstance(e, DeadlineExceededError) or budget.remaining() > 0:
+            raise
+        raise DeadlineExceededError(
+            f"deadline of {remaining:.3f}s exceeded",
+        ) from e
+
+
+def _min(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
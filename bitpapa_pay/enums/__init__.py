@@ -1,11 +1,15 @@
 from .crypto_currency_code import CryptoCurrencyCode
 from .invoice_type import InvoiceType
 from .paid_button_type import PaidButtonType
+from .request_priority import RequestPriority
 from .request_type import RequestType
+from .response_mode import ResponseMode
 
 __all__ = [
     "CryptoCurrencyCode",
     "InvoiceType",
     "PaidButtonType",
+    "RequestPriority",
     "RequestType",
+    "ResponseMode",
 ]
@@ -0,0 +1,7 @@
+from enum import IntEnum
+
+
+class RequestPriority(IntEnum):
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
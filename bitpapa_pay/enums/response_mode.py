@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ResponseMode(str, Enum):
+    VALIDATED = "validated"
+    TRUSTED = "trusted"
+    RAW = "raw"
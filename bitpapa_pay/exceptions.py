@@ -1,2 +1,53 @@
+import asyncio
+from typing import Dict, Optional
+
+
 class BadRequestError(Exception):
-    pass
+    def __init__(
+        self,
+        *args,
+        status: Optional[int] = None,
+        attempts: int = 1,
+    ) -> None:
+        super().__init__(*args)
+        self.status = status
+        self.attempts = attempts
+
+
+class RequestTimeoutError(BadRequestError, asyncio.TimeoutError):
+    """A request timed out on every attempt.
+
+    A POST that timed out may still have been executed by the api.
+    """
+
+
+class DeadlineExceededError(BadRequestError, asyncio.TimeoutError):
+    """The deadline of a call passed before it finished.
+
+    A POST cut short may still have been executed by the api.
+    """
+
+
+class InvalidSpecError(ValueError):
+    """Some specs of a batch did not pass validation.
+
+    `errors` maps the index of every invalid spec to its error.
+    """
+
+    kind = ""
+
+    def __init__(self, errors: Dict[int, Exception]) -> None:
+        first = min(errors)
+        super().__init__(
+            f"{len(errors)} invalid {self.kind} specs, first at index "
+            f"{first}: {errors[first]}",
+        )
+        self.errors = errors
+
+
+class InvalidInvoiceSpecError(InvalidSpecError):
+    kind = "invoice"
+
+
+class InvalidPayoutSpecError(InvalidSpecError):
+    kind = "payout"
@@ -0,0 +1,124 @@
+import math
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bitpapa_pay._compat import get_numpy
+from bitpapa_pay.schemas import GetWithdrawalFeesResponse
+
+
+class _FeeTiers:
+    __slots__ = ("fees", "lower", "upper")
+
+    def __init__(
+        self,
+        lower: List[float],
+        upper: List[float],
+        fees: List[float],
+    ) -> None:
+        self.lower = lower
+        self.upper = upper
+        self.fees = fees
+
+    def lookup(self, usd_amount: float) -> Optional[float]:
+        # last tier starting at or below the amount, so a shared boundary
+        # belongs to the tier above it
+        index = bisect_right(self.lower, usd_amount) - 1
+        if index < 0 or usd_amount > self.upper[index]:
+            return None
+        return self.fees[index]
+
+
+class WithdrawalFeeIndex:
+    """Withdrawal fee tiers compiled for lookups by USD amount.
+
+    Tiers are grouped by `(currency, network)` and sorted by `amount_min`,
+    so a fee is found with a binary search instead of a scan. Adjacent
+    tiers share their boundary, the `amount_max` of one being the
+    `amount_min` of the next; an amount exactly on it gets the fee of the
+    upper tier, the one starting there.
+    """
+
+    def __init__(self, tiers: Dict[Tuple[str, str], _FeeTiers]) -> None:
+        self._tiers = tiers
+
+    @classmethod
+    def from_response(
+        cls,
+        response: GetWithdrawalFeesResponse,
+    ) -> "WithdrawalFeeIndex":
+        grouped: Dict[Tuple[str, str], list] = {}
+        for currency, fees in response.withdrawal_fees.items():
+            for fee in fees:
+                grouped.setdefault((currency, fee.network), []).append(fee)
+
+        tiers = {}
+        for key, fees in grouped.items():
+            fees.sort(key=lambda fee: fee.amount_min)
+            tiers[key] = _FeeTiers(
+                lower=[float(fee.amount_min) for fee in fees],
+                upper=[
+                    math.inf if fee.amount_max is None
+                    else float(fee.amount_max)
+                    for fee in fees
+                ],
+                fees=[float(fee.fee) for fee in fees],
+            )
+        return cls(tiers)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._tiers
+
+    def networks(self, currency: str) -> List[str]:
+        return [
+            network for tier_currency, network in self._tiers
+            if tier_currency == currency
+        ]
+
+    def fee_for(
+        self,
+        currency: str,
+        network: str,
+        usd_amount: float,
+    ) -> Optional[float]:
+        """Fee of the tier containing `usd_amount`, None if no tier does.
+
+        Raises:
+            KeyError: there are no tiers for the currency and network
+        """
+        return self._get_tiers(currency, network).lookup(usd_amount)
+
+    def fees_for(
+        self,
+        currency: str,
+        network: str,
+        usd_amounts: Sequence[float],
+    ) -> Any:
+        """Fees for a batch of USD amounts.
+
+        A NumPy array is looked up in one vectorized call and gives an
+        array with NaN where no tier matches; any other sequence gives a
+        list with None in those places.
+
+        Raises:
+            KeyError: there are no tiers for the currency and network
+        """
+        tiers = self._get_tiers(currency, network)
+        np = get_numpy()
+        if np is not None and isinstance(usd_amounts, np.ndarray):
+            lower = np.asarray(tiers.lower)
+            index = np.searchsorted(lower, usd_amounts, side="right") - 1
+            clipped = index.clip(0)
+            matched = (index >= 0) & (
+                usd_amounts <= np.asarray(tiers.upper)[clipped]
+            )
+            return np.where(matched, np.asarray(tiers.fees)[clipped], np.nan)
+        lookup = tiers.lookup
+        return [lookup(amount) for amount in usd_amounts]
+
+    def _get_tiers(self, currency: str, network: str) -> _FeeTiers:
+        try:
+            return self._tiers[currency, network]
+        except KeyError:
+            raise KeyError(
+                f"no withdrawal fees for {currency} on {network}",
+            ) from None
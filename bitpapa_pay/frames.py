@@ -0,0 +1,408 @@
+import math
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterable,
+    ClassVar,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from bitpapa_pay._compat import get_numpy
+from bitpapa_pay.schemas.construct import construct_model
+from bitpapa_pay.schemas.invoices import Invoice
+from bitpapa_pay.schemas.transactions import Transaction
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+ModelT = TypeVar("ModelT")
+FrameT = TypeVar("FrameT", bound="_Frame")
+
+FLOAT = "float"
+CATEGORY = "category"
+OBJECT = "object"
+
+
+class Column(NamedTuple):
+    name: str
+    key: str
+    kind: str
+
+
+class _Frame(Generic[ModelT]):
+    """Records of one model stored by column.
+
+    Numbers are stored in float arrays with NaN for missing values and
+    repeated strings such as currencies and statuses as integer codes
+    into a list of categories, -1 meaning missing. Both are NumPy arrays
+    when NumPy is installed and `array.array` otherwise. Other fields are
+    kept in lists. Models are only built for the records accessed.
+    """
+
+    model: ClassVar[type]
+    columns: ClassVar[Tuple[Column, ...]]
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        categories: Dict[str, List[Optional[str]]],
+        length: int,
+    ) -> None:
+        self._data = data
+        self._categories = categories
+        self._length = length
+
+    @classmethod
+    def from_records(
+        cls: Type[FrameT],
+        records: Iterable[Dict[str, Any]],
+    ) -> FrameT:
+        """Build the frame from decoded json records, like the items of a
+        page fetched in the raw response mode."""
+        builder = _FrameBuilder(cls.columns)
+        for record in records:
+            builder.append(record)
+        return builder.build(cls)
+
+    @classmethod
+    async def from_async_records(
+        cls: Type[FrameT],
+        records: AsyncIterable[Dict[str, Any]],
+    ) -> FrameT:
+        """Build the frame while records arrive, for example from
+        `iter_invoices` or `stream_transactions` in the raw response mode.
+        """
+        builder = _FrameBuilder(cls.columns)
+        async for record in records:
+            builder.append(record)
+        return builder.build(cls)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[ModelT]:
+        for index in range(self._length):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> ModelT:
+        return construct_model(self.model, self.record(index))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._length} records)"
+
+    @property
+    def column_names(self) -> List[str]:
+        return [column.name for column in self.columns]
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """The json record at `index`, as it was decoded."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("frame index out of range")
+        record = {}
+        for column in self.columns:
+            value = self._data[column.name][index]
+            if column.kind == CATEGORY:
+                categories = self._categories[column.name]
+                value = categories[value] if value >= 0 else None
+            elif column.kind == FLOAT:
+                value = None if math.isnan(value) else float(value)
+            record[column.key] = value
+        return record
+
+    def column(self, name: str) -> Any:
+        """Values of a column: an array of floats or category codes, or a
+        list for other columns."""
+        return self._data[name]
+
+    def categories(self, name: str) -> List[Optional[str]]:
+        """Values behind the codes of a category column."""
+        return list(self._categories[name])
+
+    def values(self, name: str) -> List[Any]:
+        """Values of a column as python objects, decoding categories."""
+        column = self._column(name)
+        if column.kind == CATEGORY:
+            categories = self._categories[name]
+            return [
+                categories[code] if code >= 0 else None
+                for code in self._data[name]
+            ]
+        if column.kind == FLOAT:
+            return [
+                None if math.isnan(value) else float(value)
+                for value in self._data[name]
+            ]
+        return list(self._data[name])
+
+    def mask(self, **equals: Any) -> Any:
+        """Records whose columns equal the given values.
+
+        Returns:
+            a NumPy boolean array, or a list of booleans without NumPy
+        """
+        np = get_numpy()
+        result = None
+        for name, value in equals.items():
+            matched = self._equals(name, value)
+            if result is None:
+                result = matched
+            elif np is not None:
+                result = result & matched
+            else:
+                result = [a and b for a, b in zip(result, matched)]
+        if result is None:
+            return self._all(value=True)
+        return result
+
+    def filter(self, mask: Any = None, **equals: Any) -> "Self":
+        """Frame of the records selected by `mask` and equal to `equals`.
+
+            paid = frame.filter(status="paid", currency_code="USDT")
+        """
+        if mask is None:
+            mask = self.mask(**equals)
+        elif equals:
+            other = self.mask(**equals)
+            np = get_numpy()
+            if np is not None:
+                mask = np.asarray(mask) & other
+            else:
+                mask = [a and b for a, b in zip(mask, other)]
+        np = get_numpy()
+        if np is not None:
+            return self.take(np.flatnonzero(mask))
+        return self.take([index for index, ok in enumerate(mask) if ok])
+
+    def take(self, indices: Sequence[int]) -> "Self":
+        """Frame of the records at `indices`."""
+        np = get_numpy()
+        data = {}
+        for column in self.columns:
+            values = self._data[column.name]
+            if column.kind == OBJECT:
+                data[column.name] = [values[index] for index in indices]
+            elif np is not None:
+                data[column.name] = values[np.asarray(indices, dtype=int)]
+            else:
+                data[column.name] = array(
+                    values.typecode,
+                    (values[index] for index in indices),
+                )
+        return type(self)(data, self._categories, len(indices))
+
+    def sum(
+        self,
+        column: str = "amount",
+        by: Union[str, Sequence[str], None] = None,
+    ) -> Any:
+        """Sum of a float column, missing values counting as 0.
+
+        With `by`, a dict of sums per value of one category column, or per
+        tuple of values of several.
+        """
+        if self._column(column).kind != FLOAT:
+            raise ValueError(f"{column} is not a float column")
+        values = self._data[column]
+        np = get_numpy()
+        if by is None:
+            if np is not None:
+                return float(np.nansum(values))
+            return math.fsum(v for v in values if not math.isnan(v))
+        return self._group(by, values)
+
+    def count(self, by: Union[str, Sequence[str]]) -> Dict[Any, int]:
+        """Number of records per value of category columns."""
+        return {
+            key: int(count) for key, count in self._group(by, None).items()
+        }
+
+    def _column(self, name: str) -> Column:
+        for column in self.columns:
+            if column.name == name:
+                return column
+        raise KeyError(f"no column {name!r}")
+
+    def _all(self, value: bool) -> Any:
+        np = get_numpy()
+        if np is not None:
+            return np.full(self._length, value)
+        return [value] * self._length
+
+    def _equals(self, name: str, value: Any) -> Any:
+        column = self._column(name)
+        values = self._data[name]
+        np = get_numpy()
+        if column.kind == CATEGORY:
+            if value is None:
+                value = -1
+            elif value in self._categories[name]:
+                value = self._categories[name].index(value)
+            else:
+                return self._all(value=False)
+        elif column.kind == FLOAT and value is None:
+            if np is not None:
+                return np.isnan(values)
+            return [math.isnan(v) for v in values]
+        if column.kind != OBJECT and np is not None:
+            return values == value
+        return [v == value for v in values]
+
+    def _group(
+        self,
+        by: Union[str, Sequence[str]],
+        weights: Any,
+    ) -> Dict[Any, float]:
+        names = [by] if isinstance(by, str) else list(by)
+        for name in names:
+            if self._column(name).kind != CATEGORY:
+                raise ValueError(f"{name} is not a category column")
+        np = get_numpy()
+        if np is not None:
+            return self._group_numpy(np, names, weights, isinstance(by, str))
+
+        groups: Dict[Any, float] = {}
+        columns = [
+            (self._data[name], self._categories[name]) for name in names
+        ]
+        for index in range(self._length):
+            key = tuple(
+                categories[codes[index]] if codes[index] >= 0 else None
+                for codes, categories in columns
+            )
+            if isinstance(by, str):
+                key = key[0]
+            value = 1.0
+            if weights is not None:
+                value = weights[index]
+                value = 0.0 if math.isnan(value) else value
+            groups[key] = groups.get(key, 0.0) + value
+        return groups
+
+    def _group_numpy(
+        self,
+        np: Any,
+        names: List[str],
+        weights: Any,
+        single: bool,
+    ) -> Dict[Any, float]:
+        # every combination of codes becomes one bin, 0 meaning missing
+        combined = np.zeros(self._length, dtype=np.int64)
+        sizes = []
+        for name in names:
+            size = len(self._categories[name]) + 1
+            combined = combined * size + (self._data[name] + 1)
+            sizes.append(size)
+        if weights is not None:
+            weights = np.nan_to_num(weights)
+        sums = np.bincount(combined, weights=weights)
+        present = np.flatnonzero(np.bincount(combined))
+        groups = {}
+        for bin_index in present.tolist():
+            key = []
+            rest = bin_index
+            for name, size in zip(reversed(names), reversed(sizes)):
+                rest, code = divmod(rest, size)
+                key.append(self._categories[name][code - 1] if code else None)
+            key.reverse()
+            groups[key[0] if single else tuple(key)] = float(sums[bin_index])
+        return groups
+
+
+class _FrameBuilder:
+    def __init__(self, columns: Sequence[Column]) -> None:
+        self._columns = columns
+        self._data: Dict[str, Any] = {}
+        self._codes: Dict[str, Dict[Optional[str], int]] = {}
+        for column in columns:
+            if column.kind == FLOAT:
+                self._data[column.name] = array("d")
+            elif column.kind == CATEGORY:
+                self._data[column.name] = array("i")
+                self._codes[column.name] = {}
+            else:
+                self._data[column.name] = []
+        self._length = 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        for column in self._columns:
+            value = record.get(column.key)
+            if column.kind == FLOAT:
+                value = math.nan if value is None else float(value)
+            elif column.kind == CATEGORY:
+                if value is None:
+                    value = -1
+                else:
+                    codes = self._codes[column.name]
+                    value = codes.setdefault(value, len(codes))
+            self._data[column.name].append(value)
+        self._length += 1
+
+    def build(self, cls: Type[FrameT]) -> FrameT:
+        np = get_numpy()
+        data = self._data
+        if np is not None:
+            data = {
+                column.name: (
+                    data[column.name] if column.kind == OBJECT
+                    else np.frombuffer(
+                        data[column.name],
+                        dtype=np.float64 if column.kind == FLOAT
+                        else np.intc,
+                    )
+                )
+                for column in self._columns
+            }
+        categories = {
+            name: list(codes) for name, codes in self._codes.items()
+        }
+        return cls(data, categories, self._length)
+
+
+class InvoiceFrame(_Frame[Invoice]):
+    model = Invoice
+    columns = (
+        Column("id", "id", OBJECT),
+        Column("invoice_type", "invoice_type", CATEGORY),
+        Column("currency_code", "currency_code", CATEGORY),
+        Column("fiat_currency_code", "fiat_currency_code", CATEGORY),
+        Column("merchant_invoice_id", "merchant_invoice_id", OBJECT),
+        Column("amount", "amount", FLOAT),
+        Column("fiat_amount", "fiat_amount", FLOAT),
+        Column("status", "status", CATEGORY),
+        Column("crypto_address", "crypto_address", OBJECT),
+        Column("accepted_crypto", "accepted_crypto", OBJECT),
+        Column("paid_button_name", "paid_button_name", CATEGORY),
+        Column("paid_button_url", "paid_button_url", OBJECT),
+        Column("created_at", "created_at", OBJECT),
+        Column("updated_at", "updated_at", OBJECT),
+    )
+
+
+class TransactionFrame(_Frame[Transaction]):
+    model = Transaction
+    columns = (
+        Column("id", "id", OBJECT),
+        Column("direction", "direction", CATEGORY),
+        Column("txhash", "txhash", OBJECT),
+        Column("currency", "currency", CATEGORY),
+        Column("network", "network", CATEGORY),
+        Column("amount", "amount", FLOAT),
+        Column("from_address", "from", OBJECT),
+        Column("to_address", "to", OBJECT),
+        Column("input", "input", OBJECT),
+        Column("label", "label", OBJECT),
+    )
@@ -0,0 +1,106 @@
+import asyncio
+import time
+from collections import defaultdict
+from functools import partial
+from typing import Awaitable, Callable, Dict, Optional, Sequence, TypeVar
+
+from bitpapa_pay.instrumentation import DEFAULT_BUCKETS, LatencyHistogram
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """Sends a second copy of a slow GET and takes whichever answers first.
+
+    The copy is sent once the request has taken longer than the
+    `quantile` of the latencies the policy has seen on its route, so
+    only about the slowest `1 - quantile` of requests are doubled. Until
+    `min_samples` latencies are known `initial_delay` is used instead.
+    The loser is cancelled. `hedged` counts the copies sent and `won`
+    those that answered first.
+    """
+
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.95,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.01,
+        min_samples: int = 20,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        if not 0 < quantile < 1:
+            raise ValueError("quantile must be between 0 and 1")
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        # keyed by method route, endpoints may contain ids
+        self.histograms: Dict[str, LatencyHistogram] = defaultdict(
+            partial(LatencyHistogram, buckets),
+        )
+        self.hedged = 0
+        self.won = 0
+
+    def get_delay(self, route: str) -> float:
+        """Seconds to wait for a request before sending its copy."""
+        histogram = self.histograms.get(route)
+        if histogram is None or histogram.count < self.min_samples:
+            return self.initial_delay
+        return max(histogram.quantile(self.quantile), self.min_delay)
+
+    async def run(
+        self,
+        route: str,
+        send: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Await `send()`, racing it with `hedge()` when it is slow.
+
+        The first successful result wins; when both fail the error of the
+        first to fail is raised.
+        """
+        tasks = [asyncio.ensure_future(self._timed(route, send))]
+        try:
+            done, _ = await asyncio.wait(
+                tasks,
+                timeout=self.get_delay(route),
+            )
+            if done:
+                return tasks[0].result()
+            self.hedged += 1
+            tasks.append(asyncio.ensure_future(self._timed(route, hedge)))
+            return await self._first_success(tasks)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _first_success(self, tasks: Sequence["asyncio.Future[T]"]) -> T:
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                if task.exception() is None:
+                    if task is tasks[1]:
+                        self.won += 1
+                    return task.result()
+                if error is None:
+                    error = task.exception()
+        raise error
+
+    async def _timed(
+        self,
+        route: str,
+        send: Callable[[], Awaitable[T]],
+    ) -> T:
+        started = time.perf_counter()
+        result = await send()
+        self.histograms[route].observe(time.perf_counter() - started)
+        return result
@@ -0,0 +1,227 @@
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Sequence
+
+from aiohttp import ClientSession, TraceConfig
+
+from bitpapa_pay._compat import get_logger
+from bitpapa_pay.methods.base import time_validation_for
+
+# upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (
+    0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+    1.0, 2.0, 5.0, 10.0, 30.0,
+)
+
+PHASES = (
+    "validation",
+    "serialization",
+    "connection",
+    "first_byte",
+    "download",
+    "decode",
+    "model_build",
+)
+
+
+class RequestRecord:
+    """Timings and outcome of one client call.
+
+    `phases` holds seconds spent in each of `PHASES`. Validation is the
+    construction of the method, connection the wait for a pooled or new
+    connection, first byte the time from sending the request until the
+    response headers arrived. With the validated response mode pydantic
+    decodes and builds the model in one step, counted as model build.
+    Retried calls accumulate the phases of every attempt. A coalesced
+    call waited for an identical request of another caller and has no
+    network phases or status of its own.
+    """
+
+    __slots__ = (
+        "attempts",
+        "coalesced",
+        "endpoint",
+        "error",
+        "method",
+        "phases",
+        "route",
+        "started_at",
+        "status",
+        "total",
+    )
+
+    def __init__(
+        self,
+        method: str,
+        endpoint: str,
+        route: Optional[str] = None,
+    ) -> None:
+        self.method = method
+        self.endpoint = endpoint
+        self.route = route or endpoint
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.attempts = 0
+        self.coalesced = False
+        self.started_at = time.perf_counter()
+        self.total = 0.0
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] += seconds
+
+    def __repr__(self) -> str:
+        phases = ", ".join(
+            f"{phase}={seconds * 1000:.3f}ms"
+            for phase, seconds in self.phases.items() if seconds
+        )
+        return (
+            f"RequestRecord({self.method} {self.endpoint} "
+            f"status={self.status} total={self.total * 1000:.3f}ms "
+            f"{phases})"
+        )
+
+
+class LatencyHistogram:
+    """Latencies counted in fixed buckets."""
+
+    __slots__ = ("bounds", "count", "counts", "total")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the quantile, None if empty.
+
+        Latencies above the last bound are reported as the last bound.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+
+Hook = Callable[[RequestRecord], None]
+
+
+class Instrumentation:
+    """Collects a `RequestRecord` of every call of the clients using it.
+
+    Every route gets a latency histogram and status code counts, calls
+    of one method share them whatever ids their endpoint contains.
+    Registered hooks receive each finished record; nothing is formatted
+    unless a hook does it, and a failing hook is logged without
+    affecting the call. Methods created while an instrumentation exists
+    are timed for the validation phase. Connection and first byte
+    timings come from the aiohttp `TraceConfig` returned by
+    `trace_config`, which the client installs on the sessions it builds;
+    add it yourself to an injected session to get them there too.
+    """
+
+    def __init__(
+        self,
+        hooks: Sequence[Hook] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.hooks: List[Hook] = list(hooks)
+        self.histograms: Dict[str, LatencyHistogram] = defaultdict(
+            lambda: LatencyHistogram(buckets),
+        )
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        time_validation_for(self)
+
+    def add_hook(self, hook: Hook) -> None:
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        self.hooks.remove(hook)
+
+    def start(
+        self,
+        method: str,
+        endpoint: str,
+        route: Optional[str] = None,
+    ) -> RequestRecord:
+        return RequestRecord(method, endpoint, route)
+
+    def finish(self, record: RequestRecord) -> None:
+        record.total = time.perf_counter() - record.started_at
+        self.histograms[record.route].observe(record.total)
+        if not record.coalesced:
+            self.statuses[record.route][record.status] += 1
+        for hook in self.hooks:
+            # called from the client's finally, an error here would
+            # replace the outcome of the call
+            try:
+                hook(record)
+            except Exception as e:  # noqa: PERF203
+                get_logger().warning("instrumentation hook failed: {!r}", e)
+
+    def trace_config(self) -> TraceConfig:
+        return shared_trace_config()
+
+
+@lru_cache(maxsize=None)
+def shared_trace_config() -> TraceConfig:
+    """Trace config timing the calls of every `Instrumentation`.
+
+    It reports to the record passed as `trace_request_ctx`, so one session
+    can serve clients with different instrumentations.
+    """
+    config = TraceConfig()
+
+    async def on_request_start(
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: object,
+    ) -> None:
+        context.started_at = time.perf_counter()
+        context.connected_at = None
+
+    async def on_connection_ready(
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: object,
+    ) -> None:
+        context.connected_at = time.perf_counter()
+        record = context.trace_request_ctx
+        if isinstance(record, RequestRecord):
+            record.add("connection", context.connected_at - context.started_at)
+
+    async def on_request_end(
+        session: ClientSession,
+        context: SimpleNamespace,
+        params: object,
+    ) -> None:
+        record = context.trace_request_ctx
+        if isinstance(record, RequestRecord):
+            sent_at = context.connected_at or context.started_at
+            record.add("first_byte", time.perf_counter() - sent_at)
+
+    config.on_request_start.append(on_request_start)
+    config.on_connection_create_end.append(on_connection_ready)
+    config.on_connection_reuseconn.append(on_connection_ready)
+    config.on_request_end.append(on_request_end)
+    config.freeze()
+    return config
+
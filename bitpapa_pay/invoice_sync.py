@@ -0,0 +1,252 @@
+import asyncio
+import json
+import sqlite3
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from bitpapa_pay.concurrency import SerialExecutor
+from bitpapa_pay.enums import ResponseMode
+from bitpapa_pay.schemas import Invoice
+
+if TYPE_CHECKING:
+    from bitpapa_pay.client import BitpapaPayClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoices (
+    id TEXT PRIMARY KEY,
+    merchant_invoice_id TEXT,
+    status TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS invoices_merchant_invoice_id
+    ON invoices (merchant_invoice_id);
+CREATE INDEX IF NOT EXISTS invoices_status ON invoices (status);
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+_UPSERT = """
+INSERT INTO invoices (id, merchant_invoice_id, status, updated_at, data)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    merchant_invoice_id = excluded.merchant_invoice_id,
+    status = excluded.status,
+    updated_at = excluded.updated_at,
+    data = excluded.data
+"""
+
+# sqlite limits the number of bound parameters of a statement
+_LOOKUP_CHUNK = 500
+
+
+class StatusChange(NamedTuple):
+    invoice_id: str
+    merchant_invoice_id: Optional[str]
+    old_status: Optional[str]
+    new_status: str
+    updated_at: str
+
+
+class InvoiceSyncer:
+    """Keeps a local SQLite mirror of the invoices of a client.
+
+    A sync reads invoice pages in order and stops at the first page where
+    every invoice is already stored unchanged and none was updated after
+    the `updated_at` high-water mark of the previous sync. It assumes the
+    api lists recently changed invoices first; `sync(full=True)` reads
+    every page. Changed invoices are upserted page by page and every new
+    invoice or status transition is reported as a `StatusChange`.
+
+        async with InvoiceSyncer(client, "invoices.db") as syncer:
+            async for change in syncer.watch(interval=30):
+                ...
+    """
+
+    def __init__(
+        self,
+        client: "BitpapaPayClient",
+        path: str = ":memory:",
+    ) -> None:
+        self._client = client
+        self._path = path
+        # sqlite connections are used by the thread that created them
+        self._executor = SerialExecutor("bitpapa-invoice-sync")
+        self._connection: Optional[sqlite3.Connection] = None
+        # created on first use, in the loop the syncer runs in
+        self._lock: Optional[asyncio.Lock] = None
+        self.pages_fetched = 0
+
+    async def __aenter__(self) -> "InvoiceSyncer":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        if self._connection is None:
+            self._connection = await self._executor.run(self._connect)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._executor.run(self._connection.close)
+            self._connection = None
+        self._executor.shutdown()
+
+    async def sync(self, full: bool = False) -> List[StatusChange]:
+        """Fetch changed invoices into the store.
+
+        Returns:
+            List[StatusChange]: new invoices and status transitions
+        """
+        await self.open()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            watermark = await self._executor.run(self._get_watermark)
+            changes: List[StatusChange] = []
+            page = 1
+            while True:
+                body = await self._client.get_invoices(
+                    page=page,
+                    response_mode=ResponseMode.RAW,
+                )
+                self.pages_fetched += 1
+                invoices = body["invoices"]
+                page_changes, changed = await self._executor.run(
+                    partial(self._apply, invoices),
+                )
+                changes.extend(page_changes)
+                if page >= body["pages"] or not invoices:
+                    break
+                if not full and not changed and all(
+                    invoice["updated_at"] <= watermark
+                    for invoice in invoices
+                ):
+                    break
+                page += 1
+            return changes
+
+    async def watch(
+        self,
+        interval: float,
+    ) -> AsyncIterator[StatusChange]:
+        """Sync every `interval` seconds and yield the changes."""
+        while True:
+            for change in await self.sync():
+                yield change
+            await asyncio.sleep(interval)
+
+    async def get(self, invoice_id: str) -> Optional[Invoice]:
+        rows = await self._select("id = ?", invoice_id)
+        return rows[0] if rows else None
+
+    async def get_by_merchant_invoice_id(
+        self,
+        merchant_invoice_id: str,
+    ) -> List[Invoice]:
+        return await self._select(
+            "merchant_invoice_id = ?",
+            merchant_invoice_id,
+        )
+
+    async def get_by_status(self, status: str) -> List[Invoice]:
+        return await self._select("status = ?", status)
+
+    async def watermark(self) -> str:
+        """Latest `updated_at` stored, empty before the first sync."""
+        await self.open()
+        return await self._executor.run(self._get_watermark)
+
+    async def _select(self, where: str, value: str) -> List[Invoice]:
+        await self.open()
+        sql = f"SELECT data FROM invoices WHERE {where}"  # noqa: S608
+        rows = await self._executor.run(partial(self._query, sql, (value,)))
+        return [Invoice.model_validate_json(data) for data, in rows]
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        connection.executescript(_SCHEMA)
+        return connection
+
+    def _query(self, sql: str, params: Tuple[Any, ...]) -> List[tuple]:
+        return self._connection.execute(sql, params).fetchall()
+
+    def _get_watermark(self) -> str:
+        row = self._connection.execute(
+            "SELECT value FROM sync_state WHERE key = 'updated_at'",
+        ).fetchone()
+        return row[0] if row else ""
+
+    def _stored(self, ids: List[str]) -> Dict[str, Tuple[str, str]]:
+        stored = {}
+        for start in range(0, len(ids), _LOOKUP_CHUNK):
+            chunk = ids[start:start + _LOOKUP_CHUNK]
+            rows = self._connection.execute(
+                "SELECT id, status, updated_at FROM invoices "  # noqa: S608
+                f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for invoice_id, status, updated_at in rows:
+                stored[invoice_id] = (status, updated_at)
+        return stored
+
+    def _apply(
+        self,
+        invoices: List[Dict[str, Any]],
+    ) -> Tuple[List[StatusChange], int]:
+        stored = self._stored([invoice["id"] for invoice in invoices])
+        changes = []
+        rows = []
+        for invoice in invoices:
+            old_status, old_updated_at = stored.get(
+                invoice["id"],
+                (None, None),
+            )
+            if (
+                old_status == invoice["status"]
+                and old_updated_at == invoice["updated_at"]
+            ):
+                continue
+            rows.append(
+                (
+                    invoice["id"],
+                    invoice.get("merchant_invoice_id"),
+                    invoice["status"],
+                    invoice["updated_at"],
+                    json.dumps(invoice),
+                ),
+            )
+            if old_status != invoice["status"]:
+                changes.append(
+                    StatusChange(
+                        invoice["id"],
+                        invoice.get("merchant_invoice_id"),
+                        old_status,
+                        invoice["status"],
+                        invoice["updated_at"],
+                    ),
+                )
+        if rows:
+            with self._connection:
+                self._connection.executemany(_UPSERT, rows)
+                self._connection.execute(
+                    "INSERT INTO sync_state (key, value) "
+                    "VALUES ('updated_at', ?) "
+                    "ON CONFLICT (key) DO UPDATE SET value = excluded.value "
+                    "WHERE excluded.value > sync_state.value",
+                    (max(row[3] for row in rows),),
+                )
+        return changes, len(rows)
@@ -1,24 +1,30 @@
-from bitpapa_pay.methods.addresses import (
-    CreateAddressMethod,
-    GetAddressesMethod,
-)
-from bitpapa_pay.methods.base import BaseMethod
-from bitpapa_pay.methods.default import (
-    GetExchangeRateMetod,
-    GetWithdrawalFeesMethod,
-)
-from bitpapa_pay.methods.invoices import (
-    CreateCryptoInvoiceMethod,
-    CreateFiatInvoiceMethod,
-    GetInvoicesMethod,
-)
-from bitpapa_pay.methods.transactions import (
-    CreateTransactionMethod,
-    GetAddressTransactionMethod,
-    GetTransactionsMethod,
-    MasterRefillTransactionMethod,
-    MasterWithdrawalTransactionMethod,
-)
+from typing import TYPE_CHECKING
+
+from bitpapa_pay._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from bitpapa_pay.methods.addresses import (
+        CreateAddressMethod,
+        GetAddressesMethod,
+    )
+    from bitpapa_pay.methods.base import BaseMethod
+    from bitpapa_pay.methods.default import (
+        GetExchangeRateMetod,
+        GetWithdrawalFeesMethod,
+    )
+    from bitpapa_pay.methods.invoices import (
+        CreateCryptoInvoiceMethod,
+        CreateFiatInvoiceMethod,
+        GetInvoicesMethod,
+        InvoiceTemplate,
+    )
+    from bitpapa_pay.methods.transactions import (
+        CreateTransactionMethod,
+        GetAddressTransactionMethod,
+        GetTransactionsMethod,
+        MasterRefillTransactionMethod,
+        MasterWithdrawalTransactionMethod,
+    )
 
 __all__ = [
     "BaseMethod",
@@ -32,6 +38,27 @@ __all__ = [
     "GetInvoicesMethod",
     "GetTransactionsMethod",
     "GetWithdrawalFeesMethod",
+    "InvoiceTemplate",
     "MasterRefillTransactionMethod",
     "MasterWithdrawalTransactionMethod",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    globals(),
+    {
+        "BaseMethod": ".base",
+        "CreateAddressMethod": ".addresses",
+        "CreateCryptoInvoiceMethod": ".invoices",
+        "CreateFiatInvoiceMethod": ".invoices",
+        "CreateTransactionMethod": ".transactions",
+        "GetAddressTransactionMethod": ".transactions",
+        "GetAddressesMethod": ".addresses",
+        "GetExchangeRateMetod": ".default",
+        "GetInvoicesMethod": ".invoices",
+        "GetTransactionsMethod": ".transactions",
+        "GetWithdrawalFeesMethod": ".default",
+        "InvoiceTemplate": ".invoices",
+        "MasterRefillTransactionMethod": ".transactions",
+        "MasterWithdrawalTransactionMethod": ".transactions",
+    },
+)
@@ -1,25 +1,123 @@
-from typing import Any, Dict
+import time
+import weakref
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Dict,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
-from bitpapa_pay.enums import RequestType
+from bitpapa_pay.enums import RequestPriority, RequestType
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+MethodT = TypeVar("MethodT", bound="BaseMethod")
+
+# objects reading `validation_time`, construction is only timed while
+# one of them is alive
+_timing_sinks: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def time_validation_for(sink: Any) -> None:
+    """Time the construction of methods for as long as `sink` lives."""
+    _timing_sinks.add(sink)
 
 
 class BaseMethod(BaseModel):
-    model_config = ConfigDict(populate_by_name=True)
+    model_config = ConfigDict(populate_by_name=True, defer_build=True)
+    priority: ClassVar[RequestPriority] = RequestPriority.NORMAL
+    # endpoint with placeholders for methods whose path has parameters
+    route_template: ClassVar[Optional[str]] = None
     endpoint: str
     request_type: RequestType
+    _validation_time: float = PrivateAttr(default=0.0)
+    _payload: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+    _params: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def __init__(self, **data: Any) -> None:
+        if not _timing_sinks:
+            super().__init__(**data)
+            return
+        started = time.perf_counter()
+        super().__init__(**data)
+        self.__pydantic_private__["_validation_time"] = (
+            time.perf_counter() - started
+        )
 
+    @classmethod
+    def cached(cls: Type[MethodT], **fields: Any) -> MethodT:
+        """Shared method with these hashable fields, validated and with
+        its params built only the first time. It must not be modified."""
+        return _cached_method(cls, tuple(sorted(fields.items())))
+
+    @property
+    def route(self) -> str:
+        """The endpoint without its path parameters, the same for every
+        call of the method; use it to group statistics."""
+        return self.route_template or self.endpoint
+
+    @property
+    def validation_time(self) -> float:
+        """Seconds spent validating the method when it was created, 0.0
+        unless an `Instrumentation` existed then."""
+        return self._validation_time
+
+    def with_payload(
+        self,
+        payload: Dict[str, Any],
+        **update: Any,
+    ) -> "Self":
+        """Copy with `update` applied without validation, sending `payload`
+        instead of serializing its fields again."""
+        method = self.model_copy(update=update)
+        method.__pydantic_private__.update(
+            _payload=payload,
+            _validation_time=0.0,
+        )
+        return method
 
     def to_payload(self) -> Dict[str, Any]:
+        # private attributes are read from the dict behind them, reading
+        # them as attributes goes through the much slower __getattr__
+        payload = self.__pydantic_private__["_payload"]
+        if payload is not None:
+            return payload
         return self.model_dump(
             exclude={"endpoint", "request_type", "api_token"},
             by_alias=True,
         )
     
     def to_params(self) -> Dict[str, Any]:
+        params = self.__pydantic_private__["_params"]
+        if params is not None:
+            return params
         params = self.model_dump(
             exclude={"endpoint", "request_type", "json_data"},
             by_alias=True,
         )
         return {k: v for k, v in params.items() if v is not None}
+
+    def is_idempotent(self) -> bool:
+        return self.request_type == RequestType.GET
+
+
+@lru_cache(maxsize=1024)
+def _cached_method(
+    method_class: Type[MethodT],
+    fields: Tuple[Tuple[str, Any], ...],
+) -> MethodT:
+    method = method_class(**dict(fields))
+    # shared instances were validated once, not by each call using them
+    method.__pydantic_private__.update(
+        _params=method.to_params(),
+        _validation_time=0.0,
+    )
+    return method
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import Any, ClassVar, Dict, List, Optional
 
 from pydantic import model_validator
 
@@ -6,12 +6,19 @@ from bitpapa_pay.enums import (
     CryptoCurrencyCode,
     InvoiceType,
     PaidButtonType,
+    RequestPriority,
     RequestType,
 )
 from bitpapa_pay.methods import BaseMethod
 
+_PAID_BUTTON_NAMES = [i.value for i in PaidButtonType]
+_PAID_BUTTON_NAME_SET = frozenset(_PAID_BUTTON_NAMES)
+_CRYPTO_CURRENCY_CODES = [i.value for i in CryptoCurrencyCode]
+_CRYPTO_CURRENCY_CODE_SET = frozenset(_CRYPTO_CURRENCY_CODES)
+
 
 class CreateInvoiceMethod(BaseMethod):
+    priority: ClassVar[RequestPriority] = RequestPriority.HIGH
     endpoint: str = "/api/v1/invoices/public"
     request_type: RequestType = RequestType.POST
     invoice_type: str
@@ -22,6 +29,8 @@ class CreateInvoiceMethod(BaseMethod):
     private_message: Optional[str] = None
     crypto_address: Optional[str] = None
 
+    amount_field: ClassVar[str] = "amount"
+
     __max_length_private_message = 1000
 
     @model_validator(mode="after")
@@ -45,12 +54,12 @@ class CreateInvoiceMethod(BaseMethod):
 
     @model_validator(mode="after")
     def _validate_paid_button_name(self) -> "CreateInvoiceMethod":
-        if self.paid_button_name is not None and self.paid_button_name not in [
-            i.value for i in PaidButtonType
-        ]:
+        if (
+            self.paid_button_name is not None
+            and self.paid_button_name not in _PAID_BUTTON_NAME_SET
+        ):
             raise ValueError(
-                "paid_button_name must be one of "
-                f"{[i.value for i in PaidButtonType]}"
+                f"paid_button_name must be one of {_PAID_BUTTON_NAMES}",
             )
         return self
 
@@ -73,6 +82,21 @@ class CreateInvoiceMethod(BaseMethod):
             )
         return self
 
+    def to_payload(self) -> Dict[str, Any]:
+        payload = self.__pydantic_private__["_payload"]
+        if payload is not None:
+            return payload
+        return {
+            "invoice": self.model_dump(
+                exclude={"endpoint", "request_type", "api_token"},
+                by_alias=True,
+            ),
+        }
+
+    def is_idempotent(self) -> bool:
+        # the merchant invoice id lets the api recognize a repeated invoice
+        return self.merchant_invoice_id is not None
+
 
 class CreateCryptoInvoiceMethod(CreateInvoiceMethod):
     amount: float
@@ -81,21 +105,12 @@ class CreateCryptoInvoiceMethod(CreateInvoiceMethod):
 
     @model_validator(mode="after")
     def _validate_currency_code(self) -> "CreateCryptoInvoiceMethod":
-        if self.currency_code not in [i.value for i in CryptoCurrencyCode]:
+        if self.currency_code not in _CRYPTO_CURRENCY_CODE_SET:
             raise ValueError(
-                "currency_code must be one of "
-                f"{[i.value for i in CryptoCurrencyCode]}"
+                f"currency_code must be one of {_CRYPTO_CURRENCY_CODES}",
             )
         return self
 
-    def to_payload(self) -> Dict[str, Any]:
-        return {
-            "invoice": self.model_dump(
-                exclude={"endpoint", "request_type", "api_token"},
-                by_alias=True,
-            ),
-        }
-
 
 class CreateFiatInvoiceMethod(CreateInvoiceMethod):
     accepted_crypto: List[str]
@@ -103,16 +118,72 @@ class CreateFiatInvoiceMethod(CreateInvoiceMethod):
     fiat_currency_code: str
     invoice_type: str = InvoiceType.FIAT.value
 
-    def to_payload(self) -> Dict[str, Any]:
-        return {
-            "invoice": self.model_dump(
-                exclude={"endpoint", "request_type", "api_token"},
-                by_alias=True,
-            ),
-        }
+    amount_field: ClassVar[str] = "fiat_amount"
 
 
 class GetInvoicesMethod(BaseMethod):
     endpoint: str = "/api/v1/invoices/public"
     request_type: RequestType = RequestType.GET
     page: int = 1
+
+
+class InvoiceTemplate:
+    """Invoice fields validated and serialized once for many invoices.
+
+    Everything except the amount and the merchant invoice id is fixed by
+    the template; `build` fills those two into a copy of the serialized
+    invoice without validating the rest again.
+
+        template = InvoiceTemplate.crypto("USDT", expiration_time=30)
+        method = template.build(10, merchant_invoice_id="order-42")
+    """
+
+    def __init__(self, method: CreateInvoiceMethod) -> None:
+        self.method = method
+        self._invoice = method.to_payload()["invoice"]
+
+    @classmethod
+    def crypto(cls, currency_code: str, **fields: Any) -> "InvoiceTemplate":
+        """Template of crypto invoices, `fields` as in
+        `create_crypto_invoice`."""
+        return cls(
+            CreateCryptoInvoiceMethod(
+                amount=0,
+                currency_code=currency_code,
+                **fields,
+            ),
+        )
+
+    @classmethod
+    def fiat(
+        cls,
+        accepted_crypto: List[str],
+        fiat_currency_code: str,
+        **fields: Any,
+    ) -> "InvoiceTemplate":
+        """Template of fiat invoices, `fields` as in `create_fiat_invoice`."""
+        return cls(
+            CreateFiatInvoiceMethod(
+                accepted_crypto=accepted_crypto,
+                fiat_amount=0,
+                fiat_currency_code=fiat_currency_code,
+                **fields,
+            ),
+        )
+
+    def build(
+        self,
+        amount: float,
+        merchant_invoice_id: Optional[str] = None,
+    ) -> CreateInvoiceMethod:
+        amount = float(amount)
+        if merchant_invoice_id is not None:
+            merchant_invoice_id = str(merchant_invoice_id)
+        fields = {
+            self.method.amount_field: amount,
+            "merchant_invoice_id": merchant_invoice_id,
+        }
+        return self.method.with_payload(
+            {"invoice": {**self._invoice, **fields}},
+            **fields,
+        )
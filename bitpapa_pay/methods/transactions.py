@@ -1,10 +1,13 @@
+from typing import ClassVar
+
 from pydantic import Field
 
-from bitpapa_pay.enums import RequestType
+from bitpapa_pay.enums import RequestPriority, RequestType
 from bitpapa_pay.methods.base import BaseMethod
 
 
 class GetTransactionsMethod(BaseMethod):
+    priority: ClassVar[RequestPriority] = RequestPriority.LOW
     endpoint: str = "/a3s/v1/transactions"
     request_type: RequestType = RequestType.GET
     page: int = 1
@@ -12,6 +15,8 @@ class GetTransactionsMethod(BaseMethod):
 
 
 class GetAddressTransactionMethod(BaseMethod):
+    priority: ClassVar[RequestPriority] = RequestPriority.LOW
+    route_template: ClassVar[str] = "/a3s/v1/address/{uuid}/transactions"
     endpoint: str = ""
     request_type: RequestType = RequestType.GET
     uuid: str
@@ -19,7 +24,7 @@ class GetAddressTransactionMethod(BaseMethod):
     limit: int = 100
 
     def model_post_init(self, __context):
-        self.endpoint = f"/a3s/v1/address/{self.uuid}/transactions"
+        self.endpoint = self.route_template.format(uuid=self.uuid)
 
 
 class CreateTransactionMethod(BaseMethod):
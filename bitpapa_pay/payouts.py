@@ -0,0 +1,382 @@
+import asyncio
+import hashlib
+import json
+import os
+from collections import deque
+from contextlib import suppress
+from functools import partial
+from pathlib import Path
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from bitpapa_pay.bulk import build_methods
+from bitpapa_pay.concurrency import SerialExecutor
+from bitpapa_pay.enums import ResponseMode
+from bitpapa_pay.exceptions import BadRequestError, InvalidPayoutSpecError
+from bitpapa_pay.methods import (
+    CreateTransactionMethod,
+    MasterRefillTransactionMethod,
+    MasterWithdrawalTransactionMethod,
+)
+from bitpapa_pay.schemas import TransactionResponse
+
+if TYPE_CHECKING:
+    from bitpapa_pay.client import AdressesApiClient
+
+PayoutMethod = Union[
+    CreateTransactionMethod,
+    MasterWithdrawalTransactionMethod,
+    MasterRefillTransactionMethod,
+]
+PayoutSpec = Union[PayoutMethod, Mapping[str, Any]]
+
+DONE = "done"
+FAILED = "failed"
+UNKNOWN = "unknown"
+_STARTED = "started"
+
+# master withdrawals all leave the master account
+MASTER = "master"
+
+# only a client error proves the payout was not executed
+_REJECTED_STATUSES = range(400, 500)
+
+
+class PayoutResult(NamedTuple):
+    """Outcome of one payout.
+
+    `state` is `done` with the `response`, `failed` when the api rejected
+    the payout or it could not be journaled before sending, or `unknown`
+    when it may or may not have been executed: the request timed out, the
+    connection broke, the server failed, or a previous run crashed after
+    sending it. `resumed` marks results read from the journal instead of
+    sent by this run.
+    """
+
+    index: int
+    key: str
+    method: PayoutMethod
+    state: str
+    response: Optional[TransactionResponse] = None
+    error: Optional[Exception] = None
+    resumed: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.state == DONE
+
+
+def build_payout_method(spec: PayoutSpec) -> PayoutMethod:
+    """Validated payout method from a method or its keyword arguments.
+
+    A mapping with both `from_address` and `to_address` (or `from` and
+    `to`) is a transfer, one with only `to_address` a master withdrawal
+    and one with only `from_address` a master refill.
+    """
+    if isinstance(
+        spec,
+        (
+            CreateTransactionMethod,
+            MasterWithdrawalTransactionMethod,
+            MasterRefillTransactionMethod,
+        ),
+    ):
+        return spec
+    has_from = "from_address" in spec or "from" in spec
+    has_to = "to_address" in spec or "to" in spec
+    if has_from and has_to:
+        return CreateTransactionMethod(**spec)
+    if has_from:
+        return MasterRefillTransactionMethod(**spec)
+    return MasterWithdrawalTransactionMethod(**spec)
+
+
+def build_payout_methods(specs: Iterable[PayoutSpec]) -> List[PayoutMethod]:
+    """Validate every spec, reporting all invalid ones at once.
+
+    Raises:
+        InvalidPayoutSpecError: some specs did not pass validation
+    """
+    return build_methods(build_payout_method, specs, InvalidPayoutSpecError)
+
+
+def payout_source(method: PayoutMethod) -> str:
+    """Address the payout is sent from, `MASTER` for master withdrawals."""
+    if isinstance(method, MasterWithdrawalTransactionMethod):
+        return MASTER
+    return method.from_address
+
+
+def payout_key(index: int, method: PayoutMethod) -> str:
+    """Journal key of the payout at `index` of a batch.
+
+    The same batch in the same order gets the same keys, which is what
+    lets a rerun find the payouts already sent.
+    """
+    data = json.dumps([method.endpoint, method.to_payload()], sort_keys=True)
+    return f"{index}-{hashlib.sha256(data.encode()).hexdigest()[:16]}"
+
+
+class PayoutScheduler:
+    """Sends batches of transfers, master withdrawals and refills.
+
+    Payouts from the same source address are sent one after another in
+    batch order, since concurrent sends from one address are unsafe;
+    different sources are sent in parallel, at most `concurrency`
+    requests at a time. Sources with the longest queues start first, so
+    the batch takes about as long as its busiest source.
+
+    With `journal_path` every payout is appended to a json lines journal
+    before it is sent and again once its outcome is known. Running the
+    same batch again after a crash sends only the payouts missing from the
+    journal; those started but never finished come back as `unknown`
+    rather than being sent twice.
+
+        async with PayoutScheduler(client, journal_path="payouts.jsonl") as p:
+            results = await p.run(specs)
+    """
+
+    def __init__(
+        self,
+        client: "AdressesApiClient",
+        *,
+        concurrency: int = 10,
+        journal_path: Union[str, Path, None] = None,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be greater than 0")
+        self._client = client
+        self.concurrency = concurrency
+        self.journal_path = (
+            None if journal_path is None else Path(journal_path)
+        )
+        self._executor = SerialExecutor("bitpapa-payouts")
+        self._journal: Optional[IO[str]] = None
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flushing: Optional[asyncio.Future] = None
+
+    async def __aenter__(self) -> "PayoutScheduler":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._flushing is not None:
+            await asyncio.gather(self._flushing, return_exceptions=True)
+        if self._journal is not None:
+            await self._executor.run(self._journal.close)
+            self._journal = None
+        self._executor.shutdown()
+
+    async def run(
+        self,
+        specs: Iterable[PayoutSpec],
+        keys: Optional[Sequence[str]] = None,
+    ) -> List[PayoutResult]:
+        """Send a batch of payouts.
+
+        Args:
+            specs: payout methods or the keyword arguments of
+                `create_transaction`, `master_withdrawal_transaction` or
+                `master_refill_transaction`
+            keys: journal keys of the specs, unique across batches sharing
+                a journal; by default `payout_key` of each spec
+
+        Raises:
+            InvalidPayoutSpecError: some specs did not pass validation
+
+        Returns:
+            List[PayoutResult]: results in the order of `specs`
+        """
+        methods = build_payout_methods(specs)
+        if keys is None:
+            keys = [payout_key(i, method) for i, method in enumerate(methods)]
+        elif len(keys) != len(methods) or len(set(keys)) != len(keys):
+            raise ValueError("keys must be unique, one for every spec")
+
+        journaled = await self._executor.run(self._load)
+        results: List[Optional[PayoutResult]] = [None] * len(methods)
+        queues: Dict[str, Deque[int]] = {}
+        for index, method in enumerate(methods):
+            entry = journaled.get(keys[index])
+            if entry is not None:
+                results[index] = _resumed(index, keys[index], method, entry)
+            else:
+                queues.setdefault(payout_source(method), deque()).append(
+                    index,
+                )
+
+        sources = deque(sorted(queues.values(), key=len, reverse=True))
+
+        async def work() -> None:
+            while sources:
+                queue = sources.popleft()
+                for index in queue:
+                    results[index] = await self._send(
+                        index,
+                        keys[index],
+                        methods[index],
+                    )
+
+        workers = [
+            asyncio.ensure_future(work())
+            for _ in range(min(self.concurrency, len(sources)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            # failed payouts are results, only cancelling the batch stops it
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+        return results
+
+    async def _send(
+        self,
+        index: int,
+        key: str,
+        method: PayoutMethod,
+    ) -> PayoutResult:
+        try:
+            await self._write({"key": key, "state": _STARTED})
+        except Exception as e:
+            # nothing was sent
+            return PayoutResult(index, key, method, FAILED, error=e)
+        try:
+            response = await self._client.send_transaction(
+                method,
+                response_mode=ResponseMode.VALIDATED,
+            )
+        except BadRequestError as e:
+            state = FAILED if e.status in _REJECTED_STATUSES else UNKNOWN
+            error: Exception = e
+        except Exception as e:
+            # a timeout or an unreadable response, the payout was sent
+            state, error = UNKNOWN, e
+        else:
+            await self._finish(
+                {
+                    "key": key,
+                    "state": DONE,
+                    "response": response.model_dump(
+                        mode="json",
+                        by_alias=True,
+                    ),
+                },
+            )
+            return PayoutResult(index, key, method, DONE, response=response)
+        await self._finish(
+            {
+                "key": key,
+                "state": state,
+                "error": str(error),
+                "status": getattr(error, "status", None),
+            },
+        )
+        return PayoutResult(index, key, method, state, error=error)
+
+    async def _finish(self, entry: Dict[str, Any]) -> None:
+        # the outcome is known even when it cannot be journaled, a rerun
+        # then finds the payout started and reports it as unknown
+        with suppress(Exception):
+            await self._write(entry)
+
+    async def _write(self, entry: Dict[str, Any]) -> None:
+        # entries written while a write is in progress are batched into
+        # the next one, so concurrent payouts share their fsyncs
+        if self.journal_path is None:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((json.dumps(entry), future))
+        if self._flushing is None or self._flushing.done():
+            self._flushing = asyncio.ensure_future(self._flush())
+        await future
+
+    async def _flush(self) -> None:
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                await self._executor.run(
+                    partial(self._append, [line for line, _ in batch]),
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_result(None)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.journal_path is None or not self.journal_path.exists():
+            return {}
+        entries = {}
+        with self.journal_path.open() as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # a line cut short by a crash
+                    continue
+                entries[entry["key"]] = entry
+        return entries
+
+    def _append(self, lines: List[str]) -> None:
+        if self._journal is None:
+            cut_short = False
+            if self.journal_path.exists():
+                with self.journal_path.open("rb") as file:
+                    file.seek(0, os.SEEK_END)
+                    if file.tell():
+                        file.seek(-1, os.SEEK_END)
+                        cut_short = file.read() != b"\n"
+            self._journal = self.journal_path.open("a")
+            if cut_short:
+                self._journal.write("\n")
+        self._journal.write("".join(f"{line}\n" for line in lines))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+
+def _resumed(
+    index: int,
+    key: str,
+    method: PayoutMethod,
+    entry: Dict[str, Any],
+) -> PayoutResult:
+    state = entry["state"]
+    if state == DONE:
+        return PayoutResult(
+            index,
+            key,
+            method,
+            DONE,
+            response=TransactionResponse.model_validate(entry["response"]),
+            resumed=True,
+        )
+    if state == _STARTED:
+        return PayoutResult(index, key, method, UNKNOWN, resumed=True)
+    return PayoutResult(
+        index,
+        key,
+        method,
+        state,
+        error=BadRequestError(entry["error"], status=entry["status"]),
+        resumed=True,
+    )
@@ -0,0 +1,147 @@
+import sys
+from typing import Any, Dict, Iterator, Optional, Type
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from bitpapa_pay.client import BitpapaPay
+from bitpapa_pay.instrumentation import Instrumentation, shared_trace_config
+from bitpapa_pay.scheduler import RequestScheduler
+
+
+class BitpapaPayPool:
+    """Clients of many api tokens sharing one session and connection pool.
+
+    `for_token` returns the client of a token, created on first use and
+    cached; clients only hold their token, caches and metrics, so
+    hundreds of them cost no sockets of their own. Each client gets its
+    own `Instrumentation`, unless one shared by all is given, and retry
+    stats. With `rate` every token is rate limited separately by one
+    shared `RequestScheduler`, which also keeps the requests in flight
+    within `limit`.
+
+        async with BitpapaPayPool(rate=5) as pool:
+            invoices = await pool.for_token(token).get_invoices()
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        keepalive_timeout: float = 15.0,
+        ttl_dns_cache: Optional[int] = 10,
+        timeout: Optional[ClientTimeout] = None,
+        rate: Optional[float] = None,
+        burst: float = 10,
+        scheduler: Optional[RequestScheduler] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        client_class: Type[BitpapaPay] = BitpapaPay,
+        **client_options: Any,
+    ) -> None:
+        """
+        Args:
+            base_url: api address, `BitpapaPay.BASE_URL` by default
+            limit: connections shared by all tokens, 0 for no limit
+            limit_per_host: connections per host
+            keepalive_timeout: seconds an idle connection is kept alive
+            ttl_dns_cache: seconds resolved hosts are cached
+            timeout: timeouts of the shared session
+            rate: requests per second allowed for each token
+            burst: requests a token may send at once
+            scheduler: shared scheduler used instead of one built from
+                `rate` and `burst`
+            instrumentation: collects the metrics of every token instead
+                of an instrumentation per token
+            client_class: class of the clients
+            client_options: passed to every client, for example
+                `retry_policy` or `response_mode`; the session and
+                connector belong to the pool
+
+        Raises:
+            ValueError: `client_options` has a session or a connector
+        """
+        for name in ("session", "connector"):
+            if name in client_options:
+                raise ValueError(f"the pool provides the {name}")
+        if scheduler is None and rate is not None:
+            scheduler = RequestScheduler(
+                rate=rate,
+                burst=burst,
+                max_in_flight=limit or sys.maxsize,
+            )
+        self.scheduler = scheduler
+        self._base_url = base_url
+        self._connector_options = {
+            "limit": limit,
+            "limit_per_host": limit_per_host,
+            "keepalive_timeout": keepalive_timeout,
+            "ttl_dns_cache": ttl_dns_cache,
+        }
+        self._timeout = timeout
+        self._instrumentation = instrumentation
+        self._client_class = client_class
+        self._client_options = client_options
+        self._session: Optional[ClientSession] = None
+        self._clients: Dict[str, BitpapaPay] = {}
+
+    async def __aenter__(self) -> "BitpapaPayPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._clients))
+
+    def get_session(self) -> ClientSession:
+        if self._session is None or self._session.closed:
+            options = {}
+            if self._timeout is not None:
+                options["timeout"] = self._timeout
+            self._session = ClientSession(
+                connector=TCPConnector(**self._connector_options),
+                trace_configs=[shared_trace_config()],
+                **options,
+            )
+        return self._session
+
+    def for_token(self, api_token: str) -> BitpapaPay:
+        client = self._clients.get(api_token)
+        if client is None:
+            instrumentation = self._instrumentation
+            if instrumentation is None:
+                instrumentation = Instrumentation()
+            client = self._client_class(
+                api_token,
+                base_url=self._base_url,
+                session=self.get_session(),
+                scheduler=self.scheduler,
+                instrumentation=instrumentation,
+                **self._client_options,
+            )
+            self._clients[api_token] = client
+        return client
+
+    def instrumentation(self, api_token: str) -> Optional[Instrumentation]:
+        """Metrics of a token, None if it has not been used."""
+        client = self._clients.get(api_token)
+        return None if client is None else client.instrumentation
+
+    async def remove(self, api_token: str) -> None:
+        """Close and forget the client of a token."""
+        client = self._clients.pop(api_token, None)
+        if client is not None:
+            await client.close()
+
+    async def close(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.close()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
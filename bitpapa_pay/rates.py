@@ -0,0 +1,209 @@
+import math
+from collections import Counter
+from typing import (
+    Any,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from bitpapa_pay._compat import get_numpy
+from bitpapa_pay.schemas import GetExchangeRatesResponse
+
+
+class RateMatrix:
+    """Exchange rates parsed once into a dense currency by currency matrix.
+
+    `matrix[i][j]` is the price of one unit of currency `i` in currency
+    `j`. Quoted pairs fill both directions; the remaining pairs are
+    derived through the `pivot` currency, by default the currency quoted
+    against the most others, and then through any other currency. Pairs
+    without a path are NaN. The matrix is a NumPy array when NumPy is
+    installed and a list of lists otherwise.
+    """
+
+    def __init__(
+        self,
+        currencies: Sequence[str],
+        matrix: Any,
+        pivot: Optional[str] = None,
+    ) -> None:
+        self.currencies = list(currencies)
+        self.index = {
+            currency: index for index, currency in enumerate(currencies)
+        }
+        self.matrix = matrix
+        self.pivot = pivot
+
+    @classmethod
+    def from_response(
+        cls,
+        response: Union[GetExchangeRatesResponse, Mapping[str, Any]],
+        pivot: Optional[str] = None,
+    ) -> "RateMatrix":
+        """Build from an exchange rates response in any response mode."""
+        if isinstance(response, Mapping):
+            return cls.from_rates(response["rates"], pivot)
+        return cls.from_rates(response.rates, pivot)
+
+    @classmethod
+    def from_rates(
+        cls,
+        rates: Mapping[str, float],
+        pivot: Optional[str] = None,
+    ) -> "RateMatrix":
+        """Build from rates keyed by pairs like `BTC_USD`."""
+        quotes = _parse_pairs(rates)
+        quoted: Counter = Counter()
+        for base, quote, _ in quotes:
+            quoted[base] += 1
+            quoted[quote] += 1
+        currencies = sorted(quoted)
+        if pivot is None and quoted:
+            pivot = quoted.most_common(1)[0][0]
+
+        index = {currency: i for i, currency in enumerate(currencies)}
+        size = len(currencies)
+        matrix = [[math.nan] * size for _ in range(size)]
+        for i in range(size):
+            matrix[i][i] = 1.0
+        for base, quote, rate in quotes:
+            matrix[index[base]][index[quote]] = rate
+            if math.isnan(matrix[index[quote]][index[base]]):
+                matrix[index[quote]][index[base]] = 1 / rate
+
+        order = list(range(size))
+        if pivot in index:
+            order.remove(index[pivot])
+            order.insert(0, index[pivot])
+        for via in order:
+            _derive_through(matrix, via)
+
+        np = get_numpy()
+        if np is not None:
+            matrix = np.array(matrix, dtype=np.float64)
+        return cls(currencies, matrix, pivot)
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self.index
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        """Price of one `from_currency` in `to_currency`, NaN without a
+        path between them.
+
+        Raises:
+            KeyError: a currency has no rates
+        """
+        return float(
+            self.matrix[self._index_of(from_currency)][
+                self._index_of(to_currency)
+            ],
+        )
+
+    def convert(
+        self,
+        amounts: Any,
+        from_currency: str,
+        to_currency: str,
+    ) -> Any:
+        """Convert an amount, or many amounts of one currency at once.
+
+        A NumPy array is converted in one multiplication; other sequences
+        give a list.
+        """
+        rate = self.rate(from_currency, to_currency)
+        if isinstance(amounts, (int, float)):
+            return amounts * rate
+        np = get_numpy()
+        if np is not None and isinstance(amounts, np.ndarray):
+            return amounts * rate
+        return [amount * rate for amount in amounts]
+
+    def convert_many(
+        self,
+        amounts: Sequence[float],
+        from_currencies: Sequence[str],
+        to_currencies: Union[str, Sequence[str]],
+    ) -> Any:
+        """Convert rows with their own source, and optionally target,
+        currencies.
+
+        With NumPy the currencies are mapped to matrix indices once per
+        distinct currency and the rates are gathered in one call;
+        the result is an array. Without NumPy it is a list.
+
+        Raises:
+            KeyError: a currency has no rates
+        """
+        np = get_numpy()
+        if np is None:
+            if isinstance(to_currencies, str):
+                to_currencies = [to_currencies] * len(amounts)
+            return [
+                amount * self.rate(source, target)
+                for amount, source, target in zip(
+                    amounts,
+                    from_currencies,
+                    to_currencies,
+                )
+            ]
+        rows = self._indices_of(np, from_currencies)
+        if isinstance(to_currencies, str):
+            columns = self._index_of(to_currencies)
+        else:
+            columns = self._indices_of(np, to_currencies)
+        return np.asarray(amounts, dtype=np.float64) * self.matrix[
+            rows,
+            columns,
+        ]
+
+    def to_dict(self) -> Dict[str, float]:
+        """Every known pair, including derived ones, keyed like `BTC_USD`."""
+        pairs = {}
+        for i, base in enumerate(self.currencies):
+            for j, quote in enumerate(self.currencies):
+                rate = float(self.matrix[i][j])
+                if i != j and not math.isnan(rate):
+                    pairs[f"{base}_{quote}"] = rate
+        return pairs
+
+    def _index_of(self, currency: str) -> int:
+        try:
+            return self.index[currency]
+        except KeyError:
+            raise KeyError(f"no exchange rates for {currency}") from None
+
+    def _indices_of(self, np: Any, currencies: Sequence[str]) -> Any:
+        unique, inverse = np.unique(
+            np.asarray(currencies, dtype=object).astype(str),
+            return_inverse=True,
+        )
+        lookup = np.array(
+            [self._index_of(currency) for currency in unique.tolist()],
+            dtype=np.intp,
+        )
+        return lookup[inverse.reshape(-1)]
+
+
+def _parse_pairs(rates: Mapping[str, float]) -> List[Tuple[str, str, float]]:
+    quotes = []
+    for pair, rate in rates.items():
+        base, _, quote = pair.partition("_")
+        if quote and rate:
+            quotes.append((base, quote, float(rate)))
+    return quotes
+
+
+def _derive_through(matrix: List[List[float]], via: int) -> None:
+    to_via = [row[via] for row in matrix]
+    from_via = matrix[via]
+    for i, row in enumerate(matrix):
+        if math.isnan(to_via[i]):
+            continue
+        for j, rate in enumerate(row):
+            if math.isnan(rate) and not math.isnan(from_via[j]):
+                row[j] = to_via[i] * from_via[j]
@@ -0,0 +1,266 @@
+import asyncio
+import time
+from collections import defaultdict
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from bitpapa_pay._compat import get_logger
+from bitpapa_pay.cache import SingleFlight
+from bitpapa_pay.enums import ResponseMode
+from bitpapa_pay.schemas import (
+    CreateAddressResponse,
+    TransactionResponse,
+)
+from bitpapa_pay.schemas.addresses import Address
+
+if TYPE_CHECKING:
+    from bitpapa_pay.client import AdressesApiClient
+
+
+class AddressRegistry:
+    """Addresses of the account loaded once and indexed in memory.
+
+    Addresses are looked up by id, address, label or currency and network
+    without a request. Addresses created through the registry are added
+    to it and addresses spending or receiving funds through it get stale
+    balances until the next refresh. With `refresh_interval` the registry
+    reloads every address in the background, and soon after a balance
+    became stale.
+
+        async with AddressRegistry(client, refresh_interval=60) as registry:
+            address = registry.get_by_label("deposit-42")
+    """
+
+    def __init__(
+        self,
+        client: "AdressesApiClient",
+        *,
+        refresh_interval: Optional[float] = None,
+        stale_refresh_delay: float = 1.0,
+    ) -> None:
+        self._client = client
+        self.refresh_interval = refresh_interval
+        self.stale_refresh_delay = stale_refresh_delay
+        self._by_id: Dict[str, Address] = {}
+        self._by_address: Dict[str, Address] = {}
+        self._by_label: Dict[str, List[Address]] = defaultdict(list)
+        self._by_network: Dict[
+            Tuple[Optional[str], Optional[str]],
+            List[Address],
+        ] = defaultdict(list)
+        # address id -> monotonic time its balance became stale
+        self._stale: Dict[str, float] = {}
+        self._loaded = False
+        self._refreshes = SingleFlight()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AddressRegistry":
+        await self.load()
+        if self.refresh_interval is not None:
+            self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def load(self) -> None:
+        """Load the addresses unless they are loaded already."""
+        if not self._loaded:
+            await self.refresh()
+
+    async def refresh(self) -> None:
+        """Reload every address, concurrent refreshes share one request."""
+        await self._refreshes.do(None, self._refresh)
+
+    def start(self) -> None:
+        """Refresh in the background every `refresh_interval` seconds."""
+        if self.refresh_interval is None:
+            raise ValueError("refresh_interval is not set")
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._refresh_forever())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get(self, address_id: str) -> Optional[Address]:
+        return self._by_id.get(str(address_id))
+
+    def get_by_address(self, address: str) -> Optional[Address]:
+        return self._by_address.get(address)
+
+    def get_by_label(self, label: str) -> List[Address]:
+        return list(self._by_label.get(label, ()))
+
+    def get_by_network(
+        self,
+        currency: str,
+        network: str,
+    ) -> List[Address]:
+        return list(self._by_network.get((currency, network), ()))
+
+    def is_stale(self, address_id: str) -> bool:
+        """Whether the balance may have changed since it was loaded."""
+        return str(address_id) in self._stale
+
+    def mark_stale(self, addresses: Iterable[Optional[str]]) -> None:
+        """Mark the balances of known addresses, given as strings, stale."""
+        marked = False
+        now = time.monotonic()
+        for value in addresses:
+            address = self._by_address.get(value) if value else None
+            if address is not None:
+                self._stale[str(address.id)] = now
+                marked = True
+        if marked and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def create_address(
+        self,
+        currency: str,
+        network: str,
+        label: str = "",
+    ) -> Address:
+        response: CreateAddressResponse = await self._client.create_address(
+            currency=currency,
+            network=network,
+            label=label,
+            response_mode=ResponseMode.VALIDATED,
+        )
+        self._add(response.address)
+        return response.address
+
+    async def create_transaction(
+        self,
+        currency: str,
+        amount: float,
+        from_address: str,
+        to_address: str,
+        *,
+        network: str,
+        label: str = "",
+    ) -> TransactionResponse:
+        try:
+            return await self._client.create_transaction(
+                currency=currency,
+                amount=amount,
+                from_address=from_address,
+                to_address=to_address,
+                network=network,
+                label=label,
+            )
+        finally:
+            self.mark_stale((from_address, to_address))
+
+    async def master_withdrawal_transaction(
+        self,
+        currency: str,
+        amount: float,
+        to_address: str,
+        network: str,
+        label: str = "",
+    ) -> TransactionResponse:
+        try:
+            return await self._client.master_withdrawal_transaction(
+                currency=currency,
+                amount=amount,
+                to_address=to_address,
+                network=network,
+                label=label,
+            )
+        finally:
+            self.mark_stale((to_address,))
+
+    async def master_refill_transaction(
+        self,
+        currency: str,
+        amount: float,
+        from_address: str,
+        network: str,
+        label: str = "",
+    ) -> TransactionResponse:
+        try:
+            return await self._client.master_refill_transaction(
+                currency=currency,
+                amount=amount,
+                from_address=from_address,
+                network=network,
+                label=label,
+            )
+        finally:
+            self.mark_stale((from_address,))
+
+    async def _refresh(self) -> None:
+        started = time.monotonic()
+        # the indexes need models with parsed ids whatever the client's
+        # default response mode
+        response = await self._client.get_addresses(
+            response_mode=ResponseMode.VALIDATED,
+        )
+        self._by_id.clear()
+        self._by_address.clear()
+        self._by_label.clear()
+        self._by_network.clear()
+        for address in response.addresses:
+            self._add(address)
+        # balances marked during the request may not be reflected yet
+        self._stale = {
+            address_id: marked_at
+            for address_id, marked_at in self._stale.items()
+            if marked_at > started
+        }
+        self._loaded = True
+
+    def _add(self, address: Address) -> None:
+        previous = self._by_id.get(str(address.id))
+        if previous is not None:
+            self._remove(previous)
+        self._by_id[str(address.id)] = address
+        if address.address:
+            self._by_address[address.address] = address
+        self._by_label[address.label].append(address)
+        self._by_network[address.currency, address.network].append(address)
+
+    def _remove(self, address: Address) -> None:
+        if address.address:
+            self._by_address.pop(address.address, None)
+        self._by_label[address.label].remove(address)
+        self._by_network[address.currency, address.network].remove(address)
+
+    async def _refresh_forever(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    self.refresh_interval,
+                )
+            except asyncio.TimeoutError:
+                pass
+            else:
+                # let a burst of transactions settle before reloading
+                await asyncio.sleep(self.stale_refresh_delay)
+            self._wakeup.clear()
+            try:
+                await self.refresh()
+            except Exception as e:
+                get_logger().warning("address refresh failed: {!r}", e)
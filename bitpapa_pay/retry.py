@@ -0,0 +1,135 @@
+import asyncio
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Collection, Optional
+
+from aiohttp import (
+    ClientConnectionError,
+    ClientPayloadError,
+    ClientResponseError,
+)
+
+from bitpapa_pay.methods import BaseMethod
+
+DEFAULT_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_AFTER_STATUSES = frozenset({429, 503})
+
+
+class RetryStats:
+    """Counters of the retry engine of one client."""
+
+    __slots__ = ("calls", "failures", "retries")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"RetryStats(calls={self.calls}, retries={self.retries}, "
+            f"failures={self.failures})"
+        )
+
+
+class RetryPolicy:
+    """Decides whether and when a failed request is sent again.
+
+    Only idempotent methods are retried: every GET, and invoice POSTs
+    carrying a `merchant_invoice_id`. Delays grow exponentially with full
+    jitter and a `Retry-After` header of a 429 or 503 response takes
+    precedence. `total_timeout` caps the whole call, attempts and delays
+    included: an attempt is cut short when it runs out and no retry is
+    scheduled past it. Subclass and override `is_retryable` to change
+    what is retried.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int = 3,
+        backoff_base: float = 0.2,
+        backoff_max: float = 5.0,
+        total_timeout: Optional[float] = 30.0,
+        retry_statuses: Collection[int] = DEFAULT_RETRY_STATUSES,
+        respect_retry_after: bool = True,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be greater than 0")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.total_timeout = total_timeout
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+
+    def is_retryable(self, method: BaseMethod, error: BaseException) -> bool:
+        if not method.is_idempotent():
+            return False
+        if isinstance(error, ClientResponseError):
+            return error.status in self.retry_statuses
+        return isinstance(
+            error,
+            (ClientConnectionError, ClientPayloadError, asyncio.TimeoutError),
+        )
+
+    def get_delay(
+        self,
+        method: BaseMethod,
+        error: BaseException,
+        attempt: int,
+        elapsed: float,
+    ) -> Optional[float]:
+        """Seconds to wait before the next attempt, None to give up.
+
+        Args:
+            method: the method being sent
+            error: the error of the failed attempt
+            attempt: number of attempts made so far
+            elapsed: seconds spent on the call so far
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if not self.is_retryable(method, error):
+            return None
+
+        delay = self._retry_after(error)
+        if delay is None:
+            ceiling = min(
+                self.backoff_max,
+                self.backoff_base * 2 ** (attempt - 1),
+            )
+            delay = random.uniform(0, ceiling)
+        if (
+            self.total_timeout is not None
+            and elapsed + delay > self.total_timeout
+        ):
+            return None
+        return delay
+
+    def _retry_after(self, error: BaseException) -> Optional[float]:
+        if not (
+            self.respect_retry_after
+            and isinstance(error, ClientResponseError)
+            and error.status in RETRY_AFTER_STATUSES
+            and error.headers is not None
+        ):
+            return None
+        return parse_retry_after(error.headers.get("Retry-After"))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait according to a `Retry-After` header value."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
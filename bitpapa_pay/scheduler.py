@@ -0,0 +1,253 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, suppress
+from typing import (
+    AsyncIterator,
+    Deque,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from bitpapa_pay.enums import RequestPriority
+
+
+class RateLimit(NamedTuple):
+    rate: float
+    burst: float
+
+
+class TokenBucket:
+    __slots__ = ("burst", "rate", "tokens", "updated_at")
+
+    def __init__(self, limit: RateLimit) -> None:
+        if limit.rate <= 0 or limit.burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = limit.rate
+        self.burst = limit.burst
+        self.tokens = float(limit.burst)
+        self.updated_at = time.monotonic()
+
+    def delay(self, now: float) -> float:
+        """Seconds until a token is available, 0 if there is one now."""
+        self.tokens = min(
+            self.burst,
+            self.tokens + (now - self.updated_at) * self.rate,
+        )
+        self.updated_at = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class SchedulerStats:
+    __slots__ = ("granted", "max_wait", "total_wait")
+
+    def __init__(self) -> None:
+        self.granted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        return self.total_wait / self.granted if self.granted else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"SchedulerStats(granted={self.granted}, "
+            f"average_wait={self.average_wait:.4f}, "
+            f"max_wait={self.max_wait:.4f})"
+        )
+
+
+class _Waiter:
+    __slots__ = ("enqueued_at", "future")
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+
+_QueueKey = Tuple[Hashable, Optional[str]]
+
+
+class RequestScheduler:
+    """Client-side rate limiting and prioritization of requests.
+
+    Every api token gets a token bucket for all its requests and one per
+    endpoint group, a group being an endpoint prefix from `group_limits`
+    (the longest matching prefix wins). At most `max_in_flight` requests
+    run at once. Queued requests are granted by priority, and first come
+    first served within a priority. One scheduler may be shared by
+    several clients.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float = 10.0,
+        burst: float = 10,
+        max_in_flight: int = 10,
+        group_limits: Optional[Mapping[str, RateLimit]] = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be greater than 0")
+        self.max_in_flight = max_in_flight
+        self.stats = SchedulerStats()
+        self._token_limit = RateLimit(rate, burst)
+        self._group_limits = {
+            prefix: RateLimit(*limit)
+            for prefix, limit in (group_limits or {}).items()
+        }
+        self._prefixes = sorted(self._group_limits, key=len, reverse=True)
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._queues: Dict[
+            RequestPriority,
+            Dict[_QueueKey, Deque[_Waiter]],
+        ] = {priority: {} for priority in sorted(RequestPriority)}
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def queue_depth(self) -> Dict[RequestPriority, int]:
+        return {
+            priority: sum(len(queue) for queue in queues.values())
+            for priority, queues in self._queues.items()
+        }
+
+    def group_of(self, endpoint: str) -> Optional[str]:
+        for prefix in self._prefixes:
+            if endpoint.startswith(prefix):
+                return prefix
+        return None
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        token: Hashable,
+        endpoint: str,
+        priority: RequestPriority = RequestPriority.NORMAL,
+    ) -> AsyncIterator[None]:
+        await self.acquire(token, endpoint, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(
+        self,
+        token: Hashable,
+        endpoint: str,
+        priority: RequestPriority = RequestPriority.NORMAL,
+    ) -> None:
+        key = (token, self.group_of(endpoint))
+        queue = self._queues[priority].get(key)
+        if queue is None:
+            queue = self._queues[priority][key] = deque()
+        waiter = _Waiter(asyncio.get_running_loop().create_future())
+        queue.append(waiter)
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # granted right before the cancellation reached us
+                self.release()
+            else:
+                # a dispatch may have dropped the cancelled waiter already
+                with suppress(ValueError):
+                    queue.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _buckets_of(self, key: _QueueKey) -> List[TokenBucket]:
+        token, group = key
+        buckets = [self._get_bucket(token, None, self._token_limit)]
+        if group is not None:
+            buckets.append(
+                self._get_bucket(token, group, self._group_limits[group]),
+            )
+        return buckets
+
+    def _get_bucket(
+        self,
+        token: Hashable,
+        group: Optional[str],
+        limit: RateLimit,
+    ) -> TokenBucket:
+        bucket = self._buckets.get((token, group))
+        if bucket is None:
+            bucket = self._buckets[token, group] = TokenBucket(limit)
+        return bucket
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        delays = []
+        for queues in self._queues.values():
+            if self._in_flight >= self.max_in_flight:
+                return
+            delay = self._drain(queues, now)
+            if delay is not None:
+                delays.append(delay)
+        if delays:
+            self._timer = asyncio.get_running_loop().call_later(
+                min(delays),
+                self._dispatch,
+            )
+
+    def _drain(
+        self,
+        queues: Dict[_QueueKey, Deque[_Waiter]],
+        now: float,
+    ) -> Optional[float]:
+        """Grant waiters of one priority, round robin between the queues.
+
+        Returns the seconds until a rate-limited waiter could be granted.
+        """
+        wake_in = None
+        progress = True
+        while progress:
+            progress = False
+            for key, queue in queues.items():
+                # cancelled waiters stay queued until their task resumes
+                while queue and queue[0].future.done():
+                    queue.popleft()
+                if not queue or self._in_flight >= self.max_in_flight:
+                    continue
+                buckets = self._buckets_of(key)
+                delay = max(bucket.delay(now) for bucket in buckets)
+                if delay > 0:
+                    wake_in = delay if wake_in is None else min(wake_in, delay)
+                    continue
+                for bucket in buckets:
+                    bucket.take()
+                self._grant(queue.popleft(), now)
+                progress = True
+        for key in [key for key, queue in queues.items() if not queue]:
+            del queues[key]
+        return wake_in
+
+    def _grant(self, waiter: _Waiter, now: float) -> None:
+        self._in_flight += 1
+        waited = now - waiter.enqueued_at
+        self.stats.granted += 1
+        self.stats.total_wait += waited
+        self.stats.max_wait = max(self.stats.max_wait, waited)
+        waiter.future.set_result(None)
@@ -1,20 +1,26 @@
-from bitpapa_pay.schemas.addresses import (
-    CreateAddressResponse,
-    GetAddressesResponse,
-)
-from bitpapa_pay.schemas.default import (
-    GetExchangeRatesResponse,
-    GetWithdrawalFeesResponse,
-)
-from bitpapa_pay.schemas.invoices import (
-    CreateInvoiceResponse,
-    GetInvoicesResponse,
-)
-from bitpapa_pay.schemas.transactions import (
-    GetAddressTransactionsResponse,
-    GetTransactionsResponse,
-    TransactionResponse,
-)
+from typing import TYPE_CHECKING
+
+from bitpapa_pay._lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from bitpapa_pay.schemas.addresses import (
+        CreateAddressResponse,
+        GetAddressesResponse,
+    )
+    from bitpapa_pay.schemas.default import (
+        GetExchangeRatesResponse,
+        GetWithdrawalFeesResponse,
+    )
+    from bitpapa_pay.schemas.invoices import (
+        CreateInvoiceResponse,
+        GetInvoicesResponse,
+        Invoice,
+    )
+    from bitpapa_pay.schemas.transactions import (
+        GetAddressTransactionsResponse,
+        GetTransactionsResponse,
+        TransactionResponse,
+    )
 
 __all__ = [
     "CreateAddressResponse",
@@ -25,5 +31,22 @@ __all__ = [
     "GetInvoicesResponse",
     "GetTransactionsResponse",
     "GetWithdrawalFeesResponse",
+    "Invoice",
     "TransactionResponse",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    globals(),
+    {
+        "CreateAddressResponse": ".addresses",
+        "CreateInvoiceResponse": ".invoices",
+        "GetAddressTransactionsResponse": ".transactions",
+        "GetAddressesResponse": ".addresses",
+        "GetExchangeRatesResponse": ".default",
+        "GetInvoicesResponse": ".invoices",
+        "GetTransactionsResponse": ".transactions",
+        "GetWithdrawalFeesResponse": ".default",
+        "Invoice": ".invoices",
+        "TransactionResponse": ".transactions",
+    },
+)
@@ -1,10 +1,10 @@
 from typing import List, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel
+from bitpapa_pay.schemas.base import BaseSchema
 
 
-class Address(BaseModel):
+class Address(BaseSchema):
     id: UUID
     address: Optional[str]
     currency: Optional[str]
@@ -13,10 +13,9 @@ class Address(BaseModel):
     label: str
 
 
-class GetAddressesResponse(BaseModel):
+class GetAddressesResponse(BaseSchema):
     addresses: List[Address]
 
 
-class CreateAddressResponse(BaseModel):
+class CreateAddressResponse(BaseSchema):
     address: Address
-
@@ -0,0 +1,6 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class BaseSchema(BaseModel):
+    # validators are built on first use instead of at import time
+    model_config = ConfigDict(defer_build=True)
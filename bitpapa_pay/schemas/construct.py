@@ -0,0 +1,83 @@
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+Converter = Callable[[Any], Any]
+
+
+def construct_model(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """Build `model` and its nested models from trusted data.
+
+    Nothing is validated or coerced: values keep their decoded json types,
+    so for example ids typed as `UUID` stay strings.
+    """
+    specs = _field_specs(model)
+    fields = {}
+    for key, value in data.items():
+        spec = specs.get(key)
+        if spec is None:
+            continue
+        name, convert = spec
+        fields[name] = value if convert is None else convert(value)
+    return model.model_construct(**fields)
+
+
+@lru_cache(maxsize=None)
+def _field_specs(
+    model: Type[BaseModel],
+) -> Dict[str, Tuple[str, Union[Converter, None]]]:
+    specs = {}
+    for name, field in model.model_fields.items():
+        spec = (name, _converter(field.annotation))
+        specs[name] = spec
+        if field.alias is not None:
+            specs[field.alias] = spec
+    return specs
+
+
+def _converter(annotation: Any) -> Union[Converter, None]:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda value: (
+            construct_model(annotation, value)
+            if isinstance(value, dict) else value
+        )
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Union:
+        converters = [
+            _converter(arg) for arg in args if arg is not type(None)
+        ]
+        return converters[0] if len(converters) == 1 else None
+    if origin in {list, dict} and args:
+        return _container_converter(origin, _converter(args[-1]))
+    return None
+
+
+def _container_converter(
+    origin: type,
+    item: Union[Converter, None],
+) -> Union[Converter, None]:
+    if item is None:
+        return None
+    if origin is list:
+        return lambda value: (
+            [item(v) for v in value] if isinstance(value, list) else value
+        )
+    return lambda value: (
+        {k: item(v) for k, v in value.items()}
+        if isinstance(value, dict) else value
+    )
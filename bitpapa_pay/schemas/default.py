@@ -1,18 +1,18 @@
 from typing import Dict, List, Optional, Union
 
-from pydantic import BaseModel
+from bitpapa_pay.schemas.base import BaseSchema
 
 
-class GetExchangeRatesResponse(BaseModel):
+class GetExchangeRatesResponse(BaseSchema):
     rates: Dict[str, float]
 
 
-class FeeData(BaseModel):
+class FeeData(BaseSchema):
     amount_min: Union[int, float]
     amount_max: Optional[Union[int, float]]
     fee: Union[int, float]
     network: str
 
 
-class GetWithdrawalFeesResponse(BaseModel):
+class GetWithdrawalFeesResponse(BaseSchema):
     withdrawal_fees: Dict[str, List[FeeData]]
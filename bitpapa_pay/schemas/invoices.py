@@ -1,9 +1,11 @@
 from typing import List, Optional
 
-from pydantic import BaseModel, computed_field
+from pydantic import computed_field
 
+from bitpapa_pay.schemas.base import BaseSchema
 
-class Invoice(BaseModel):
+
+class Invoice(BaseSchema):
     id: str
     invoice_type: str
     currency_code: str
@@ -24,11 +26,11 @@ class Invoice(BaseModel):
         return f"https://t.me/bitpapa_bot?start={self.id}"
 
 
-class CreateInvoiceResponse(BaseModel):
+class CreateInvoiceResponse(BaseSchema):
     invoice: Invoice
 
 
-class GetInvoicesResponse(BaseModel):
+class GetInvoicesResponse(BaseSchema):
     invoices: List[Invoice]
     page: int
     count: int
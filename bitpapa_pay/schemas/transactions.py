@@ -1,10 +1,12 @@
 from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
+from bitpapa_pay.schemas.base import BaseSchema
 
-class Transaction(BaseModel):
+
+class Transaction(BaseSchema):
     id: UUID
     direction: Optional[str]
     txhash: Optional[str]
@@ -17,13 +19,13 @@ class Transaction(BaseModel):
     label: Optional[str]
 
 
-class TransactionResponse(BaseModel):
+class TransactionResponse(BaseSchema):
     transaction: Transaction
 
 
-class GetAddressTransactionsResponse(BaseModel):
+class GetAddressTransactionsResponse(BaseSchema):
     transaction: List[Transaction]
 
 
-class GetTransactionsResponse(BaseModel):
+class GetTransactionsResponse(BaseSchema):
     transactions: List[Transaction]
@@ -0,0 +1,97 @@
+import re
+from typing import List, Optional
+
+# a whole string or a character that can change the nesting or start a
+# string going on in the next chunk
+_TOKENS = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[][{}",]', re.DOTALL)
+# the rest of a string up to its closing quote, which is in group 1;
+# without it the match stops before a backslash ending the buffer
+_STRING_REST = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*(")?', re.DOTALL)
+
+_QUOTE = ord('"')
+_COMMA = ord(",")
+_ARRAY = ord("[")
+_OPENERS = frozenset(b"[{")
+
+
+class JsonArraySplitter:
+    """Splits the first json array of a body into its items incrementally.
+
+    `feed` takes chunks of the body as they arrive and returns the raw
+    json of the items completed so far. Only the part of the body after
+    the last complete item is kept, so memory is bounded by the largest
+    item rather than the body. The array may be the body itself or nested
+    in an object, as in `{"transaction": [...]}`.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._array_depth: Optional[int] = None
+        self._item_start = 0
+        self._in_string = False
+        self.finished = False
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        if self.finished:
+            return []
+        buffer = self._buffer
+        buffer += chunk
+        items: List[bytes] = []
+        pos = self._pos
+        if self._in_string:
+            pos = self._skip_string(pos)
+        while not self._in_string and not self.finished:
+            match = _TOKENS.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            index, pos = match.span()
+            if pos - index > 1:
+                # a whole string
+                continue
+            if buffer[index] == _QUOTE:
+                pos = self._skip_string(pos)
+            else:
+                pos = self._structural(index, items)
+        self._trim(pos)
+        return items
+
+    def _skip_string(self, pos: int) -> int:
+        """Position after the end of the string `pos` is in, or where to
+        resume when the string goes on in the next chunk."""
+        match = _STRING_REST.match(self._buffer, pos)
+        self._in_string = match.group(1) is None
+        return match.end()
+
+    def _structural(self, index: int, items: List[bytes]) -> int:
+        """Apply the token at `index` outside strings, appending the item
+        it completes, and return the position after it."""
+        buffer = self._buffer
+        char = buffer[index]
+        pos = index + 1
+        if char in _OPENERS:
+            self._depth += 1
+            if self._array_depth is None and char == _ARRAY:
+                self._array_depth = self._depth
+                self._item_start = pos
+        elif char == _COMMA:
+            if self._depth == self._array_depth:
+                items.append(bytes(buffer[self._item_start:index]))
+                self._item_start = pos
+        elif self._depth == self._array_depth:
+            item = bytes(buffer[self._item_start:index]).strip()
+            if item:
+                items.append(item)
+            self.finished = True
+        else:
+            self._depth -= 1
+        return pos
+
+    def _trim(self, pos: int) -> None:
+        keep = pos if self._array_depth is None else self._item_start
+        del self._buffer[:keep]
+        self._pos = pos - keep
+        if self._array_depth is not None:
+            self._item_start = 0
@@ -0,0 +1,185 @@
+import asyncio
+import inspect
+import os
+import threading
+import weakref
+from functools import wraps
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+from bitpapa_pay.client import BitpapaPay
+
+T = TypeVar("T")
+
+_instances: "weakref.WeakSet[BitpapaPaySync]" = weakref.WeakSet()
+
+
+class BitpapaPaySync:
+    """Blocking `BitpapaPay` for code without an event loop.
+
+    The first call starts an event loop in a daemon thread and creates
+    the async client there; every call after that is submitted to the
+    same loop, so connections stay warm between calls. Methods mirror
+    `BitpapaPay`, async generators become iterators. It may be used from
+    several threads at once. A forked child process starts its own loop
+    on its first call instead of using the parent's.
+
+        with BitpapaPaySync(api_token) as client:
+            invoices = client.get_invoices()
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        call_timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Args:
+            args: passed to `BitpapaPay`
+            call_timeout: seconds a call may take before it is cancelled
+                and `concurrent.futures.TimeoutError` is raised
+            kwargs: passed to `BitpapaPay`
+        """
+        self._args = args
+        self._kwargs = kwargs
+        self.call_timeout = call_timeout
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[BitpapaPay] = None
+        _instances.add(self)
+
+    def __enter__(self) -> "BitpapaPaySync":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def client(self) -> BitpapaPay:
+        """The async client, for its stats and caches."""
+        self._start()
+        return self._client
+
+    def close(self) -> None:
+        """Close the client and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._client.close(),
+                    loop,
+                ).result()
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                self._forget()
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        """Run an awaitable on the loop of the client and wait for it."""
+        self._start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BitpapaPaySync called from its own loop")
+        future = asyncio.run_coroutine_threadsafe(
+            _await(awaitable),
+            self._loop,
+        )
+        try:
+            return future.result(self.call_timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def iterate(self, iterator: AsyncIterator[T]) -> Iterator[T]:
+        """Iterate over an async iterator on the loop of the client."""
+        try:
+            while True:
+                try:
+                    item = self.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            aclose = getattr(iterator, "aclose", None)
+            if aclose is not None and self._loop is not None:
+                self.run(aclose())
+
+    def _start(self) -> None:
+        if self._loop is not None:
+            return
+        with self._lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="bitpapa-pay-loop",
+                daemon=True,
+            )
+            thread.start()
+            self._client = asyncio.run_coroutine_threadsafe(
+                self._create_client(),
+                loop,
+            ).result()
+            self._loop = loop
+            self._thread = thread
+
+    async def _create_client(self) -> BitpapaPay:
+        return BitpapaPay(*self._args, **self._kwargs)
+
+    def _forget(self) -> None:
+        self._loop = None
+        self._thread = None
+        self._client = None
+
+
+async def _await(awaitable: Awaitable[T]) -> T:
+    return await awaitable
+
+
+def _after_fork_in_child() -> None:
+    # the loop thread only exists in the parent, the child drops the loop
+    # and its sessions without touching them and starts its own
+    for instance in list(_instances):
+        instance._lock = threading.Lock()  # noqa: SLF001
+        instance._forget()  # noqa: SLF001
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def _mirror(name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    if inspect.isasyncgenfunction(method):
+
+        @wraps(method)
+        def iterate(self: BitpapaPaySync, *args: Any, **kwargs: Any):
+            return self.iterate(getattr(self.client, name)(*args, **kwargs))
+
+        return iterate
+
+    @wraps(method)
+    def call(self: BitpapaPaySync, *args: Any, **kwargs: Any):
+        return self.run(getattr(self.client, name)(*args, **kwargs))
+
+    return call
+
+
+for _name, _method in inspect.getmembers(BitpapaPay, inspect.isfunction):
+    if _name.startswith("_") or hasattr(BitpapaPaySync, _name):
+        continue
+    if inspect.iscoroutinefunction(_method) or inspect.isasyncgenfunction(
+        _method,
+    ):
+        setattr(BitpapaPaySync, _name, _mirror(_name, _method))
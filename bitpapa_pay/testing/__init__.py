@@ -0,0 +1,3 @@
+from bitpapa_pay.testing.server import FakeBitpapaServer
+
+__all__ = ["FakeBitpapaServer"]
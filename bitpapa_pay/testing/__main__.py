@@ -0,0 +1,46 @@
+"""Run the fake Bitpapa server until interrupted.
+
+    python -m bitpapa_pay.testing --port 8080 --latency 0.02
+
+The server address is printed on the first line of stdout.
+"""
+
+import argparse
+import asyncio
+import contextlib
+
+from bitpapa_pay.testing.server import FakeBitpapaServer
+
+
+async def serve(args: argparse.Namespace) -> None:
+    async with FakeBitpapaServer(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        invoices_per_page=args.page_size,
+        addresses=args.page_size,
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+    ) as server:
+        print(server.url, flush=True)  # noqa: T201
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Bitpapa api server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--page-size", type=int, default=30)
+    parser.add_argument("--seed", type=int)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
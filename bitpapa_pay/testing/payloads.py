@@ -0,0 +1,112 @@
+"""Synthetic response bodies shaped like the Bitpapa api responses."""
+
+import uuid
+from typing import Any, Dict, List
+
+CURRENCIES = ["BTC", "ETH", "TON", "TRX", "USDC", "USDT", "XMR"]
+NETWORKS = {
+    "BTC": "BTC",
+    "ETH": "ERC20",
+    "TON": "TON",
+    "TRX": "TRC20",
+    "USDC": "ERC20",
+    "USDT": "TRC20",
+    "XMR": "XMR",
+}
+STATUSES = ["new", "paid", "expired"]
+
+
+def invoice(index: int) -> Dict[str, Any]:
+    currency = CURRENCIES[index % len(CURRENCIES)]
+    return {
+        "id": str(uuid.UUID(int=index)),
+        "invoice_type": "crypto" if index % 2 else "fiat",
+        "currency_code": currency,
+        "fiat_currency_code": None if index % 2 else "RUB",
+        "merchant_invoice_id": f"order-{index}",
+        "amount": round(index * 1.5 % 1000, 2),
+        "fiat_amount": round(index * 97.3 % 100000, 2),
+        "status": STATUSES[index % len(STATUSES)],
+        "crypto_address": None,
+        "accepted_crypto": [currency],
+        "paid_button_name": "open_bot",
+        "paid_button_url": "https://t.me/example_bot",
+        "created_at": "2024-01-01T00:00:00.000Z",
+        "updated_at": f"2024-01-01T00:00:{index % 60:02d}.000Z",
+    }
+
+
+def invoices_page(page: int = 1, per_page: int = 30, pages: int = 10):
+    start = (page - 1) * per_page
+    return {
+        "invoices": [invoice(start + i) for i in range(per_page)],
+        "page": page,
+        "count": per_page * pages,
+        "pages": pages,
+    }
+
+
+def address(index: int) -> Dict[str, Any]:
+    currency = CURRENCIES[index % len(CURRENCIES)]
+    return {
+        "id": str(uuid.UUID(int=index + 1)),
+        "address": f"{currency.lower()}-address-{index}",
+        "currency": currency,
+        "network": NETWORKS[currency],
+        "balance": round(index * 0.37 % 50, 6),
+        "label": f"label-{index}",
+    }
+
+
+def addresses(count: int = 100) -> List[Dict[str, Any]]:
+    return [address(i) for i in range(count)]
+
+
+def transaction(index: int) -> Dict[str, Any]:
+    currency = CURRENCIES[index % len(CURRENCIES)]
+    return {
+        "id": str(uuid.UUID(int=index + 1)),
+        "direction": "offchain",
+        "txhash": f"{index:064x}",
+        "currency": currency,
+        "network": NETWORKS[currency],
+        "amount": round(index * 0.11 % 500, 6),
+        "from": f"from-address-{index}",
+        "to": f"to-address-{index}",
+        "input": None,
+        "label": f"payout-{index}",
+    }
+
+
+def transactions(count: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+    return [transaction(offset + i) for i in range(count)]
+
+
+def exchange_rates() -> Dict[str, Any]:
+    fiats = ["USD", "EUR", "RUB", "KZT", "UAH", "TRY", "GBP", "CNY"]
+    return {
+        "rates": {
+            f"{crypto}_{fiat}": 1.0 + index
+            for index, (crypto, fiat) in enumerate(
+                (crypto, fiat) for crypto in CURRENCIES for fiat in fiats
+            )
+        },
+    }
+
+
+def withdrawal_fees() -> Dict[str, Any]:
+    bounds = [0, 10, 100, 1000, 10000, None]
+    return {
+        "withdrawal_fees": {
+            currency: [
+                {
+                    "amount_min": bounds[i],
+                    "amount_max": bounds[i + 1],
+                    "fee": round(0.5 + i * 0.25, 2),
+                    "network": NETWORKS[currency],
+                }
+                for i in range(len(bounds) - 1)
+            ]
+            for currency in ("BTC", "XMR")
+        },
+    }
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import random
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Optional
+
+from aiohttp import web
+
+from bitpapa_pay.testing import payloads
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def _json(body: bytes, status: int = 200) -> web.Response:
+    return web.Response(
+        body=body,
+        status=status,
+        content_type="application/json",
+    )
+
+
+@lru_cache(maxsize=1024)
+def _encode(name: str, *args: Any) -> bytes:
+    return json.dumps(getattr(payloads, name)(*args)).encode()
+
+
+class FakeBitpapaServer:
+    """Local stand-in for the Bitpapa endpoints used by the client.
+
+    Responses are synthetic payloads of configurable size. Every request
+    waits `latency` seconds (plus up to `jitter` more) and fails with
+    `error_status` with probability `error_rate`. Requests without an
+    `X-Access-Token` header are rejected with 401.
+
+        async with FakeBitpapaServer(latency=0.01) as server:
+            client = BitpapaPay(api_token="token", base_url=server.url)
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        invoices_per_page: int = 30,
+        invoice_pages: int = 10,
+        addresses: int = 100,
+        address_transactions: int = 100,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.invoices_per_page = invoices_per_page
+        self.invoice_pages = invoice_pages
+        self.addresses = addresses
+        self.address_transactions = address_transactions
+        self.host = host
+        self.port = port
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def __aenter__(self) -> "FakeBitpapaServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get(
+            "/api/v1/exchange_rates/all",
+            self._exchange_rates,
+        )
+        app.router.add_get(
+            "/api/v1/withdrawals/withdrawal_fees",
+            self._withdrawal_fees,
+        )
+        app.router.add_get("/api/v1/invoices/public", self._get_invoices)
+        app.router.add_post("/api/v1/invoices/public", self._create_invoice)
+        app.router.add_get("/a3s/v1/addresses", self._get_addresses)
+        app.router.add_post("/a3s/v1/addresses/new", self._create_address)
+        app.router.add_get("/a3s/v1/transactions", self._get_transactions)
+        app.router.add_get(
+            "/a3s/v1/address/{uuid}/transactions",
+            self._get_address_transactions,
+        )
+        for path in (
+            "/a3s/v1/transactions/new",
+            "/a3s/v1/master/withdrawal",
+            "/a3s/v1/master/refill",
+        ):
+            app.router.add_post(path, self._create_transaction)
+        return app
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+        return self.url
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @web.middleware
+    async def _middleware(
+        self,
+        request: web.Request,
+        handler: Handler,
+    ) -> web.StreamResponse:
+        route = request.match_info.route.resource
+        self.requests[route.canonical if route else request.path] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(
+                self.latency + self._random.random() * self.jitter,
+            )
+        if "X-Access-Token" not in request.headers:
+            return _json(b'{"error":"unauthorized"}', status=401)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return _json(b'{"error":"injected"}', status=self.error_status)
+        return await handler(request)
+
+    async def _exchange_rates(self, request: web.Request) -> web.Response:
+        return _json(_encode("exchange_rates"))
+
+    async def _withdrawal_fees(self, request: web.Request) -> web.Response:
+        return _json(_encode("withdrawal_fees"))
+
+    async def _get_invoices(self, request: web.Request) -> web.Response:
+        page = int(request.query.get("page", 1))
+        return _json(
+            _encode(
+                "invoices_page",
+                page,
+                self.invoices_per_page,
+                self.invoice_pages,
+            ),
+        )
+
+    async def _create_invoice(self, request: web.Request) -> web.Response:
+        data = (await request.json())["invoice"]
+        invoice = payloads.invoice(self.requests["/api/v1/invoices/public"])
+        invoice.update(
+            {
+                key: value for key, value in data.items()
+                if key in invoice and value is not None
+            },
+        )
+        return web.json_response({"invoice": invoice})
+
+    async def _get_addresses(self, request: web.Request) -> web.Response:
+        return _json(_encode("addresses", self.addresses))
+
+    async def _create_address(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        address = payloads.address(
+            self.addresses + self.requests["/a3s/v1/addresses/new"],
+        )
+        address.update(
+            currency=data["currency"],
+            network=data["network"],
+            label=data.get("label", ""),
+            balance=0,
+        )
+        return web.json_response({"address": address})
+
+    async def _get_transactions(self, request: web.Request) -> web.Response:
+        page = int(request.query.get("page", 1))
+        limit = int(request.query.get("limit", 100))
+        return _json(_encode("transactions", limit, (page - 1) * limit))
+
+    async def _get_address_transactions(
+        self,
+        request: web.Request,
+    ) -> web.Response:
+        page = int(request.query.get("page", 1))
+        limit = min(
+            int(request.query.get("limit", 100)),
+            self.address_transactions,
+        )
+        body = _encode("transactions", limit, (page - 1) * limit)
+        return _json(b'{"transaction":' + body + b"}")
+
+    async def _create_transaction(
+        self,
+        request: web.Request,
+    ) -> web.Response:
+        data = await request.json()
+        transaction = payloads.transaction(self.requests[request.path])
+        transaction.update(
+            {
+                key: value for key, value in data.items()
+                if key in transaction
+            },
+        )
+        return web.json_response({"transaction": transaction})
@@ -0,0 +1,175 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+)
+
+from bitpapa_pay._compat import get_logger
+from bitpapa_pay.enums import ResponseMode
+from bitpapa_pay.schemas import Invoice
+
+if TYPE_CHECKING:
+    from bitpapa_pay.client import BitpapaPayClient
+
+FINAL_INVOICE_STATUSES = frozenset({"paid", "expired"})
+
+
+class InvoiceWaiter:
+    """Waits for invoices to reach a final status with one shared poller.
+
+    The poller runs only while someone is waiting. Each cycle reads
+    invoice pages until every pending invoice has been seen and resolves
+    the waiters of invoices in a final status. The interval between
+    cycles starts at `interval`, grows up to `max_interval` while nothing
+    changes and drops back when an invoice is resolved or a new waiter
+    arrives.
+    """
+
+    def __init__(
+        self,
+        client: "BitpapaPayClient",
+        *,
+        final_statuses: Iterable[str] = FINAL_INVOICE_STATUSES,
+        interval: float = 1.0,
+        max_interval: float = 10.0,
+        backoff: float = 2.0,
+        max_pages: Optional[int] = None,
+    ) -> None:
+        if interval <= 0 or max_interval < interval:
+            raise ValueError("intervals must satisfy 0 < interval <= max")
+        self._client = client
+        self.final_statuses = frozenset(final_statuses)
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_pages = max_pages
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.cycles = 0
+        self.pages_fetched = 0
+
+    @property
+    def pending(self) -> Set[str]:
+        return set(self._waiters)
+
+    async def wait(
+        self,
+        invoice_id: str,
+        timeout: Optional[float] = None,
+    ) -> Invoice:
+        """Wait until the invoice is in a final status.
+
+        Raises:
+            asyncio.TimeoutError: the invoice did not reach a final status
+                within `timeout` seconds
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(invoice_id, []).append(future)
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._poll())
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._discard(invoice_id, future)
+
+    async def wait_many(
+        self,
+        invoice_ids: Iterable[str],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Invoice]:
+        """Wait until every invoice is in a final status."""
+        invoice_ids = list(dict.fromkeys(invoice_ids))
+        invoices = await asyncio.wait_for(
+            asyncio.gather(*(self.wait(i) for i in invoice_ids)),
+            timeout,
+        )
+        return dict(zip(invoice_ids, invoices))
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        for futures in self._waiters.values():
+            for future in futures:
+                future.cancel()
+        self._waiters.clear()
+
+    def _discard(self, invoice_id: str, future: asyncio.Future) -> None:
+        futures = self._waiters.get(invoice_id)
+        if futures is None:
+            return
+        if future in futures:
+            futures.remove(future)
+        if not futures:
+            del self._waiters[invoice_id]
+
+    async def _poll(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = self.interval
+        while self._waiters:
+            self._wakeup.clear()
+            scanned_at = loop.time()
+            try:
+                resolved = await self._scan()
+            except Exception as e:
+                get_logger().warning("invoice poll failed: {!r}", e)
+                resolved = 0
+            self.cycles += 1
+            if resolved:
+                interval = self.interval
+            else:
+                interval = min(interval * self.backoff, self.max_interval)
+            if not self._waiters:
+                break
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), interval)
+            except asyncio.TimeoutError:
+                continue
+            # new waiters never make the poller scan more often than
+            # every `interval` seconds
+            interval = self.interval
+            await asyncio.sleep(
+                max(0.0, scanned_at + interval - loop.time()),
+            )
+
+    async def _scan(self) -> int:
+        unseen = set(self._waiters)
+        resolved = 0
+        page = 1
+        while unseen:
+            body = await self._client.get_invoices(
+                page=page,
+                response_mode=ResponseMode.RAW,
+            )
+            self.pages_fetched += 1
+            for invoice in body["invoices"]:
+                invoice_id = invoice["id"]
+                if invoice_id not in unseen:
+                    continue
+                unseen.discard(invoice_id)
+                if invoice["status"] in self.final_statuses:
+                    resolved += self._resolve(invoice_id, invoice)
+            if page >= body["pages"] or (
+                self.max_pages is not None and page >= self.max_pages
+            ):
+                break
+            page += 1
+        return resolved
+
+    def _resolve(self, invoice_id: str, data: Dict[str, Any]) -> int:
+        futures = self._waiters.pop(invoice_id, [])
+        invoice = Invoice.model_validate(data)
+        for future in futures:
+            if not future.done():
+                future.set_result(invoice)
+        return len(futures)
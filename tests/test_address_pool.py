@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.address_pool import AddressPool
+from bitpapa_pay.enums import ResponseMode
+from bitpapa_pay.schemas.addresses import Address
+from bitpapa_pay.testing import FakeBitpapaServer
+
+
+@pytest.mark.parametrize("mode", [ResponseMode.RAW, ResponseMode.TRUSTED])
+def test_pool_hands_out_models_in_any_response_mode(mode, tmp_path):
+    state_path = tmp_path / "pool.json"
+
+    async def main():
+        async with FakeBitpapaServer(addresses=5) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                response_mode=mode,
+            )
+            try:
+                pool = AddressPool(
+                    client,
+                    [("USDT", "TRC20")],
+                    size=2,
+                    low_water=1,
+                    state_path=state_path,
+                )
+                async with pool:
+                    assert pool.available("USDT", "TRC20") == 2
+                    address = await pool.acquire("USDT", "TRC20", "order-1")
+                    assert isinstance(address, Address)
+                    assert pool.assigned("order-1") == address
+            finally:
+                await client.close()
+
+    asyncio.run(main())
+
+
+def run_pool(scenario, latency=0.0, **options):
+    async def main():
+        async with FakeBitpapaServer(addresses=0, latency=latency) as server:
+            client = BitpapaPay("token", base_url=server.url)
+            try:
+                async with AddressPool(
+                    client,
+                    [("USDT", "TRC20")],
+                    **options,
+                ) as pool:
+                    result = await scenario(pool)
+            finally:
+                await client.close()
+        return result, server.requests["/a3s/v1/addresses/new"]
+
+    return asyncio.run(main())
+
+
+def test_concurrent_acquires_of_one_owner_create_one_address():
+    async def scenario(pool):
+        return await asyncio.gather(
+            *(pool.acquire("USDT", "TRC20", "order-1") for _ in range(3)),
+        )
+
+    addresses, created = run_pool(scenario, size=0, low_water=0)
+    assert addresses[0] == addresses[1] == addresses[2]
+    assert created == 1
+
+
+def test_addresses_acquired_during_a_refill_are_made_up():
+    async def scenario(pool):
+        for index in range(2):
+            await pool.acquire("USDT", "TRC20", f"order-{index}")
+        # the refill started by the second acquire is still running
+        await asyncio.sleep(0.01)
+        for index in range(2, 4):
+            await pool.acquire("USDT", "TRC20", f"order-{index}")
+        for _ in range(100):
+            if pool.available("USDT", "TRC20") == 4:
+                break
+            await asyncio.sleep(0.01)
+        return pool.available("USDT", "TRC20")
+
+    available, created = run_pool(scenario, latency=0.05, size=4, low_water=3)
+    assert available == 4
+    assert created == 8
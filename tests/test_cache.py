@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from bitpapa_pay.cache import AsyncTTLCache, SingleFlight
+
+
+def test_concurrent_callers_share_one_call():
+    async def main():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(None)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        results = await asyncio.gather(
+            *(flight.do("key", fetch) for _ in range(5)),
+        )
+        assert results == [1] * 5
+        assert (flight.misses, flight.hits) == (1, 4)
+        assert "key" not in flight
+        assert await flight.do("key", fetch) == 2
+
+    asyncio.run(main())
+
+
+def test_errors_reach_every_caller():
+    async def main():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        results = await asyncio.gather(
+            flight.do("key", fail),
+            flight.do("key", fail),
+            return_exceptions=True,
+        )
+        assert [type(result) for result in results] == [ValueError] * 2
+        assert len(flight) == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def main():
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "value"
+
+        cancelled = asyncio.ensure_future(flight.do("key", fetch))
+        waiting = asyncio.ensure_future(flight.do("key", fetch))
+        await asyncio.sleep(0.005)
+        cancelled.cancel()
+        assert await waiting == "value"
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+    asyncio.run(main())
+
+
+def test_call_is_cancelled_with_its_last_caller():
+    async def main():
+        flight = SingleFlight()
+        started = asyncio.Event()
+        finished = []
+
+        async def fetch():
+            started.set()
+            try:
+                await asyncio.sleep(1)
+            finally:
+                finished.append(None)
+
+        caller = asyncio.ensure_future(flight.do("key", fetch))
+        await started.wait()
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        assert finished
+        assert "key" not in flight
+
+    asyncio.run(main())
+
+
+def test_ttl_cache_serves_stale_value_while_refreshing():
+    async def main():
+        loads = []
+
+        async def load():
+            loads.append(None)
+            return len(loads)
+
+        cache = AsyncTTLCache(load, ttl=0.05)
+        assert await asyncio.gather(cache.get(), cache.get()) == [1, 1]
+        await asyncio.sleep(0.06)
+        assert await cache.get() == 1
+        await asyncio.sleep(0.005)
+        assert await cache.get() == 2
+        await cache.close()
+
+    asyncio.run(main())
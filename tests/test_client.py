@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from aiohttp import ClientError, ClientTimeout, web
+from pydantic import ValidationError
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.exceptions import BadRequestError, RequestTimeoutError
+from bitpapa_pay.testing import FakeBitpapaServer
+
+
+def test_timeout_is_a_bad_request_error():
+    async def main():
+        async with FakeBitpapaServer(latency=1.0) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                timeout=ClientTimeout(total=0.05),
+            )
+            try:
+                with pytest.raises(RequestTimeoutError) as info:
+                    await client.get_exchange_rates_all()
+            finally:
+                await client.close()
+        assert isinstance(info.value, BadRequestError)
+        assert isinstance(info.value, asyncio.TimeoutError)
+        assert info.value.attempts == 1
+
+    asyncio.run(main())
+
+
+def test_bulk_invoices_report_timeouts_per_item():
+    async def main():
+        async with FakeBitpapaServer(latency=1.0) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                timeout=ClientTimeout(total=0.05),
+            )
+            specs = [
+                {"currency_code": "USDT", "amount": index + 1}
+                for index in range(3)
+            ]
+            try:
+                results = [
+                    result
+                    async for result in client.create_invoices_bulk(specs)
+                ]
+            finally:
+                await client.close()
+        assert [result.index for result in results] == [0, 1, 2]
+        assert not any(result.ok for result in results)
+        assert all(
+            isinstance(result.error, asyncio.TimeoutError)
+            for result in results
+        )
+
+    asyncio.run(main())
+
+
+class MalformedInvoiceServer(FakeBitpapaServer):
+    async def _create_invoice(self, request):
+        if (await request.json())["invoice"]["amount"] == 2:
+            self.requests["/api/v1/invoices/public"] += 1
+            return web.json_response({"invoice": {"id": None}})
+        return await super()._create_invoice(request)
+
+
+def test_bulk_invoices_report_malformed_responses_per_item():
+    async def main():
+        async with MalformedInvoiceServer() as server:
+            client = BitpapaPay("token", base_url=server.url)
+            specs = [
+                {"currency_code": "USDT", "amount": index + 1}
+                for index in range(3)
+            ]
+            try:
+                return [
+                    result
+                    async for result in client.create_invoices_bulk(specs)
+                ]
+            finally:
+                await client.close()
+
+    results = asyncio.run(main())
+    assert [result.ok for result in results] == [True, False, True]
+    assert isinstance(results[1].error, ValidationError)
+
+
+def test_socket_timeout_is_a_request_timeout():
+    async def main():
+        async with FakeBitpapaServer(latency=1.0) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                timeout=ClientTimeout(sock_read=0.05),
+            )
+            try:
+                with pytest.raises(RequestTimeoutError) as info:
+                    await client.get_exchange_rates_all()
+            finally:
+                await client.close()
+        # aiohttp's ServerTimeoutError is a ClientError and a TimeoutError
+        assert isinstance(info.value.__cause__, ClientError)
+        assert isinstance(info.value, asyncio.TimeoutError)
+
+    asyncio.run(main())
+
+
+def test_concurrent_identical_gets_share_one_request():
+    async def main():
+        async with FakeBitpapaServer(latency=0.05) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                coalesce_requests=True,
+            )
+            try:
+                pages = await asyncio.gather(
+                    *(client.get_invoices(page=1) for _ in range(5)),
+                    client.get_invoices(page=2),
+                )
+            finally:
+                await client.close()
+        return pages, server.requests["/api/v1/invoices/public"], client
+
+    pages, requests, client = asyncio.run(main())
+    assert requests == 2
+    assert all(page == pages[0] for page in pages[:5])
+    assert pages[5] != pages[0]
+    assert (client.coalescer.hits, client.coalescer.misses) == (4, 2)
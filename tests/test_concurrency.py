@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import pytest
+
+from bitpapa_pay.concurrency import SerialExecutor, iter_bounded
+
+
+def collect(factories, **options):
+    async def main():
+        return [
+            (index, future.exception() or future.result())
+            async for index, future in iter_bounded(factories, **options)
+        ]
+
+    return asyncio.run(main())
+
+
+def sleeper(delays, running):
+    def factory(index):
+        async def run():
+            running.append(index)
+            peak.append(len(running))
+            await asyncio.sleep(delays[index])
+            running.remove(index)
+            return index
+
+        return run
+
+    peak = []
+    return [factory(index) for index in range(len(delays))], peak
+
+
+def test_ordered_results_keep_input_order():
+    delays = [0.03, 0.01, 0.02, 0.0, 0.01]
+    factories, peak = sleeper(delays, [])
+    results = collect(factories, concurrency=2)
+    assert results == [(index, index) for index in range(len(delays))]
+    assert max(peak) == 2
+
+
+def test_unordered_results_come_as_they_complete():
+    delays = [0.03, 0.0, 0.01]
+    factories, _ = sleeper(delays, [])
+    results = collect(factories, concurrency=3, ordered=False)
+    assert [index for index, _ in results] == [1, 2, 0]
+
+
+def test_errors_are_left_in_the_future():
+    async def fail():
+        raise ValueError("failed")
+
+    async def succeed():
+        return "ok"
+
+    results = collect([succeed, fail, succeed], concurrency=2)
+    assert results[0] == (0, "ok")
+    assert isinstance(results[1][1], ValueError)
+    assert results[2] == (2, "ok")
+
+
+def test_stopping_early_cancels_pending_work():
+    async def main():
+        cancelled = []
+
+        def factory(index):
+            async def run():
+                try:
+                    await asyncio.sleep(index * 0.01)
+                except asyncio.CancelledError:
+                    cancelled.append(index)
+                    raise
+
+            return run
+
+        iterator = iter_bounded(
+            (factory(index) for index in range(10)),
+            concurrency=3,
+        )
+        async for index, _ in iterator:
+            if index == 1:
+                break
+        await iterator.aclose()
+        return cancelled
+
+    assert sorted(asyncio.run(main())) == [2, 3]
+
+
+def test_concurrency_must_be_positive():
+    with pytest.raises(ValueError, match="concurrency"):
+        collect([], concurrency=0)
+
+
+def test_serial_executor_uses_one_thread_until_shutdown():
+    async def main():
+        executor = SerialExecutor("bitpapa-test")
+        first = await asyncio.gather(
+            *(executor.run(threading.current_thread) for _ in range(5)),
+        )
+        executor.shutdown()
+        second = await executor.run(threading.current_thread)
+        executor.shutdown()
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert len(set(first)) == 1
+    assert first[0].name.startswith("bitpapa-test")
+    assert second is not first[0]
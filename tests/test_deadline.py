@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import ClientTimeout
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.deadline import (
+    Budget,
+    Deadline,
+    current_budget,
+    deadline,
+)
+from bitpapa_pay.exceptions import DeadlineExceededError, RequestTimeoutError
+from bitpapa_pay.testing import FakeBitpapaServer
+
+
+def test_budget_tightens_the_session_timeout():
+    base = ClientTimeout(total=10, sock_read=5, sock_connect=3)
+    timeout = Budget(connect=1, first_byte=7).client_timeout(base)
+    assert timeout.total == 10
+    assert timeout.sock_connect == 1
+    assert timeout.sock_read == 5
+    assert Budget(expires_at=1.0).client_timeout(base) is base
+
+
+def test_nested_blocks_and_client_deadlines_only_tighten():
+    with deadline(10, first_byte=2), deadline(20, connect=1):
+        budget = current_budget(Deadline(first_byte=3))
+    assert budget.connect == 1
+    assert budget.first_byte == 2
+    assert 9 < budget.remaining() <= 10
+    assert current_budget() is None
+
+
+def run_with(server_options, **client_options):
+    async def main():
+        async with FakeBitpapaServer(**server_options) as server:
+            client = BitpapaPay("token", base_url=server.url, **client_options)
+            started = time.monotonic()
+            try:
+                await client.get_exchange_rates_all()
+            finally:
+                await client.close()
+                elapsed = time.monotonic() - started
+            return elapsed
+
+    return asyncio.run(main())
+
+
+def test_first_byte_limit_raises_a_request_timeout():
+    with pytest.raises(RequestTimeoutError) as info:
+        run_with({"latency": 1.0}, deadline=Deadline(first_byte=0.05))
+    assert isinstance(info.value, asyncio.TimeoutError)
+
+
+def test_total_limit_raises_deadline_exceeded():
+    async def main():
+        async with FakeBitpapaServer(latency=1.0) as server:
+            client = BitpapaPay("token", base_url=server.url)
+            started = time.monotonic()
+            try:
+                with deadline(0.05), pytest.raises(DeadlineExceededError):
+                    await client.get_exchange_rates_all()
+            finally:
+                await client.close()
+            return time.monotonic() - started
+
+    assert asyncio.run(main()) < 0.5
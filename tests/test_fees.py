@@ -0,0 +1,37 @@
+import pytest
+
+from bitpapa_pay.fees import WithdrawalFeeIndex
+from bitpapa_pay.schemas import GetWithdrawalFeesResponse
+from bitpapa_pay.testing import payloads
+
+# tiers 0-10, 10-100, 100-1000, 1000-10000 and from 10000 on
+AMOUNTS = [0, 9.99, 10, 99.99, 100, 1000, 10000, 1e9]
+FEES = [0.5, 0.5, 0.75, 0.75, 1.0, 1.25, 1.5, 1.5]
+
+
+@pytest.fixture
+def index():
+    return WithdrawalFeeIndex.from_response(
+        GetWithdrawalFeesResponse.model_validate(payloads.withdrawal_fees()),
+    )
+
+
+def test_shared_boundaries_belong_to_the_upper_tier(index):
+    assert [index.fee_for("BTC", "BTC", amount) for amount in AMOUNTS] == (
+        FEES
+    )
+    assert index.fee_for("BTC", "BTC", -1) is None
+    assert index.fees_for("BTC", "BTC", AMOUNTS) == FEES
+
+
+def test_arrays_match_single_lookups(index):
+    np = pytest.importorskip("numpy")
+    fees = index.fees_for("BTC", "BTC", np.array([-1.0, *AMOUNTS]))
+    assert np.isnan(fees[0])
+    assert fees[1:].tolist() == FEES
+
+
+def test_unknown_network_raises_key_error(index):
+    assert ("BTC", "BTC") in index
+    with pytest.raises(KeyError, match="no withdrawal fees"):
+        index.fee_for("BTC", "ERC20", 10)
@@ -0,0 +1,62 @@
+import pytest
+
+from bitpapa_pay import frames
+from bitpapa_pay.frames import InvoiceFrame
+
+RECORDS = [
+    {"id": "a", "currency_code": "USDT", "status": "paid", "amount": 1.5},
+    {"id": "b", "currency_code": "BTC", "status": "paid", "amount": 2.0},
+    {"id": "c", "currency_code": "USDT", "status": "new", "amount": 4.0},
+    {"id": "d", "currency_code": "USDT", "status": "paid", "amount": None},
+    {"id": "e", "currency_code": None, "status": "new", "amount": 8.0},
+]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def frame(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(frames, "get_numpy", lambda: None)
+    return InvoiceFrame.from_records(RECORDS)
+
+
+def test_sum(frame):
+    assert frame.sum() == 15.5
+    assert frame.sum(by="currency_code") == {
+        "USDT": 5.5,
+        "BTC": 2.0,
+        None: 8.0,
+    }
+    assert frame.sum(by=["currency_code", "status"]) == {
+        ("USDT", "paid"): 1.5,
+        ("USDT", "new"): 4.0,
+        ("BTC", "paid"): 2.0,
+        (None, "new"): 8.0,
+    }
+
+
+def test_count(frame):
+    assert frame.count(by="status") == {"paid": 3, "new": 2}
+
+
+def test_filter(frame):
+    paid = frame.filter(status="paid", currency_code="USDT")
+    assert isinstance(paid, InvoiceFrame)
+    assert [invoice.id for invoice in paid] == ["a", "d"]
+    assert paid.sum() == 1.5
+    assert [invoice.id for invoice in frame.filter(amount=None)] == ["d"]
+    assert len(frame.filter(status="expired")) == 0
+
+
+def test_filter_combines_a_mask_with_equals(frame):
+    mask = [True, True, False, False, True]
+    selected = frame.filter(mask, status="paid")
+    assert [invoice.id for invoice in selected] == ["a", "b"]
+
+
+def test_only_float_and_category_columns_are_aggregated(frame):
+    with pytest.raises(ValueError, match="not a float column"):
+        frame.sum("status")
+    with pytest.raises(ValueError, match="not a category column"):
+        frame.sum(by="id")
@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.hedging import HedgePolicy
+from bitpapa_pay.testing import FakeBitpapaServer
+
+BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.5, 1.0)
+
+
+def policy_with(latencies, **options):
+    policy = HedgePolicy(buckets=BUCKETS, min_samples=3, **options)
+    for latency in latencies:
+        policy.histograms["/route"].observe(latency)
+    return policy
+
+
+def test_delay_is_the_quantile_once_enough_samples_are_known():
+    assert policy_with([0.01] * 2, initial_delay=0.7).get_delay("/route") == (
+        0.7
+    )
+    policy = policy_with([0.01] * 19 + [0.5], quantile=0.9)
+    assert policy.get_delay("/route") == 0.01
+    assert policy.get_delay("/other") == policy.initial_delay
+
+
+def test_slow_request_is_hedged_and_the_loser_cancelled():
+    async def main():
+        policy = policy_with([0.001] * 20, min_delay=0.02)
+        cancelled = []
+
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append("slow")
+                raise
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        started = time.monotonic()
+        result = await policy.run("/route", slow, fast)
+        return result, time.monotonic() - started, cancelled, policy
+
+    result, elapsed, cancelled, policy = asyncio.run(main())
+    assert result == "fast"
+    # the copy waits for min_delay, not for the slow request
+    assert 0.02 <= elapsed < 0.5
+    assert cancelled == ["slow"]
+    assert (policy.hedged, policy.won) == (1, 1)
+
+
+def test_fast_request_is_not_hedged():
+    async def main():
+        policy = policy_with([0.05] * 20)
+
+        async def send():
+            return "first"
+
+        async def hedge():
+            raise AssertionError("hedged")
+
+        return await policy.run("/route", send, hedge), policy
+
+    result, policy = asyncio.run(main())
+    assert result == "first"
+    assert policy.hedged == 0
+
+
+def test_addresses_share_one_histogram():
+    async def main():
+        policy = HedgePolicy()
+        async with FakeBitpapaServer() as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                hedge_policy=policy,
+            )
+            try:
+                for index in range(3):
+                    await client.get_address_transactions(f"address-{index}")
+            finally:
+                await client.close()
+        return policy
+
+    policy = asyncio.run(main())
+    assert list(policy.histograms) == ["/a3s/v1/address/{uuid}/transactions"]
+    assert policy.histograms[
+        "/a3s/v1/address/{uuid}/transactions"
+    ].count == 3
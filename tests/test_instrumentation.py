@@ -0,0 +1,62 @@
+import asyncio
+import gc
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.instrumentation import Instrumentation
+from bitpapa_pay.methods import GetInvoicesMethod
+from bitpapa_pay.testing import FakeBitpapaServer
+
+
+def run_with(instrumentation, call):
+    async def main():
+        async with FakeBitpapaServer() as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                instrumentation=instrumentation,
+            )
+            try:
+                return await call(client)
+            finally:
+                await client.close()
+
+    return asyncio.run(main())
+
+
+def test_address_calls_share_one_route():
+    instrumentation = Instrumentation()
+
+    async def call(client):
+        for index in range(3):
+            await client.get_address_transactions(f"address-{index}")
+
+    run_with(instrumentation, call)
+    route = "/a3s/v1/address/{uuid}/transactions"
+    assert list(instrumentation.histograms) == [route]
+    assert instrumentation.statuses[route][200] == 3
+
+
+def test_failing_hook_does_not_replace_the_result():
+    records = []
+
+    def failing(record):
+        raise RuntimeError("hook")
+
+    instrumentation = Instrumentation(hooks=[failing, records.append])
+
+    async def call(client):
+        return await client.get_exchange_rates_all()
+
+    assert run_with(instrumentation, call) is not None
+    # hooks after the failing one still run
+    assert len(records) == 1
+
+
+def test_methods_are_only_timed_while_instrumented():
+    gc.collect()
+    assert GetInvoicesMethod(page=1).validation_time == 0.0
+    instrumentation = Instrumentation()
+    assert GetInvoicesMethod(page=1).validation_time > 0.0
+    del instrumentation
+    gc.collect()
+    assert GetInvoicesMethod(page=1).validation_time == 0.0
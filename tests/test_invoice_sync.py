@@ -0,0 +1,112 @@
+import asyncio
+
+from aiohttp import web
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.invoice_sync import InvoiceSyncer
+from bitpapa_pay.testing import FakeBitpapaServer, payloads
+
+
+def stamp(second):
+    return f"2024-01-01T00:00:{second:02d}.000Z"
+
+
+class InvoiceListServer(FakeBitpapaServer):
+    """Serves `invoices`, most recently updated first, two per page."""
+
+    def __init__(self, count):
+        super().__init__()
+        self.invoices = []
+        for index in range(count):
+            invoice = payloads.invoice(index)
+            invoice.update(status="new", updated_at=stamp(count - index))
+            self.invoices.append(invoice)
+
+    def update(self, index, status, second):
+        invoice = self.invoices.pop(index)
+        invoice.update(status=status, updated_at=stamp(second))
+        self.invoices.insert(0, invoice)
+
+    async def _get_invoices(self, request):
+        page = int(request.query.get("page", 1))
+        return web.json_response(
+            {
+                "invoices": self.invoices[(page - 1) * 2:page * 2],
+                "page": page,
+                "count": len(self.invoices),
+                "pages": (len(self.invoices) + 1) // 2,
+            },
+        )
+
+
+def run(count, scenario):
+    async def main():
+        async with InvoiceListServer(count) as server:
+            client = BitpapaPay("token", base_url=server.url)
+            try:
+                async with InvoiceSyncer(client) as syncer:
+                    return await scenario(server, syncer)
+            finally:
+                await client.close()
+
+    return asyncio.run(main())
+
+
+def test_first_sync_stores_every_invoice():
+    async def scenario(server, syncer):
+        changes = await syncer.sync()
+        return (
+            changes,
+            syncer.pages_fetched,
+            await syncer.get(server.invoices[3]["id"]),
+            await syncer.get_by_merchant_invoice_id("order-4"),
+            await syncer.watermark(),
+        )
+
+    changes, pages, invoice, by_merchant_id, watermark = run(6, scenario)
+    assert len(changes) == 6
+    assert {change.old_status for change in changes} == {None}
+    assert pages == 3
+    assert invoice.merchant_invoice_id == "order-3"
+    assert [invoice.id for invoice in by_merchant_id] == [
+        payloads.invoice(4)["id"],
+    ]
+    assert watermark == stamp(6)
+
+
+def test_changed_invoice_is_upserted_and_the_watermark_advances():
+    async def scenario(server, syncer):
+        await syncer.sync()
+        server.update(4, "paid", 30)
+        changes = await syncer.sync()
+        return (
+            changes,
+            await syncer.get_by_status("paid"),
+            await syncer.get_by_status("new"),
+            await syncer.watermark(),
+        )
+
+    changes, paid, new, watermark = run(6, scenario)
+    (change,) = changes
+    assert (change.old_status, change.new_status) == ("new", "paid")
+    assert change.merchant_invoice_id == "order-4"
+    assert [invoice.merchant_invoice_id for invoice in paid] == ["order-4"]
+    assert len(new) == 5
+    assert watermark == stamp(30)
+
+
+def test_sync_stops_at_pages_behind_the_watermark():
+    async def scenario(server, syncer):
+        await syncer.sync()
+        first = syncer.pages_fetched
+        assert await syncer.sync() == []
+        unchanged = syncer.pages_fetched - first
+        server.update(5, "paid", 30)
+        await syncer.sync()
+        changed = syncer.pages_fetched - first - unchanged
+        await syncer.sync(full=True)
+        full = syncer.pages_fetched - first - unchanged - changed
+        return unchanged, changed, full
+
+    # the changed invoice moved to the first page, the second is old
+    assert run(10, scenario) == (1, 2, 5)
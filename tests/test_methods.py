@@ -0,0 +1,8 @@
+from bitpapa_pay.methods import GetInvoicesMethod
+
+
+def test_cached_method_is_shared_and_validated_once():
+    method = GetInvoicesMethod.cached(page=7)
+    assert GetInvoicesMethod.cached(page=7) is method
+    assert method.to_params() == GetInvoicesMethod(page=7).to_params()
+    assert method.validation_time == 0.0
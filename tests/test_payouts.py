@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import ClientTimeout
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.exceptions import InvalidPayoutSpecError, InvalidSpecError
+from bitpapa_pay.payouts import (
+    DONE,
+    UNKNOWN,
+    PayoutScheduler,
+    build_payout_methods,
+    payout_key,
+)
+from bitpapa_pay.testing import FakeBitpapaServer
+
+TRANSFERS = "/a3s/v1/transactions/new"
+
+SPECS = [
+    {
+        "currency": "USDT",
+        "network": "TRC20",
+        "amount": index + 1,
+        "from_address": f"source-{index % 3}",
+        "to_address": "destination",
+    }
+    for index in range(9)
+]
+
+
+def test_rerun_resumes_from_journal(tmp_path):
+    journal = tmp_path / "payouts.jsonl"
+
+    async def main():
+        async with FakeBitpapaServer() as server:
+            client = BitpapaPay("token", base_url=server.url)
+            try:
+                first = await client.send_payouts(SPECS, journal_path=journal)
+                second = await client.send_payouts(
+                    SPECS,
+                    journal_path=journal,
+                )
+            finally:
+                await client.close()
+            return first, second, server.requests[TRANSFERS]
+
+    first, second, sent = asyncio.run(main())
+    assert sent == len(SPECS)
+    assert [result.state for result in first] == [DONE] * len(SPECS)
+    assert not any(result.resumed for result in first)
+    assert all(result.resumed and result.ok for result in second)
+    assert [result.response for result in second] == [
+        result.response for result in first
+    ]
+
+
+def test_payouts_started_before_a_crash_are_unknown(tmp_path):
+    journal = tmp_path / "payouts.jsonl"
+    methods = build_payout_methods(SPECS)
+    started = {"key": payout_key(0, methods[0]), "state": "started"}
+    # the crash cut the last line short
+    journal.write_text(json.dumps(started) + '\n{"key": "1-')
+
+    async def main():
+        async with FakeBitpapaServer() as server:
+            client = BitpapaPay("token", base_url=server.url)
+            try:
+                results = await client.send_payouts(
+                    SPECS,
+                    journal_path=journal,
+                )
+            finally:
+                await client.close()
+            return results, server.requests[TRANSFERS]
+
+    results, sent = asyncio.run(main())
+    assert sent == len(SPECS) - 1
+    assert (results[0].state, results[0].resumed) == (UNKNOWN, True)
+    assert all(result.ok for result in results[1:])
+    for line in journal.read_text().splitlines()[2:]:
+        json.loads(line)
+
+
+def test_timeouts_are_unknown_and_do_not_stop_the_batch(tmp_path):
+    journal = tmp_path / "payouts.jsonl"
+
+    async def main():
+        async with FakeBitpapaServer(latency=1.0) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                timeout=ClientTimeout(total=0.05),
+            )
+            try:
+                async with PayoutScheduler(
+                    client,
+                    journal_path=journal,
+                ) as scheduler:
+                    first = await scheduler.run(SPECS)
+                async with PayoutScheduler(
+                    client,
+                    journal_path=journal,
+                ) as scheduler:
+                    second = await scheduler.run(SPECS)
+            finally:
+                await client.close()
+            return first, second, server.requests[TRANSFERS]
+
+    first, second, sent = asyncio.run(main())
+    assert sent == len(SPECS)
+    assert [result.state for result in first] == [UNKNOWN] * len(SPECS)
+    assert all(
+        isinstance(result.error, asyncio.TimeoutError) for result in first
+    )
+    assert all(
+        result.resumed and result.state == UNKNOWN for result in second
+    )
+
+
+def test_every_invalid_spec_is_reported():
+    specs = [SPECS[0], {"currency": "USDT"}, SPECS[1], {"amount": 1}]
+    with pytest.raises(InvalidPayoutSpecError) as info:
+        build_payout_methods(specs)
+    assert isinstance(info.value, InvalidSpecError)
+    assert sorted(info.value.errors) == [1, 3]
+    assert str(info.value).startswith("2 invalid payout specs, first at index 1:")
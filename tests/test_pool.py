@@ -0,0 +1,80 @@
+import asyncio
+import sys
+
+import pytest
+
+from bitpapa_pay import BitpapaPayPool
+from bitpapa_pay.instrumentation import Instrumentation
+from bitpapa_pay.testing import FakeBitpapaServer
+
+
+def run(scenario, **options):
+    async def main():
+        async with FakeBitpapaServer() as server:
+            async with BitpapaPayPool(base_url=server.url, **options) as pool:
+                result = await scenario(pool)
+            return result, pool
+
+    return asyncio.run(main())
+
+
+def test_clients_are_cached_per_token_and_share_the_session():
+    async def scenario(pool):
+        first = pool.for_token("first")
+        assert pool.for_token("first") is first
+        second = pool.for_token("second")
+        await first.get_exchange_rates_all()
+        await first.get_exchange_rates_all()
+        await second.get_exchange_rates_all()
+        assert first.get_session() is second.get_session()
+        return [
+            sum(pool.instrumentation(token).statuses[
+                "/api/v1/exchange_rates/all"
+            ].values())
+            for token in pool
+        ]
+
+    counts, pool = run(scenario)
+    assert counts == [2, 1]
+    assert len(pool) == 0
+    assert pool.instrumentation("first") is None
+
+
+def test_shared_instrumentation_collects_every_token():
+    instrumentation = Instrumentation()
+
+    async def scenario(pool):
+        for token in ("first", "second"):
+            await pool.for_token(token).get_exchange_rates_all()
+        return pool.instrumentation("second")
+
+    shared, _ = run(scenario, instrumentation=instrumentation)
+    assert shared is instrumentation
+    assert instrumentation.histograms[
+        "/api/v1/exchange_rates/all"
+    ].count == 2
+
+
+def test_rate_without_a_connection_limit():
+    async def scenario(pool):
+        await pool.for_token("token").get_exchange_rates_all()
+        return pool.scheduler.max_in_flight
+
+    max_in_flight, _ = run(scenario, rate=100, limit=0)
+    assert max_in_flight == sys.maxsize
+
+
+@pytest.mark.parametrize("name", ["session", "connector"])
+def test_pool_owned_options_are_rejected(name):
+    with pytest.raises(ValueError, match=name):
+        BitpapaPayPool(**{name: object()})
+
+
+def test_removed_token_gets_a_new_client():
+    async def scenario(pool):
+        client = pool.for_token("token")
+        await pool.remove("token")
+        return client, pool.for_token("token")
+
+    (removed, created), _ = run(scenario)
+    assert created is not removed
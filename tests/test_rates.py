@@ -0,0 +1,59 @@
+import math
+
+import pytest
+
+from bitpapa_pay import rates
+from bitpapa_pay.rates import RateMatrix
+
+RATES = {
+    "BTC_USD": 50000.0,
+    "ETH_USD": 2500.0,
+    "USDT_USD": 1.0,
+    "XMR_EUR": 150.0,
+}
+
+
+@pytest.fixture(params=["numpy", "python"])
+def matrix(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(rates, "get_numpy", lambda: None)
+    return RateMatrix.from_rates(RATES)
+
+
+def test_quoted_pairs_fill_both_directions(matrix):
+    assert matrix.pivot == "USD"
+    assert matrix.rate("BTC", "USD") == 50000.0
+    assert matrix.rate("USD", "ETH") == pytest.approx(1 / 2500)
+    assert matrix.rate("XMR", "XMR") == 1.0
+
+
+def test_cross_rates_are_derived_through_the_pivot(matrix):
+    assert matrix.rate("BTC", "ETH") == pytest.approx(20.0)
+    assert matrix.rate("ETH", "BTC") == pytest.approx(0.05)
+    assert matrix.rate("USDT", "BTC") == pytest.approx(1 / 50000)
+    assert matrix.to_dict()["BTC_USDT"] == pytest.approx(50000.0)
+
+
+def test_pairs_without_a_path_are_nan(matrix):
+    assert math.isnan(matrix.rate("XMR", "USD"))
+    assert "XMR_USD" not in matrix.to_dict()
+
+
+def test_currency_without_rates_raises_key_error(matrix):
+    assert "DOGE" not in matrix
+    with pytest.raises(KeyError, match="DOGE"):
+        matrix.rate("DOGE", "USD")
+    with pytest.raises(KeyError, match="DOGE"):
+        matrix.convert_many([1.0], ["DOGE"], "USD")
+
+
+def test_convert_many(matrix):
+    converted = matrix.convert_many(
+        [1.0, 2.0, 10.0],
+        ["BTC", "ETH", "USDT"],
+        ["USD", "BTC", "ETH"],
+    )
+    assert list(converted) == pytest.approx([50000.0, 0.1, 0.004])
+    assert matrix.convert(3, "ETH", "USD") == pytest.approx(7500.0)
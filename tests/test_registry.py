@@ -0,0 +1,36 @@
+import asyncio
+import uuid
+
+import pytest
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.enums import ResponseMode
+from bitpapa_pay.registry import AddressRegistry
+from bitpapa_pay.testing import FakeBitpapaServer
+
+
+@pytest.mark.parametrize("mode", [ResponseMode.RAW, ResponseMode.TRUSTED])
+def test_registry_indexes_models_in_any_response_mode(mode):
+    async def main():
+        async with FakeBitpapaServer(addresses=5) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                response_mode=mode,
+            )
+            try:
+                async with AddressRegistry(client) as registry:
+                    created = await registry.create_address(
+                        "USDT",
+                        "TRC20",
+                        "new-label",
+                    )
+                    assert isinstance(created.id, uuid.UUID)
+                    assert registry.get(created.id) is created
+                    assert len(registry) == 6
+                    for address in registry:
+                        assert isinstance(address.id, uuid.UUID)
+            finally:
+                await client.close()
+
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+from pydantic import ValidationError
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.enums import ResponseMode
+from bitpapa_pay.schemas import GetExchangeRatesResponse
+from bitpapa_pay.testing import FakeBitpapaServer
+
+# not a valid exchange rates response: the rate is not a number
+BODY = {"rates": {"BTC_USD": "unknown"}, "updated": [1, 2]}
+
+
+class InvalidRatesServer(FakeBitpapaServer):
+    async def _exchange_rates(self, request):
+        return web.Response(
+            body=json.dumps(BODY).encode(),
+            content_type="application/json",
+        )
+
+
+def get_rates(**options):
+    async def main():
+        async with InvalidRatesServer() as server:
+            client = BitpapaPay("token", base_url=server.url)
+            try:
+                return await client.get_exchange_rates_all(**options)
+            finally:
+                await client.close()
+
+    return asyncio.run(main())
+
+
+def test_validated_mode_rejects_invalid_responses():
+    with pytest.raises(ValidationError):
+        get_rates()
+
+
+def test_trusted_mode_skips_validation():
+    response = get_rates(response_mode=ResponseMode.TRUSTED)
+    assert isinstance(response, GetExchangeRatesResponse)
+    assert response.rates == {"BTC_USD": "unknown"}
+
+
+def test_raw_mode_returns_the_decoded_body_unchanged():
+    assert get_rates(response_mode="raw") == BODY
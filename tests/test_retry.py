@@ -0,0 +1,135 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+from aiohttp import ClientConnectionError, ClientResponseError
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.exceptions import BadRequestError, RequestTimeoutError
+from bitpapa_pay.methods import (
+    CreateCryptoInvoiceMethod,
+    GetExchangeRateMetod,
+)
+from bitpapa_pay.retry import RetryPolicy, parse_retry_after
+from bitpapa_pay.testing import FakeBitpapaServer
+
+GET = GetExchangeRateMetod()
+
+
+def response_error(status, headers=None):
+    return ClientResponseError(None, (), status=status, headers=headers)
+
+
+def test_backoff_doubles_up_to_its_maximum(monkeypatch):
+    monkeypatch.setattr("random.uniform", lambda low, high: high)
+    policy = RetryPolicy(
+        max_attempts=6,
+        backoff_base=0.1,
+        backoff_max=0.5,
+        total_timeout=None,
+    )
+    error = ClientConnectionError()
+    delays = [
+        policy.get_delay(GET, error, attempt, 0) for attempt in range(1, 6)
+    ]
+    assert delays == [0.1, 0.2, 0.4, 0.5, 0.5]
+    assert policy.get_delay(GET, error, 6, 0) is None
+
+
+def test_no_retry_is_scheduled_past_the_total_timeout(monkeypatch):
+    monkeypatch.setattr("random.uniform", lambda low, high: high)
+    policy = RetryPolicy(backoff_base=0.1, total_timeout=1.0)
+    error = ClientConnectionError()
+    assert policy.get_delay(GET, error, 1, 0.0) is not None
+    assert policy.get_delay(GET, error, 1, 0.95) is None
+
+
+def test_only_retry_statuses_are_retried():
+    policy = RetryPolicy()
+    assert policy.get_delay(GET, response_error(503), 1, 0) is not None
+    assert policy.get_delay(GET, response_error(404), 1, 0) is None
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("3", 3.0), (" 12 ", 12.0), ("", None), (None, None), ("soon", None)],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    moment = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(moment, usegmt=True)) <= 30
+    past = datetime.now(timezone.utc) - timedelta(seconds=30)
+    assert parse_retry_after(format_datetime(past, usegmt=True)) == 0.0
+
+
+def test_retry_after_takes_precedence_over_backoff():
+    policy = RetryPolicy(backoff_max=0.1)
+    error = response_error(429, {"Retry-After": "2"})
+    assert policy.get_delay(GET, error, 1, 0) == 2.0
+    ignoring = RetryPolicy(backoff_max=0.1, respect_retry_after=False)
+    assert ignoring.get_delay(GET, error, 1, 0) <= 0.1
+
+
+def test_invoice_post_is_retried_only_with_a_merchant_invoice_id():
+    policy = RetryPolicy()
+    error = response_error(503)
+    anonymous = CreateCryptoInvoiceMethod(amount=1, currency_code="USDT")
+    assert policy.get_delay(anonymous, error, 1, 0) is None
+    identified = CreateCryptoInvoiceMethod(
+        amount=1,
+        currency_code="USDT",
+        merchant_invoice_id="order-1",
+    )
+    assert policy.get_delay(identified, error, 1, 0) is not None
+
+
+def test_client_never_resends_an_anonymous_invoice():
+    async def main():
+        async with FakeBitpapaServer(error_rate=1.0) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                retry_policy=RetryPolicy(backoff_base=0.001),
+            )
+            try:
+                with pytest.raises(BadRequestError) as info:
+                    await client.create_crypto_invoice(1, "USDT")
+                with pytest.raises(BadRequestError):
+                    await client.create_crypto_invoice(
+                        1,
+                        "USDT",
+                        merchant_invoice_id="order-1",
+                    )
+            finally:
+                await client.close()
+            return info.value, server.requests["/api/v1/invoices/public"]
+
+    error, sent = asyncio.run(main())
+    assert error.status == 503
+    assert error.attempts == 1
+    # one anonymous attempt, three for the identified invoice
+    assert sent == 4
+
+
+def test_total_timeout_caps_every_attempt():
+    async def main():
+        async with FakeBitpapaServer(latency=1.0) as server:
+            client = BitpapaPay(
+                "token",
+                base_url=server.url,
+                retry_policy=RetryPolicy(total_timeout=0.1),
+            )
+            started = time.monotonic()
+            try:
+                with pytest.raises(RequestTimeoutError):
+                    await client.get_exchange_rates_all()
+            finally:
+                await client.close()
+            return time.monotonic() - started
+
+    assert asyncio.run(main()) < 0.5
@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+import pytest
+
+from bitpapa_pay.enums import RequestPriority
+from bitpapa_pay.scheduler import RateLimit, RequestScheduler
+
+
+def test_cancelled_waiter_released_before_it_resumes():
+    async def main():
+        scheduler = RequestScheduler(rate=1000, burst=1000, max_in_flight=1)
+        await scheduler.acquire("token", "/api")
+        cancelled = asyncio.ensure_future(scheduler.acquire("token", "/api"))
+        following = asyncio.ensure_future(scheduler.acquire("token", "/api"))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        # the slot is given back before the cancelled task gets to run
+        scheduler.release()
+
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        await asyncio.wait_for(following, 1)
+        assert scheduler.in_flight == 1
+        scheduler.release()
+        assert scheduler.in_flight == 0
+        assert sum(scheduler.queue_depth().values()) == 0
+
+    asyncio.run(main())
+
+
+def test_queued_requests_are_granted_by_priority():
+    async def main():
+        scheduler = RequestScheduler(rate=1000, burst=1000, max_in_flight=1)
+        granted = []
+
+        async def request(priority):
+            async with scheduler.slot("token", "/api", priority):
+                granted.append(priority)
+
+        await scheduler.acquire("token", "/api")
+        tasks = [
+            asyncio.ensure_future(request(priority))
+            for priority in (
+                RequestPriority.LOW,
+                RequestPriority.NORMAL,
+                RequestPriority.HIGH,
+                RequestPriority.NORMAL,
+            )
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.queue_depth()[RequestPriority.NORMAL] == 2
+        scheduler.release()
+        await asyncio.gather(*tasks)
+        assert granted == [
+            RequestPriority.HIGH,
+            RequestPriority.NORMAL,
+            RequestPriority.NORMAL,
+            RequestPriority.LOW,
+        ]
+
+    asyncio.run(main())
+
+
+def test_in_flight_requests_are_limited():
+    async def main():
+        scheduler = RequestScheduler(rate=1000, burst=1000, max_in_flight=3)
+        running = []
+
+        async def request():
+            async with scheduler.slot("token", "/api"):
+                running.append(scheduler.in_flight)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*(request() for _ in range(20)))
+        assert max(running) == 3
+        assert scheduler.in_flight == 0
+        assert scheduler.stats.granted == 20
+
+    asyncio.run(main())
+
+
+def test_group_limits_rate_limit_their_endpoints_only():
+    async def main():
+        scheduler = RequestScheduler(
+            rate=1000,
+            burst=1000,
+            group_limits={"/a3s/v1/addresses": RateLimit(20, 1)},
+        )
+        assert scheduler.group_of("/a3s/v1/addresses/new") == (
+            "/a3s/v1/addresses"
+        )
+        assert scheduler.group_of("/api/v1/invoices") is None
+
+        started = time.monotonic()
+        for _ in range(3):
+            async with scheduler.slot("token", "/a3s/v1/addresses/new"):
+                pass
+        limited = time.monotonic() - started
+        started = time.monotonic()
+        for _ in range(3):
+            async with scheduler.slot("token", "/api/v1/invoices"):
+                pass
+        unlimited = time.monotonic() - started
+        # a burst of one at 20 per second spaces the requests by 50 ms
+        assert limited >= 0.09
+        assert unlimited < 0.05
+
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+import json
+import random
+
+import pytest
+
+from bitpapa_pay.streaming import JsonArraySplitter
+from bitpapa_pay.testing import payloads
+
+STRINGS = ["", "plain", 'quo"te', "back\\slash", "\\", '\\"', "[{,}]", "ü€"]
+
+
+def random_value(rnd, depth=0):
+    kind = rnd.randrange(6 if depth < 3 else 4)
+    if kind == 0:
+        return rnd.choice(STRINGS) + rnd.choice(STRINGS)
+    if kind == 1:
+        return rnd.uniform(-1e6, 1e6)
+    if kind == 2:
+        return rnd.randrange(-1000, 1000)
+    if kind == 3:
+        return rnd.choice([True, False, None])
+    if kind == 4:
+        return [random_value(rnd, depth + 1) for _ in range(rnd.randrange(4))]
+    return {
+        rnd.choice(STRINGS) + str(index): random_value(rnd, depth + 1)
+        for index in range(rnd.randrange(4))
+    }
+
+
+def split(body, chunk_sizes):
+    splitter = JsonArraySplitter()
+    items = []
+    pos = 0
+    while pos < len(body):
+        size = next(chunk_sizes)
+        items += splitter.feed(body[pos:pos + size])
+        pos += size
+    assert splitter.finished
+    return [json.loads(item) for item in items]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_split_matches_json_dumps_in_small_chunks(seed):
+    rnd = random.Random(seed)
+    items = [random_value(rnd) for _ in range(rnd.randrange(10))]
+    body = json.dumps(
+        {"transaction": items} if seed % 2 else items,
+        ensure_ascii=bool(seed % 3),
+        indent=rnd.choice([None, 1]),
+    ).encode()
+    chunk_sizes = iter(lambda: rnd.randint(1, 5), None)
+    assert split(body, chunk_sizes) == items
+
+
+def test_split_transactions_in_one_chunk():
+    transactions = payloads.transactions(20)
+    body = json.dumps({"transaction": transactions}).encode()
+    assert split(body, iter([len(body)])) == transactions
+
+
+def test_split_ignores_data_after_the_array():
+    splitter = JsonArraySplitter()
+    assert splitter.feed(b'[1,"]",[2]] [3]') == [b"1", b'"]"', b"[2]"]
+    assert splitter.finished
+    assert splitter.feed(b"[4]") == []
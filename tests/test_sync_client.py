@@ -0,0 +1,65 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bitpapa_pay.sync_client import BitpapaPaySync
+from bitpapa_pay.testing import FakeBitpapaServer
+
+
+@pytest.fixture
+def server():
+    """Fake server running on a loop of its own thread."""
+    server = FakeBitpapaServer(
+        latency=0.01,
+        invoices_per_page=5,
+        invoice_pages=3,
+    )
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result()
+    yield server
+    asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+
+def test_calls_from_many_threads_share_one_loop(server):
+    with BitpapaPaySync("token", base_url=server.url) as client:
+
+        def call(_):
+            rates = client.get_exchange_rates_all()
+            return rates, threading.current_thread()
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(call, range(16)))
+        loops = [
+            thread for thread in threading.enumerate()
+            if thread.name == "bitpapa-pay-loop"
+        ]
+    assert all(rates == results[0][0] for rates, _ in results)
+    assert len({thread for _, thread in results}) > 1
+    assert len(loops) == 1
+    assert server.requests["/api/v1/exchange_rates/all"] == 16
+
+
+def test_async_iterators_become_iterators(server):
+    with BitpapaPaySync("token", base_url=server.url) as client:
+        ids = [invoice.id for invoice in client.iter_invoices()]
+        first = next(iter(client.iter_invoices(concurrency=1)))
+    assert len(ids) == len(set(ids)) == 15
+    assert first.id == ids[0]
+
+
+def test_client_is_usable_again_after_close(server):
+    client = BitpapaPaySync("token", base_url=server.url)
+    client.get_exchange_rates_all()
+    closed = client.client
+    client.close()
+    client.close()
+    assert client.get_exchange_rates_all().rates
+    assert client.client is not closed
+    client.close()
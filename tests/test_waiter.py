@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+
+from bitpapa_pay import BitpapaPay
+from bitpapa_pay.testing import FakeBitpapaServer, payloads
+from bitpapa_pay.waiter import InvoiceWaiter
+
+
+class StatusServer(FakeBitpapaServer):
+    """Serves one page of `invoices` and records when it was read."""
+
+    def __init__(self, count):
+        super().__init__()
+        self.invoices = [payloads.invoice(index) for index in range(count)]
+        for invoice in self.invoices:
+            invoice["status"] = "new"
+        self.polled_at = []
+
+    async def _get_invoices(self, request):
+        self.polled_at.append(time.monotonic())
+        return web.json_response(
+            {"invoices": self.invoices, "page": 1, "count": 1, "pages": 1},
+        )
+
+
+def run(scenario, **options):
+    async def main():
+        async with StatusServer(3) as server:
+            client = BitpapaPay("token", base_url=server.url)
+            waiter = InvoiceWaiter(client, **options)
+            try:
+                return await scenario(server, waiter)
+            finally:
+                await waiter.close()
+                await client.close()
+
+    return asyncio.run(main())
+
+
+def test_wait_returns_once_the_invoice_is_final():
+    async def scenario(server, waiter):
+        invoice_id = server.invoices[1]["id"]
+
+        async def pay():
+            await asyncio.sleep(0.05)
+            server.invoices[1]["status"] = "paid"
+
+        invoice, _ = await asyncio.gather(
+            waiter.wait(invoice_id, timeout=1),
+            pay(),
+        )
+        return invoice, waiter.pending
+
+    invoice, pending = run(scenario, interval=0.01)
+    assert invoice.status == "paid"
+    assert invoice.merchant_invoice_id == "order-1"
+    assert pending == set()
+
+
+def test_wait_times_out_and_forgets_the_waiter():
+    async def scenario(server, waiter):
+        with pytest.raises(asyncio.TimeoutError):
+            await waiter.wait(server.invoices[0]["id"], timeout=0.05)
+        return waiter.pending
+
+    assert run(scenario, interval=0.01) == set()
+
+
+def test_polls_back_off_up_to_the_max_interval():
+    async def scenario(server, waiter):
+        with pytest.raises(asyncio.TimeoutError):
+            await waiter.wait(server.invoices[0]["id"], timeout=0.5)
+        return [
+            later - earlier
+            for earlier, later in zip(server.polled_at, server.polled_at[1:])
+        ]
+
+    gaps = run(scenario, interval=0.02, max_interval=0.08, backoff=2)
+    # 0.04, then capped at 0.08
+    assert 0.035 < gaps[0] < 0.07
+    assert all(0.075 < gap < 0.15 for gap in gaps[1:])
+    assert len(gaps) >= 4